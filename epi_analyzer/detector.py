@@ -30,6 +30,7 @@ class MistakeDetector:
         """
         self.epi_path = Path(epi_file)
         self.steps = self._load_steps()
+        self.summary = self._load_summary()
         self.mistakes: List[Dict] = []
     
     def _load_steps(self) -> List[Dict]:
@@ -91,20 +92,33 @@ class MistakeDetector:
         
         raise FileNotFoundError(f"No valid .epi file found at {self.epi_path}")
     
+    def _load_summary(self) -> Dict:
+        """Step aggregates: summary.json if the recording has one, else from the loaded steps"""
+        from epi_core.summary import read_summary, summarize_steps
+        
+        summary = None
+        if self.epi_path.suffix == '.epi' or self.epi_path.is_dir():
+            summary = read_summary(self.epi_path)
+        if summary is None:
+            summary = summarize_steps(
+                {'index': s.get('index'), 'kind': s.get('type', 'unknown'), 'content': s.get('content'), 'timestamp': s.get('timestamp')}
+                for s in self.steps
+            )
+        return summary
+    
     def _load_from_jsonl(self, path: Path) -> List[Dict]:
-        """Load steps from JSONL file"""
+        """Load steps from JSONL file (histories rebuilt, blobs resolved; see epi_core.reader)"""
+        from epi_core.reader import iter_steps
+        
         steps = []
-        with open(path, 'r', encoding='utf-8') as f:
-            for i, line in enumerate(f):
-                if line.strip():
-                    step = json.loads(line)
-                    steps.append({
-                        'id': i,
-                        'index': step.get('index', i),
-                        'type': step.get('kind', 'unknown'),
-                        'content': step.get('content', {}),
-                        'timestamp': step.get('timestamp', '')
-                    })
+        for i, step in enumerate(iter_steps(path, resolve_blobs=True)):
+            steps.append({
+                'id': i,
+                'index': step.get('index', i),
+                'type': step.get('kind', 'unknown'),
+                'content': step.get('content', {}),
+                'timestamp': step.get('timestamp', '')
+            })
         return steps
     
     def _load_from_sqlite(self, db_path: Path) -> List[Dict]:
@@ -214,15 +228,9 @@ class MistakeDetector:
         if not llm_responses:
             return
         
-        # Calculate token usage
-        total_tokens = 0
-        for step in llm_responses:
-            content = step.get('content', {})
-            usage = content.get('usage', {})
-            if usage:
-                total_tokens += usage.get('total_tokens', 0)
-        
-        step_count = len(self.steps)
+        # Token usage and step count from the recording's summary
+        total_tokens = self.summary['tokens']['total']
+        step_count = self.summary['steps']
         
         # Red flags
         flags = []
@@ -18,29 +18,21 @@ from rich.prompt import Prompt
 import google.api_core.exceptions
 
 from epi_core.container import EPIContainer
+from epi_core.summary import load_summary
 
 
 console = Console()
 
+# Steps included verbatim in the model's context
+CONTEXT_STEPS = 50
 
-def load_steps_from_epi(epi_path: Path) -> list:
-    """Load steps from an .epi file."""
-    import tempfile
-    
-    temp_dir = Path(tempfile.mkdtemp())
-    extracted = EPIContainer.unpack(epi_path, temp_dir)
-    
-    steps_file = extracted / "steps.jsonl"
-    if not steps_file.exists():
-        return []
-    
-    steps = []
-    with open(steps_file, 'r', encoding='utf-8') as f:
-        for line in f:
-            if line.strip():
-                steps.append(json.loads(line))
+
+def load_steps_from_epi(epi_path: Path, limit: Optional[int] = None) -> list:
+    """Load the first `limit` (default: all) steps from an .epi file (histories rebuilt, blobs resolved)."""
+    from itertools import islice
+    from epi_core.reader import iter_steps
     
-    return steps
+    return list(islice(iter_steps(epi_path, resolve_blobs=True), limit))
 
 
 def chat(
@@ -87,7 +79,9 @@ def chat(
     
     try:
         manifest = EPIContainer.read_manifest(epi_file)
-        steps = load_steps_from_epi(epi_file)
+        # Totals come from summary.json; only the steps shown to the model are read
+        summary = load_summary(epi_file)
+        steps = load_steps_from_epi(epi_file, limit=CONTEXT_STEPS)
     except Exception as e:
         console.print(f"[red]Error loading .epi file:[/red] {e}")
         raise typer.Exit(1)
@@ -124,10 +118,13 @@ Recording metadata:
 - Goal: {manifest.goal or 'Not specified'}
 - Command: {manifest.cli_command or 'Not specified'}
 - Workflow ID: {manifest.workflow_id}
-- Total steps: {len(steps)}
+- Total steps: {summary['steps']}
+- Steps by kind: {json.dumps(summary['kinds'])}
+- Errors: {summary['errors']}
+- Tokens: {summary['tokens']['total']}
 
 Here are the recorded steps (this is the timeline of events):
-{json.dumps(steps[:50], indent=2, default=str)[:8000]}
+{json.dumps(steps, indent=2, default=str)[:8000]}
 
 When answering questions:
 1. Be specific and cite step indices when relevant
@@ -144,7 +141,7 @@ When answering questions:
     console.print(Panel(
         f"[bold cyan]EPI Evidence Chat[/bold cyan]\n\n"
         f"[dim]File:[/dim] {epi_file.name}\n"
-        f"[dim]Steps:[/dim] {len(steps)}\n"
+        f"[dim]Steps:[/dim] {summary['steps']}\n"
         f"[dim]Model:[/dim] {model}\n\n"
         f"Ask questions about this evidence recording.\n"
         f"Type [yellow]exit[/yellow] or [yellow]quit[/yellow] to end the session.",
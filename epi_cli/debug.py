@@ -15,6 +15,7 @@ from rich.console import Console
 from rich.panel import Panel
 
 from epi_analyzer.detector import MistakeDetector
+from epi_core.step_index import StepReader
 
 console = Console()
 app = typer.Typer(name="debug", help="Debug AI agent recordings for mistakes")
@@ -27,6 +28,8 @@ def debug(
     output_json: bool = typer.Option(False, "--json", help="Output as JSON"),
     export: Path = typer.Option(None, "--export", help="Export report to file"),
     verbose: bool = typer.Option(False, "--verbose", "-v", help="Show detailed analysis"),
+    step: int = typer.Option(None, "--step", help="Show one step (read directly via the step index)"),
+    kind: str = typer.Option(None, "--kind", help="List the steps of one kind (e.g. llm.error)"),
 ):
     """
     Analyze agent execution for mistakes and inefficiencies.
@@ -41,7 +44,13 @@ def debug(
         epi debug agent_session.epi
         epi debug recording_dir/ --json
         epi debug agent.epi --export report.txt
+        epi debug --step 90000 agent.epi
+        epi debug --kind llm.error agent.epi
     """
+    if step is not None or kind is not None:
+        _show_steps(epi_file, step, kind)
+        return
+    
     console.print(f"Analyzing [cyan]{epi_file}[/cyan]...")
     
     try:
@@ -104,4 +113,24 @@ def debug(
 
 
 
- 
\ No newline at end of file
+ 
+
+def _show_steps(epi_file: Path, step: int, kind: str) -> None:
+    """Print one step (--step) or list the steps of a kind (--kind) without a full scan."""
+    try:
+        with StepReader(epi_file, resolve_blobs=step is not None) as steps:
+            if step is not None:
+                console.print_json(json.dumps(steps.get(step), default=str))
+                return
+            
+            count = 0
+            for found in steps.filter(kind=kind):
+                count += 1
+                console.print(f"[cyan]{found.get('index')}[/cyan]  [dim]{found.get('timestamp')}[/dim]  {found.get('kind')}")
+            console.print(f"\n{count} step(s) of kind {kind}")
+    except FileNotFoundError as e:
+        console.print(f"[red]ERROR: File not found:[/red] {e}")
+        raise typer.Exit(code=2)
+    except IndexError as e:
+        console.print(f"[red]ERROR:[/red] {e}")
+        raise typer.Exit(code=2)
@@ -0,0 +1,87 @@
+"""
+EPI CLI Lazy Commands - Import subcommand modules only when they run.
+
+Each subcommand module pulls in its own dependencies (cryptography,
+pydantic schemas, the container code, ...). Importing all of them just to
+print `epi --help` or dispatch one command dominates CLI startup, so the
+root group registers subcommands by import path instead:
+
+    EpiCommandGroup.register("ls", "epi_cli.ls:ls", help="List recordings")
+
+Until a command is invoked it is represented by a placeholder that only
+carries its name and help text (enough for `epi --help`). Resolving the
+command for invocation imports the module and swaps in the real command.
+"""
+
+import importlib
+from typing import Dict, Optional, Tuple
+
+import typer
+from typer.core import TyperCommand, TyperGroup
+
+
+class LazyCommandGroup(TyperGroup):
+    """
+    Typer group whose registered subcommands are imported on first use.
+
+    Subclass it and call register() for each subcommand; use the subclass
+    as the `cls` of the root typer.Typer app.
+    """
+
+    # name -> ("module:attribute", help); set per subclass by register()
+    lazy_commands: Dict[str, Tuple[str, Optional[str]]] = {}
+
+    @classmethod
+    def register(cls, name: str, target: str, help: Optional[str] = None) -> None:
+        """
+        Register a lazily imported subcommand.
+
+        Args:
+            name: Command name (`epi <name>`)
+            target: "module:attribute" of a command function or a typer.Typer app
+            help: Help text shown in `epi --help`
+        """
+        if "lazy_commands" not in cls.__dict__:
+            cls.lazy_commands = {}
+        cls.lazy_commands[name] = (target, help)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        for name, (_, help_text) in self.lazy_commands.items():
+            if name not in self.commands:
+                self.commands[name] = TyperCommand(name, help=help_text)
+        self._loaded = set()
+
+    def resolve_command(self, ctx, args):
+        if args and args[0] in self.lazy_commands:
+            self.load_command(args[0])
+        return super().resolve_command(ctx, args)
+
+    def load_command(self, name: str):
+        """
+        Import a registered subcommand and replace its placeholder.
+
+        Args:
+            name: Registered command name
+
+        Returns:
+            The real click command
+        """
+        if name in self._loaded:
+            return self.commands[name]
+
+        target, help_text = self.lazy_commands[name]
+        module_name, attr = target.split(":")
+        obj = getattr(importlib.import_module(module_name), attr)
+
+        # Build it exactly as app.add_typer() / app.command() would
+        wrapper = typer.Typer(add_completion=False, rich_markup_mode=self.rich_markup_mode)
+        if isinstance(obj, typer.Typer):
+            wrapper.add_typer(obj, name=name, help=help_text)
+        else:
+            wrapper.command(name=name, help=help_text)(obj)
+        command = typer.main.get_group(wrapper).commands[name]
+
+        self.commands[name] = command
+        self._loaded.add(name)
+        return command
@@ -2,20 +2,29 @@
 EPI CLI Ls - List recordings in ./epi-recordings/ directory.
 
 Usage:
-  epi ls
+  epi ls [--reverify]
+
+Verification results are cached in ./epi-recordings/.epi-verify-cache.db,
+keyed by path + size + mtime + manifest hash, so listing unchanged
+recordings only costs a stat() plus a manifest.json read per file.
+--reverify ignores and refreshes the cache.
 """
 
 import json
+import sqlite3
 import zipfile
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 import typer
 from rich.console import Console
 from rich.table import Table
 
 from epi_core.container import EPIContainer
+from epi_core.schemas import ManifestModel
+from epi_core.summary import read_summary
+from epi_core.verifier import VerificationCache
 
 console = Console()
 
@@ -23,6 +32,8 @@ app = typer.Typer(name="ls", help="List local recordings (./epi-recordings/)")
 
 DEFAULT_DIR = Path("epi-recordings")
 
+CACHE_FILENAME = ".epi-verify-cache.db"
+
 
 def _format_metrics(metrics: Dict[str, Any]) -> str:
     """Format metrics dictionary as a compact string."""
@@ -40,22 +51,55 @@ def _format_metrics(metrics: Dict[str, Any]) -> str:
     return ", ".join(formatted)
 
 
-def _get_recording_info(epi_file: Path) -> dict:
+def _format_steps(summary: Dict[str, Any]) -> str:
+    """Format a recording's summary.json as a compact step count."""
+    text = str(summary.get("steps", 0))
+    if summary.get("errors"):
+        text += f" ({summary['errors']} err)"
+    return text
+
+
+def _get_recording_info(
+    epi_file: Path,
+    cache: Optional[VerificationCache] = None,
+    reverify: bool = False
+) -> dict:
     """
     Extract basic info from a recording.
     
+    Args:
+        epi_file: Recording to inspect
+        cache: Verification cache (optional). Unchanged files are answered
+               from the cache after reading only manifest.json.
+        reverify: Ignore cached results and verify again
+    
     Returns:
         Dictionary with recording metadata
     """
     try:
-        # Read manifest
-        manifest = EPIContainer.read_manifest(epi_file)
-        
         # Get file stats
         stats = epi_file.stat()
         size_mb = stats.st_size / (1024 * 1024)
         modified = datetime.fromtimestamp(stats.st_mtime)
         
+        file_info = {
+            "name": epi_file.name,
+            "size_mb": f"{size_mb:.2f}",
+            "modified": modified.strftime("%Y-%m-%d %H:%M:%S"),
+        }
+        
+        # Fast path: unchanged since last verification
+        if cache is not None and not reverify:
+            cached = cache.get(epi_file, stats)
+            if cached is not None:
+                return {**cached, **file_info}
+        
+        # Read manifest (raw bytes are hashed to identify the verified content)
+        with zipfile.ZipFile(epi_file, "r") as zf:
+            manifest_bytes = zf.read("manifest.json")
+            summary = read_summary(zf)
+        manifest = ManifestModel(**json.loads(manifest_bytes))
+        
         # Extract CLI command if available
         cli_command = getattr(manifest, 'cli_command', None)
         
@@ -80,17 +124,28 @@ def _get_recording_info(epi_file: Path) -> dict:
         metrics = getattr(manifest, 'metrics', None)
         tags = getattr(manifest, 'tags', None)
         
-        return {
-            "name": epi_file.name,
+        verified_info = {
             "script": script,
-            "size_mb": f"{size_mb:.2f}",
-            "modified": modified.strftime("%Y-%m-%d %H:%M:%S"),
             "signed": signed,
             "status": status,
             "goal": goal or "",
             "metrics_summary": _format_metrics(metrics) if metrics else "",
-            "tags_summary": ", ".join(tags) if tags else ""
+            "tags_summary": ", ".join(tags) if tags else "",
+            "steps_summary": _format_steps(summary) if summary else ""
         }
+        
+        if cache is not None:
+            try:
+                cache.put(
+                    epi_file,
+                    verified_info,
+                    VerificationCache.manifest_hash(manifest_bytes),
+                    stats
+                )
+            except sqlite3.Error:
+                pass  # Caching is best-effort
+        
+        return {**verified_info, **file_info}
     except Exception as e:
         return {
             "name": epi_file.name,
@@ -101,13 +156,26 @@ def _get_recording_info(epi_file: Path) -> dict:
             "status": f"[ERR] {str(e)[:20]}",
             "goal": "",
             "metrics_summary": "",
-            "tags_summary": ""
+            "tags_summary": "",
+            "steps_summary": ""
         }
 
 
+def _open_cache() -> Optional[VerificationCache]:
+    """Open the verification cache in DEFAULT_DIR (None if unavailable)."""
+    if not DEFAULT_DIR.exists():
+        return None
+    try:
+        return VerificationCache(DEFAULT_DIR / CACHE_FILENAME)
+    except Exception:
+        # Read-only or corrupt cache: list without caching
+        return None
+
+
 @app.callback(invoke_without_command=True)
 def ls(
     all_dirs: bool = typer.Option(False, "--all", "-a", help="Search current directory too"),
+    reverify: bool = typer.Option(False, "--reverify", help="Ignore cached verification results"),
 ):
     """
     List local recordings in ./epi-recordings/ directory.
@@ -140,15 +208,25 @@ def ls(
     table = Table(title=f"EPI Recordings ({len(recordings)} found)")
     table.add_column("Name", style="cyan", no_wrap=True)
     table.add_column("Modified", style="dim")
+    table.add_column("Steps", style="white", justify="right")
     table.add_column("Goal", style="blue", no_wrap=False)
     table.add_column("Metrics", style="purple", no_wrap=False)
     table.add_column("Tags", style="green", no_wrap=False)
     
-    for recording in recordings:
-        info = _get_recording_info(recording)
+    cache = _open_cache()
+    infos = [_get_recording_info(recording, cache, reverify) for recording in recordings]
+    if cache is not None:
+        try:
+            cache.prune(recordings)
+            cache.close()
+        except sqlite3.Error:
+            pass  # Caching is best-effort
+    
+    for info in infos:
         table.add_row(
             info["name"],
             info["modified"],
+            info.get("steps_summary", ""),
             info["goal"][:50] + "..." if len(info["goal"]) > 50 else info["goal"],
             info["metrics_summary"],
             info["tags_summary"]
@@ -7,7 +7,12 @@ Provides the main CLI application with frictionless first-run experience.
 import typer
 from rich.console import Console
 
-from epi_cli.keys import generate_default_keypair_if_missing
+from epi_cli.lazy import LazyCommandGroup
+
+
+class EpiCommandGroup(LazyCommandGroup):
+    """Root command group; subcommands are registered at the bottom of this module."""
+
 
 # Create callback that handles --version
 def version_callback(value: bool):
@@ -27,7 +32,7 @@ Commands:
   run    <script.py>        Record, auto-verify and open viewer. (Zero-config)
   record --out <file.epi> -- <cmd...>
                            Advanced: record any command, exact output file.
-  verify <file.epi>         Verify a recording's integrity.
+  verify <file.epi|dir>     Verify a recording's integrity (dir: batch, --jobs N).
   view   <file.epi|name>    Open recording in browser (name resolves ./epi-recordings/).
   ls                        List local recordings (./epi-recordings/).
   keys                      Manage keys (list/generate/export) - advanced.
@@ -50,7 +55,8 @@ Tips:
     no_args_is_help=True,
     rich_markup_mode="rich",
     # Add version option
-    callback=None  # Will set via decorator below
+    callback=None,  # Will set via decorator below
+    cls=EpiCommandGroup
 )
 
 console = Console()
@@ -73,6 +79,7 @@ def main_callback(
     Implements frictionless first run by auto-generating default key pair.
     """
     # Auto-generate default keypair if missing (frictionless first run)
+    from epi_cli.keys import generate_default_keypair_if_missing
     generate_default_keypair_if_missing(console_output=True)
 
 
@@ -95,7 +102,7 @@ def show_help():
   [cyan]run[/cyan]    <script.py>        Record, auto-verify and open viewer. (Zero-config)
   [cyan]record[/cyan] --out <file.epi> -- <cmd...>
                            Advanced: record any command, exact output file.
-  [cyan]verify[/cyan] <file.epi>         Verify a recording's integrity.
+  [cyan]verify[/cyan] <file.epi|dir>     Verify a recording's integrity (dir: batch, --jobs N).
   [cyan]view[/cyan]   <file.epi|name>    Open recording in browser (name resolves ./epi-recordings/).
   [cyan]ls[/cyan]                        List local recordings (./epi-recordings/).
   [cyan]keys[/cyan]                      Manage keys (list/generate/export) - advanced.
@@ -117,40 +124,34 @@ def show_help():
     console.print(help_text)
 
 
-# Import and register subcommands
-# These will be added as they're implemented
+# Register subcommands
+# Each module is imported only when its command is invoked (see epi_cli.lazy),
+# so `epi --help` and single-command dispatch don't load every dependency.
 
-# NEW: run command (zero-config) - direct import
-from epi_cli.run import run as run_command
-app.command(name="run", help="Record, auto-verify and open viewer. (Zero-config)")(run_command)
+# NEW: run command (zero-config)
+EpiCommandGroup.register("run", "epi_cli.run:run", help="Record, auto-verify and open viewer. (Zero-config)")
 
-# Phase 1: verify command
-from epi_cli.verify import verify_app
-app.add_typer(verify_app, name="verify", help="Verify .epi file integrity and authenticity")
+# Phase 1: verify command (plain command so options may follow the path:
+# epi verify DIR/ --jobs N --json)
+EpiCommandGroup.register("verify", "epi_cli.verify:verify", help="Verify .epi file integrity and authenticity")
 
 # Phase 2: record command (legacy/advanced)
-from epi_cli.record import app as record_app
-app.add_typer(record_app, name="record", help="Advanced: record any command, exact output file.")
+EpiCommandGroup.register("record", "epi_cli.record:app", help="Advanced: record any command, exact output file.")
 
 # Phase 3: view command
-from epi_cli.view import app as view_app
-app.add_typer(view_app, name="view", help="Open recording in browser (name resolves ./epi-recordings/)")
+EpiCommandGroup.register("view", "epi_cli.view:app", help="Open recording in browser (name resolves ./epi-recordings/)")
 
 # NEW: ls command
-from epi_cli.ls import ls as ls_command
-app.command(name="ls", help="List local recordings (./epi-recordings/)")(ls_command)
+EpiCommandGroup.register("ls", "epi_cli.ls:ls", help="List local recordings (./epi-recordings/)")
 
 # NEW: chat command (v2.1.3 - AI-powered evidence querying)
-from epi_cli.chat import chat as chat_command
-app.command(name="chat", help="Chat with your evidence file using AI")(chat_command)
+EpiCommandGroup.register("chat", "epi_cli.chat:chat", help="Chat with your evidence file using AI")
 
 # NEW: debug command (v2.2.0 - AI-powered mistake detection)
-from epi_cli.debug import app as debug_app
-app.add_typer(debug_app, name="debug", help="Debug AI agent recordings for mistakes")
+EpiCommandGroup.register("debug", "epi_cli.debug:app", help="Debug AI agent recordings for mistakes")
 
 # NEW: install/uninstall commands (v2.6.0 - global auto-recording)
-from epi_cli.install import app as install_app
-app.add_typer(install_app, name="global", help="Install/uninstall EPI auto-recording globally")
+EpiCommandGroup.register("global", "epi_cli.install:app", help="Install/uninstall EPI auto-recording globally")
 
 # Phase 1: keys command (for manual key management)
 @app.command()
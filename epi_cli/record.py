@@ -13,12 +13,12 @@ This command:
 - Auto-signs the manifest with the default Ed25519 key
 """
 
+import functools
 import os
 import shlex
 import sys
 import tempfile
 import time
-import zipfile
 from datetime import datetime
 from pathlib import Path
 from typing import List, Optional
@@ -29,7 +29,8 @@ from rich.panel import Panel
 
 from epi_core.container import EPIContainer
 from epi_core.schemas import ManifestModel
-from epi_core.trust import sign_manifest, sign_manifest_inplace
+from epi_core.segments import merge_segments
+from epi_core.trust import SigningError, sign_manifest
 from epi_cli.keys import KeyManager
 from epi_recorder.environment import save_environment_snapshot
 
@@ -90,6 +91,7 @@ def record(
     no_sign: bool = typer.Option(False, "--no-sign", help="Do not sign the manifest"),
     no_redact: bool = typer.Option(False, "--no-redact", help="Disable secret redaction"),
     include_all_env: bool = typer.Option(False, "--include-all-env", help="Capture all env vars (redacted)"),
+    full_viewer: bool = typer.Option(False, "--full-viewer", help="Embed every step in viewer.html (default: a preview)"),
     command: List[str] = typer.Argument(..., help="Command to execute after --"),
 ):
     """
@@ -134,51 +136,35 @@ def record(
         rc = proc.wait()
     duration = round(time.time() - start, 3)
 
+    # Merge per-process step segments into one timeline
+    merge_segments(steps_dir)
+
     # Build manifest
     manifest = ManifestModel(
         cli_command=" ".join(shlex.quote(c) for c in cmd),
     )
 
-    # Package into .epi
     out = out if str(out).endswith(".epi") else out.with_suffix(".epi")
-    EPIContainer.pack(temp_workspace, manifest, out)
 
-    # Auto-sign manifest inside .epi (without re-packing)
-    signed = False
+    # Load signing key unless disabled
+    signer = None
     if not no_sign:
         try:
             km = KeyManager()
             priv = km.load_private_key("default")
-            
-            # Read manifest from ZIP
-            import json as _json
-            with zipfile.ZipFile(out, "r") as zf:
-                raw = zf.read("manifest.json").decode("utf-8")
-                data = _json.loads(raw)
-            
-            # Sign manifest
-            from epi_core.schemas import ManifestModel as _MM
-            from epi_core.trust import sign_manifest as _sign
-            m = _MM(**data)
-            sm = _sign(m, priv, "default")
-            signed_json = sm.model_dump_json(indent=2)
-            
-            # Replace manifest in ZIP (avoid duplicate)
-            temp_zip = out.with_suffix(".epi.tmp")
-            with zipfile.ZipFile(out, "r") as zf_in:
-                with zipfile.ZipFile(temp_zip, "w", zipfile.ZIP_DEFLATED) as zf_out:
-                    # Copy all files except manifest.json
-                    for item in zf_in.namelist():
-                        if item != "manifest.json":
-                            zf_out.writestr(item, zf_in.read(item))
-                    # Write signed manifest
-                    zf_out.writestr("manifest.json", signed_json)
-            
-            # Replace original with updated ZIP
-            temp_zip.replace(out)
-            signed = True
+            signer = functools.partial(sign_manifest, private_key=priv, key_name="default")
         except Exception as e:
             console.print(f"[yellow][WARN]  Signing failed:[/yellow] {e}")
+    
+    # Package into .epi (manifest signed in the same pass, no re-zip)
+    viewer_mode = "full" if full_viewer else "preview"
+    signed = False
+    try:
+        EPIContainer.pack(temp_workspace, manifest, out, signer=signer, viewer_mode=viewer_mode)
+        signed = signer is not None
+    except SigningError as e:
+        console.print(f"[yellow][WARN]  Signing failed:[/yellow] {e}")
+        EPIContainer.pack(temp_workspace, manifest, out, viewer_mode=viewer_mode)
 
     # Final output panel
     size_mb = out.stat().st_size / (1024 * 1024)
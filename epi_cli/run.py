@@ -11,12 +11,12 @@ This command:
 - Opens the viewer automatically
 """
 
+import functools
 import os
 import shlex
 import sys
 import tempfile
 import time
-import zipfile
 from datetime import datetime
 from pathlib import Path
 from typing import List, Optional
@@ -27,7 +27,14 @@ from rich.panel import Panel
 
 from epi_core.container import EPIContainer
 from epi_core.schemas import ManifestModel
-from epi_core.trust import verify_signature, get_signer_name, create_verification_report
+from epi_core.segments import merge_segments
+from epi_core.trust import (
+    SigningError,
+    create_verification_report,
+    get_signer_name,
+    sign_manifest,
+    verify_signature,
+)
 from epi_cli.keys import KeyManager
 from epi_recorder.environment import save_environment_snapshot
 
@@ -140,17 +147,11 @@ def _open_viewer(epi_file: Path) -> bool:
     try:
         import webbrowser
         
-        # Extract viewer to temp location
+        # Build the full viewer in a temp location (the packed one may be a preview)
         temp_dir = Path(tempfile.mkdtemp(prefix="epi_view_"))
         viewer_path = temp_dir / "viewer.html"
-        
-        with zipfile.ZipFile(epi_file, "r") as zf:
-            if "viewer.html" in zf.namelist():
-                zf.extract("viewer.html", temp_dir)
-                file_url = viewer_path.as_uri()
-                return webbrowser.open(file_url)
-        
-        return False
+        viewer_path.write_text(EPIContainer.render_viewer(epi_file), encoding="utf-8")
+        return webbrowser.open(viewer_path.as_uri())
     except Exception:
         return False
 
@@ -166,6 +167,7 @@ def run(
     metric: Optional[List[str]] = typer.Option(None, "--metric", help="Key=value metrics (can be used multiple times)"),
     approved_by: Optional[str] = typer.Option(None, "--approved-by", help="Person who approved this workflow"),
     tag: Optional[List[str]] = typer.Option(None, "--tag", help="Tags for categorizing this workflow (can be used multiple times)"),
+    full_viewer: bool = typer.Option(False, "--full-viewer", help="Embed every step in viewer.html (default: a preview)"),
 ):
     """
     Zero-config recording: record + verify + view.
@@ -289,6 +291,9 @@ def run(
         raise typer.Exit(1)
     duration = round(time.time() - start, 3)
     
+    # Merge per-process step segments into one timeline
+    merge_segments(steps_dir)
+    
     # Build manifest with metadata
     manifest = ManifestModel(
         cli_command=" ".join(shlex.quote(c) for c in cmd),
@@ -299,8 +304,24 @@ def run(
         tags=tag
     )
     
-    # Package into .epi
-    EPIContainer.pack(temp_workspace, manifest, out)
+    # Load signing key (non-fatal: an unsigned .epi is still produced)
+    signer = None
+    try:
+        km = KeyManager()
+        priv = km.load_private_key("default")
+        signer = functools.partial(sign_manifest, private_key=priv, key_name="default")
+    except Exception:
+        pass
+    
+    # Package into .epi (signed in the same pass)
+    viewer_mode = "full" if full_viewer else "preview"
+    signed = False
+    try:
+        EPIContainer.pack(temp_workspace, manifest, out, signer=signer, viewer_mode=viewer_mode)
+        signed = signer is not None
+    except SigningError:
+        # Fall back to an unsigned package
+        EPIContainer.pack(temp_workspace, manifest, out, viewer_mode=viewer_mode)
     
     # --- AUTO-FIX 2: EMPTY CHECK ---
     # Check if we actually recorded anything
@@ -317,43 +338,6 @@ def run(
             pass
     # -----------------------------
     
-    # Auto-sign
-    signed = False
-    try:
-        km = KeyManager()
-        priv = km.load_private_key("default")
-        
-        # Extract, sign, and repack with new viewer
-        import json as _json
-        with zipfile.ZipFile(out, "r") as zf:
-            raw = zf.read("manifest.json").decode("utf-8")
-            data = _json.loads(raw)
-        
-        # Sign manifest
-        from epi_core.schemas import ManifestModel as _MM
-        from epi_core.trust import sign_manifest as _sign
-        m = _MM(**data)
-        sm = _sign(m, priv, "default")
-        signed_json = sm.model_dump_json(indent=2)
-        
-        # Regenerate viewer.html with signed manifest and steps
-        viewer_html = EPIContainer._create_embedded_viewer(temp_workspace, sm)
-        
-        # Replace manifest AND viewer in ZIP
-        temp_zip = out.with_suffix(".epi.tmp")
-        with zipfile.ZipFile(out, "r") as zf_in:
-            with zipfile.ZipFile(temp_zip, "w", zipfile.ZIP_DEFLATED) as zf_out:
-                for item in zf_in.namelist():
-                    if item not in ("manifest.json", "viewer.html"):
-                        zf_out.writestr(item, zf_in.read(item))
-                zf_out.writestr("manifest.json", signed_json)
-                zf_out.writestr("viewer.html", viewer_html)
-        
-        temp_zip.replace(out)
-        signed = True
-    except Exception:
-        pass  # Non-fatal
-    
     # Verify
     verified = False
     verify_msg = "Skipped"
@@ -5,10 +5,15 @@ Performs comprehensive verification including:
 - Structural validation (ZIP format, mimetype, manifest schema)
 - Integrity checks (file hashes match manifest)
 - Authenticity checks (Ed25519 signature verification)
+
+Given a directory, verifies every .epi file below it in parallel
+(`epi verify DIR/ --jobs N --json` streams one JSON result per line).
 """
 
 import json
+import os
 from pathlib import Path
+from typing import Optional
 
 import typer
 from rich.console import Console
@@ -17,6 +22,7 @@ from rich.table import Table
 
 from epi_core.container import EPIContainer
 from epi_core.trust import verify_signature, get_signer_name, create_verification_report
+from epi_core.verifier import VerificationSummary, find_epi_files, verify_files
 from epi_cli.keys import KeyManager
 
 # Create sub-app for verify commands
@@ -32,9 +38,13 @@ console = Console()
 @verify_app.callback(invoke_without_command=True)
 def verify(
     ctx: typer.Context,
-    epi_file: Path = typer.Argument(..., help="Path to .epi file to verify"),
-    json_output: bool = typer.Option(False, "--json", help="Output as JSON"),
-    verbose: bool = typer.Option(False, "--verbose", "-v", help="Verbose output")
+    epi_file: Path = typer.Argument(..., help="Path to .epi file (or directory of .epi files) to verify"),
+    json_output: bool = typer.Option(False, "--json", help="Output as JSON (NDJSON for directories)"),
+    verbose: bool = typer.Option(False, "--verbose", "-v", help="Verbose output"),
+    jobs: Optional[int] = typer.Option(
+        None, "--jobs", "-j", min=1,
+        help="Worker processes for directory verification (default: CPU count)"
+    )
 ):
     """
     Verify .epi file integrity and authenticity.
@@ -49,6 +59,10 @@ def verify(
         console.print(f"[red][FAIL] Error:[/red] File not found: {epi_file}")
         raise typer.Exit(1)
     
+    if epi_file.is_dir():
+        verify_directory(epi_file, jobs=jobs, json_output=json_output, verbose=verbose)
+        return
+    
     # Initialize verification state
     manifest = None
     integrity_ok = False
@@ -76,7 +90,10 @@ def verify(
         if verbose:
             console.print("\n[bold]Step 2: Integrity Checks[/bold]")
         
-        integrity_ok, mismatches = EPIContainer.verify_integrity(epi_file)
+        integrity_ok, mismatches = EPIContainer.verify_integrity(
+            epi_file,
+            max_workers=min(8, os.cpu_count() or 1)
+        )
         
         if verbose:
             if integrity_ok:
@@ -147,6 +164,74 @@ def verify(
         raise typer.Exit(1)
 
 
+def verify_directory(
+    directory: Path,
+    jobs: Optional[int] = None,
+    json_output: bool = False,
+    verbose: bool = False
+) -> None:
+    """
+    Verify every .epi file below a directory.
+    
+    Results are printed as they complete (one JSON object per line with
+    --json), followed by an aggregate summary.
+    
+    Args:
+        directory: Directory to search for .epi files
+        jobs: Worker processes (default: CPU count)
+        json_output: Emit NDJSON instead of a table
+        verbose: Show mismatch details for failed files
+        
+    Raises:
+        typer.Exit: With code 1 if any file failed verification
+    """
+    epi_files = find_epi_files(directory)
+    summary = VerificationSummary()
+    
+    if not json_output:
+        console.print(f"[dim]Verifying {len(epi_files)} file(s) in {directory}...[/dim]")
+    
+    try:
+        for report in verify_files(epi_files, jobs=jobs):
+            summary.add(report)
+            
+            if json_output:
+                # Plain print: one compact JSON object per line, flushed immediately
+                print(json.dumps(report), flush=True)
+                continue
+            
+            if "error" in report:
+                console.print(f"[red][FAIL][/red] {report['file']}: {report['error']}")
+            elif report["ok"]:
+                console.print(f"[green][OK][/green]   {report['file']} [dim]({report['trust_level']})[/dim]")
+            else:
+                console.print(f"[red][FAIL][/red] {report['file']}: {report['trust_message']}")
+                if verbose:
+                    for filename, reason in report["mismatches"].items():
+                        console.print(f"    [red]-[/red] {filename}: {reason}")
+    except KeyboardInterrupt:
+        if not json_output:
+            console.print("\n[yellow]Verification interrupted[/yellow]")
+        raise typer.Exit(130)
+    
+    totals = summary.to_dict()
+    if json_output:
+        print(json.dumps({"summary": totals}), flush=True)
+    else:
+        table = Table(title="Verification Summary", show_header=False)
+        table.add_column("Metric", style="bold")
+        table.add_column("Value")
+        table.add_row("Files", str(totals["total"]))
+        table.add_row("Passed", f"[green]{totals['passed']}[/green]")
+        table.add_row("Failed", f"[red]{totals['failed']}[/red]" if totals["failed"] else "0")
+        table.add_row("Unsigned", str(totals["unsigned"]))
+        table.add_row("Elapsed", f"{totals['elapsed_seconds']}s")
+        console.print(table)
+    
+    if not summary.all_ok:
+        raise typer.Exit(1)
+
+
 def print_trust_report(report: dict, epi_file: Path, verbose: bool = False):
     """
     Print a formatted trust report using Rich.
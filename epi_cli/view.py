@@ -1,8 +1,13 @@
 """
 EPI CLI View - Open .epi file in browser viewer.
 
-Extracts the embedded viewer.html and opens it in the default browser.
+Builds a viewer with every step of the recording (the viewer.html packed
+in the .epi may be a preview) and opens it in the default browser.
 No code execution, all data is pre-rendered JSON.
+
+With --serve, large recordings are served instead: a local HTTP server
+(epi_core.server) reads the .epi in place and the viewer fetches pages of
+steps, search results and blobs from it as needed.
 """
 
 import tempfile
@@ -13,6 +18,8 @@ from pathlib import Path
 import typer
 from rich.console import Console
 
+from epi_core.container import EPIContainer
+
 console = Console()
 
 app = typer.Typer(name="view", help="View .epi file in browser")
@@ -68,6 +75,8 @@ def _resolve_epi_file(name_or_path: str) -> Path:
 def view(
     ctx: typer.Context,
     epi_file: str = typer.Argument(..., help="Path or name of .epi file to view"),
+    serve: bool = typer.Option(False, "--serve", help="Serve the recording over local HTTP instead of building a viewer file (for large recordings)"),
+    port: int = typer.Option(0, "--port", help="Port for --serve (default: any free port)"),
 ):
     """
     Open .epi file in browser viewer.
@@ -80,6 +89,7 @@ def view(
     Example:
         epi view my_script_20251121_231501
         epi view my_recording.epi
+        epi view --serve big_run.epi
     """
     # Resolve the file path
     try:
@@ -94,20 +104,17 @@ def view(
         console.print(f"[red][FAIL] Error:[/red] Not a valid .epi file: {resolved_path}")
         raise typer.Exit(1)
     
+    if serve:
+        _serve(resolved_path, port)
+        return
+    
     try:
         # Create temp directory for viewer
         temp_dir = Path(tempfile.mkdtemp(prefix="epi_view_"))
         viewer_path = temp_dir / "viewer.html"
         
-        # Extract viewer.html
-        with zipfile.ZipFile(resolved_path, "r") as zf:
-            if "viewer.html" not in zf.namelist():
-                console.print("[red][FAIL] Error:[/red] No viewer found in .epi file")
-                console.print("[dim]This file may have been created with an older version of EPI[/dim]")
-                raise typer.Exit(1)
-            
-            # Extract viewer
-            zf.extract("viewer.html", temp_dir)
+        # Full viewer, read straight from the archive
+        viewer_path.write_text(EPIContainer.render_viewer(resolved_path), encoding="utf-8")
         
         # Open in browser
         file_url = viewer_path.as_uri()
@@ -130,4 +137,26 @@ def view(
 
 
 
- 
\ No newline at end of file
+ 
+
+
+def _serve(epi_path: Path, port: int) -> None:
+    """Run the evidence server for epi_path until interrupted."""
+    from epi_core.server import EvidenceServer
+    
+    try:
+        server = EvidenceServer(epi_path, port=port)
+    except Exception as e:
+        console.print(f"[red][FAIL] Error:[/red] {e}")
+        raise typer.Exit(1)
+    
+    try:
+        console.print(f"[green][OK][/green] Serving {epi_path.name} at {server.url}")
+        console.print("[dim]Press Ctrl+C to stop[/dim]")
+        if not webbrowser.open(server.url):
+            console.print(f"[dim]Open manually:[/dim] {server.url}")
+        server.serve_forever()
+    except KeyboardInterrupt:
+        console.print("\n[yellow]Stopped[/yellow]")
+    finally:
+        server.server_close()
@@ -0,0 +1,248 @@
+"""
+EPI Core Blobs - Content-addressed storage for large step payloads.
+
+RAG-heavy agents put whole documents into every llm.request (and get long
+texts back), so steps.jsonl - which every analytics/ls/debug call parses -
+is dominated by a few large strings that often repeat from step to step.
+
+While recording, string/bytes values above a size threshold are moved out
+of the step into
+
+    blobs/<sha256>              (raw payload, written once per session)
+
+and replaced in place by a typed reference:
+
+    {"$blob": "<sha256>", "type": "text" | "bytes", "size": <bytes>}
+
+Identical payloads share one blob. Blobs are packed like any other file,
+so manifest.file_manifest covers them. Readers resolve references only
+when they need the text (BlobReader.resolve); code that only looks at
+step kinds, counts or small fields never touches the blobs.
+"""
+
+import hashlib
+import os
+import re
+import tempfile
+import threading
+import zipfile
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Set, Union
+
+
+BLOBS_DIRNAME = "blobs"
+BLOB_REF_KEY = "$blob"
+
+# Payloads larger than this (characters for text, bytes for binary) become blobs
+DEFAULT_BLOB_THRESHOLD = 16 * 1024
+
+_DIGEST_RE = re.compile(r"^[0-9a-f]{64}$")
+
+# Resolved blobs kept in memory per reader
+_BLOB_CACHE_SIZE = 64
+
+
+def is_blob_ref(value: Any) -> bool:
+    """Check whether a value is a blob reference."""
+    return isinstance(value, dict) and isinstance(value.get(BLOB_REF_KEY), str) and "type" in value
+
+
+class BlobWriter:
+    """
+    Moves large payloads out of step content into blobs/<sha256>.
+
+    Safe to use from multiple threads and processes sharing one recording
+    directory: blobs are written to a temp file and renamed into place, and
+    a digest that already exists is never rewritten.
+    """
+
+    def __init__(self, root_dir: Path, threshold: int = DEFAULT_BLOB_THRESHOLD):
+        """
+        Initialize blob writer.
+
+        Args:
+            root_dir: Recording directory (blobs go to root_dir/blobs)
+            threshold: Externalize str/bytes values larger than this
+
+        Raises:
+            ValueError: If threshold is not positive
+        """
+        if threshold < 1:
+            raise ValueError("Blob threshold must be positive")
+
+        self.blobs_dir = Path(root_dir) / BLOBS_DIRNAME
+        self.threshold = threshold
+        self._written: Set[str] = set()
+        self._lock = threading.Lock()
+
+    def externalize(self, value: Any) -> Any:
+        """
+        Replace large payloads in a step's content with blob references.
+
+        Args:
+            value: Step content (not modified)
+
+        Returns:
+            Content with large str/bytes values replaced; the same object
+            if nothing was large enough
+        """
+        if isinstance(value, dict):
+            changed = None
+            for key, item in value.items():
+                new_item = self.externalize(item)
+                if new_item is not item:
+                    if changed is None:
+                        changed = dict(value)
+                    changed[key] = new_item
+            return value if changed is None else changed
+
+        if isinstance(value, (list, tuple)):
+            items = [self.externalize(item) for item in value]
+            if all(new is old for new, old in zip(items, value)):
+                return value
+            return items
+
+        if isinstance(value, str) and len(value) > self.threshold:
+            return self._store(value.encode("utf-8"), "text")
+
+        if isinstance(value, (bytes, bytearray)) and len(value) > self.threshold:
+            return self._store(bytes(value), "bytes")
+
+        return value
+
+    def _store(self, data: bytes, kind: str) -> Dict[str, Any]:
+        """Write a payload once and return its reference."""
+        digest = hashlib.sha256(data).hexdigest()
+
+        with self._lock:
+            known = digest in self._written
+        if not known:
+            path = self.blobs_dir / digest
+            if not path.exists():
+                self.blobs_dir.mkdir(parents=True, exist_ok=True)
+                fd, tmp_path = tempfile.mkstemp(dir=self.blobs_dir, prefix=".tmp-")
+                try:
+                    with os.fdopen(fd, "wb") as f:
+                        f.write(data)
+                    os.replace(tmp_path, path)
+                except BaseException:
+                    Path(tmp_path).unlink(missing_ok=True)
+                    raise
+            with self._lock:
+                self._written.add(digest)
+
+        return {BLOB_REF_KEY: digest, "type": kind, "size": len(data)}
+
+
+class BlobReader:
+    """
+    Resolves blob references from a recording directory or a .epi file.
+
+    Blobs are read on first use and a few are cached, so resolving the
+    steps you look at costs nothing for the steps you don't.
+    """
+
+    def __init__(self, source: Union[Path, str, zipfile.ZipFile]):
+        """
+        Initialize blob reader.
+
+        Args:
+            source: Recording directory, path to a .epi file, or an open ZipFile
+                    (not closed by the reader)
+        """
+        self._zip: Optional[zipfile.ZipFile] = None
+        self._dir: Optional[Path] = None
+        self._owns_zip = False
+
+        if isinstance(source, zipfile.ZipFile):
+            self._zip = source
+        elif Path(source).is_dir():
+            self._dir = Path(source)
+        else:
+            self._zip = zipfile.ZipFile(source, "r")
+            self._owns_zip = True
+
+        self._cache: "OrderedDict[str, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def read(self, digest: str) -> bytes:
+        """
+        Read a blob's raw bytes.
+
+        Args:
+            digest: SHA-256 hex digest from a reference
+
+        Returns:
+            Blob content
+
+        Raises:
+            KeyError: If the blob is missing (or the digest is malformed)
+            ValueError: If the blob content does not match its digest
+        """
+        if not isinstance(digest, str) or not _DIGEST_RE.match(digest):
+            raise KeyError(f"Not a blob digest: {digest!r}")
+
+        with self._lock:
+            data = self._cache.get(digest)
+            if data is not None:
+                self._cache.move_to_end(digest)
+                return data
+
+        name = f"{BLOBS_DIRNAME}/{digest}"
+        try:
+            if self._zip is not None:
+                with self._lock:
+                    data = self._zip.read(name)
+            else:
+                data = (self._dir / BLOBS_DIRNAME / digest).read_bytes()
+        except (KeyError, FileNotFoundError):
+            raise KeyError(f"Blob not found: {digest}")
+
+        if hashlib.sha256(data).hexdigest() != digest:
+            raise ValueError(f"Blob content does not match its digest: {digest}")
+
+        with self._lock:
+            self._cache[digest] = data
+            if len(self._cache) > _BLOB_CACHE_SIZE:
+                self._cache.popitem(last=False)
+        return data
+
+    def resolve(self, value: Any) -> Any:
+        """
+        Replace blob references with their payloads.
+
+        Args:
+            value: Step, step content or any JSON value (not modified)
+
+        Returns:
+            Value with text blobs as str and binary blobs as bytes. A
+            reference whose blob is missing is left as is.
+        """
+        if is_blob_ref(value):
+            try:
+                data = self.read(value[BLOB_REF_KEY])
+            except KeyError:
+                return value
+            return data.decode("utf-8") if value["type"] == "text" else data
+
+        if isinstance(value, dict):
+            return {key: self.resolve(item) for key, item in value.items()}
+
+        if isinstance(value, list):
+            return [self.resolve(item) for item in value]
+
+        return value
+
+    def close(self) -> None:
+        """Close the .epi file if the reader opened it."""
+        if self._owns_zip and self._zip is not None:
+            self._zip.close()
+            self._zip = None
+
+    def __enter__(self) -> "BlobReader":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
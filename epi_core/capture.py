@@ -0,0 +1,188 @@
+"""
+EPI Core Capture - Copy artifact files into a recording cheaply.
+
+log_artifact used to copy the whole file, and pack then read it again to
+hash and once more to compress. capture_file() instead:
+
+1. Hardlinks the file (opt-in: the artifact then IS the source file, so
+   later writes to the source change the evidence)
+2. Reflinks it (FICLONE on Linux: btrfs, XFS, overlayfs on those) - no data copied
+3. Copies it in the kernel with os.copy_file_range (server-side on NFS,
+   block cloning on some filesystems)
+4. Falls back to a user-space copy that hashes each chunk as it is written
+
+and returns the SHA-256 computed during capture. EPIContainer.pack takes
+these as known_hashes and only streams the file into the archive, as long
+as its size and mtime still match what was captured.
+
+Already-compressed formats (see is_precompressed) are stored in the
+archive with ZIP_STORED: deflating them costs CPU and gains nothing.
+"""
+
+import hashlib
+import os
+import shutil
+import sys
+from pathlib import Path
+from typing import Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+
+# How a file was captured (CapturedFile.method)
+CAPTURE_HARDLINK = "hardlink"
+CAPTURE_REFLINK = "reflink"
+CAPTURE_COPY_FILE_RANGE = "copy_file_range"
+CAPTURE_COPY = "copy"
+
+# ioctl request number of FICLONE (linux/fs.h)
+_FICLONE = 0x40049409
+
+# Chunk size for hashing and user-space copies
+_CHUNK_SIZE = 1024 * 1024
+
+# Formats whose payload is already compressed (stored, not deflated, in the .epi)
+PRECOMPRESSED_SUFFIXES = frozenset({
+    ".gz", ".tgz", ".bz2", ".xz", ".zst", ".lz4", ".br", ".zip", ".7z", ".epi", ".whl", ".jar",
+    ".parquet", ".orc", ".avro",
+    ".png", ".jpg", ".jpeg", ".gif", ".webp", ".avif", ".heic",
+    ".mp3", ".mp4", ".m4a", ".mov", ".webm", ".ogg", ".flac",
+})
+
+
+def is_precompressed(name: str) -> bool:
+    """Check whether a file name has an already-compressed format's suffix."""
+    return Path(name).suffix.lower() in PRECOMPRESSED_SUFFIXES
+
+
+def fingerprint(path: Path) -> Tuple[int, int]:
+    """(size, mtime in ns) of a file, to tell whether it changed since capture."""
+    st = os.stat(path)
+    return st.st_size, st.st_mtime_ns
+
+
+class CapturedFile:
+    """A file captured into a recording, with the hash computed on the way in."""
+
+    def __init__(self, sha256: str, size: int, mtime_ns: int, method: str):
+        """
+        Initialize captured file record.
+
+        Args:
+            sha256: Hexadecimal SHA-256 of the content
+            size: Size in bytes of the captured copy
+            mtime_ns: Modification time of the captured copy
+            method: How it was captured (CAPTURE_* constant)
+        """
+        self.sha256 = sha256
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self.method = method
+
+    def is_current(self, path: Path) -> bool:
+        """Check that the captured copy is unchanged (so sha256 still holds)."""
+        try:
+            return fingerprint(path) == (self.size, self.mtime_ns)
+        except OSError:
+            return False
+
+    def __repr__(self) -> str:
+        return f"CapturedFile(sha256={self.sha256[:12]}..., size={self.size}, method={self.method!r})"
+
+
+def _hash_file(path: Path) -> str:
+    """SHA-256 of a file."""
+    sha256 = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(_CHUNK_SIZE):
+            sha256.update(chunk)
+    return sha256.hexdigest()
+
+
+def _reflink(src, dest) -> bool:
+    """Clone src into dest (FICLONE); False if the filesystem can't."""
+    if fcntl is None or not sys.platform.startswith("linux"):
+        return False
+    try:
+        fcntl.ioctl(dest.fileno(), _FICLONE, src.fileno())
+        return True
+    except OSError:
+        return False
+
+
+def _copy_file_range(src, dest, size: int) -> bool:
+    """Copy src into dest inside the kernel; False if unsupported."""
+    if not hasattr(os, "copy_file_range"):
+        return False
+    copied = 0
+    try:
+        while copied < size:
+            n = os.copy_file_range(src.fileno(), dest.fileno(), size - copied, copied, copied)
+            if n == 0:
+                break
+            copied += n
+    except OSError:
+        if copied:
+            raise
+        return False
+    return copied == size
+
+
+def _copy_and_hash(src, dest) -> str:
+    """User-space copy that hashes each chunk as it is written."""
+    sha256 = hashlib.sha256()
+    while chunk := src.read(_CHUNK_SIZE):
+        sha256.update(chunk)
+        dest.write(chunk)
+    return sha256.hexdigest()
+
+
+def capture_file(source: Path, dest: Path, hardlink: bool = False) -> CapturedFile:
+    """
+    Capture a file into a recording and hash it.
+
+    The destination gets the source's timestamps and permission bits (like
+    shutil.copy2). An existing destination is replaced.
+
+    Args:
+        source: File to capture
+        dest: Path inside the recording directory
+        hardlink: Link instead of copying when both are on one filesystem
+                  (default: False). Only for files nothing writes to afterwards.
+
+    Returns:
+        CapturedFile with the content's SHA-256 and how it was captured
+    """
+    source, dest = Path(source), Path(dest)
+    dest.unlink(missing_ok=True)
+
+    if hardlink:
+        try:
+            os.link(source, dest)
+            size, mtime_ns = fingerprint(dest)
+            return CapturedFile(_hash_file(dest), size, mtime_ns, CAPTURE_HARDLINK)
+        except OSError:
+            pass  # Other filesystem, or links not supported: copy instead
+
+    with open(source, "rb") as src, open(dest, "wb") as out:
+        size = os.fstat(src.fileno()).st_size
+        if _reflink(src, out):
+            method, digest = CAPTURE_REFLINK, None
+        elif size and _copy_file_range(src, out, size):
+            method, digest = CAPTURE_COPY_FILE_RANGE, None
+        else:
+            out.seek(0)
+            out.truncate()
+            src.seek(0)
+            method, digest = CAPTURE_COPY, _copy_and_hash(src, out)
+
+    if digest is None:
+        # Kernel-side copies never pass through here; hash the copy once
+        digest = _hash_file(dest)
+
+    shutil.copystat(source, dest)
+    size, mtime_ns = fingerprint(dest)
+    return CapturedFile(digest, size, mtime_ns, method)
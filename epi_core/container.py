@@ -8,22 +8,98 @@ Implements the EPI file format specification:
 - Artifacts and cache (content-addressed)
 """
 
+import base64
+import gzip
 import hashlib
+import io
 import json
+import os
+import re
 import tempfile
 import threading
 import zipfile
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
 
+from epi_core.blobs import BLOBS_DIRNAME
+from epi_core.capture import CapturedFile, is_precompressed
 from epi_core.schemas import ManifestModel
+from epi_core.step_index import (
+    STEP_INDEX_NAME,
+    STEPS_NAME,
+    finish_steps_member,
+    indexed_step_count,
+    write_steps_member,
+)
+from epi_core.summary import SUMMARY_FILENAME, summarize_steps
 
 
 # EPI mimetype constant (vendor-specific MIME type per RFC 6838)
 EPI_MIMETYPE = "application/vnd.epi+zip"
 
-# Thread-safe lock for ZIP packing operations (prevents concurrent corruption)
-_zip_pack_lock = threading.Lock()
+# Assembled viewer template, keyed by the template files' mtimes
+_viewer_shell_cache: Optional[tuple] = None
+
+# Per-output-path locks for ZIP packing: two packs into the same .epi are
+# serialized (prevents corruption), packs into different files run in parallel.
+# Maps resolved path -> [lock, number of holders/waiters]
+_pack_locks: Dict[str, List] = {}
+_pack_locks_guard = threading.Lock()
+
+# Read buffer for hashing/packing (large reads keep big artifacts off the syscall path)
+_READ_BUFFER_SIZE = 1024 * 1024
+
+# Placeholder in epi_viewer_static/index.html replaced by the embedded data
+_EPI_DATA_PLACEHOLDER = (
+    '<script id="epi-data" type="application/json">\n    {\n        "manifest": {},\n'
+    '        "steps": []\n    }\n    </script>'
+)
+
+# Embedded step payloads larger than this are gzipped and base64-encoded
+# (the viewer inflates them with DecompressionStream)
+_EMBED_GZIP_THRESHOLD = 256 * 1024
+
+# What viewer.html embeds: "preview" (default) embeds the first steps only,
+# the viewer reads the rest from the archive's own steps.jsonl; "full" embeds
+# a second copy of every step
+VIEWER_MODES = ("preview", "full")
+
+# Preview cap (whichever is reached first)
+VIEWER_PREVIEW_STEPS = 500
+VIEWER_PREVIEW_BYTES = 256 * 1024
+
+# Blob references in raw step lines (see epi_core.blobs)
+_BLOB_REF_PATTERN = re.compile(r'"\$blob":\s*"([0-9a-f]{64})"')
+
+
+@contextmanager
+def _output_path_lock(output_path: Path) -> Iterator[None]:
+    """
+    Hold the pack lock for one output path.
+
+    Entries are reference counted and dropped when the last user leaves,
+    so the table only ever holds paths that are being packed right now.
+
+    Args:
+        output_path: .epi file being written
+    """
+    key = os.path.normcase(os.path.abspath(output_path))
+
+    with _pack_locks_guard:
+        entry = _pack_locks.get(key)
+        if entry is None:
+            entry = _pack_locks[key] = [threading.Lock(), 0]
+        entry[1] += 1
+
+    try:
+        with entry[0]:
+            yield
+    finally:
+        with _pack_locks_guard:
+            entry[1] -= 1
+            if entry[1] == 0:
+                del _pack_locks[key]
 
 
 class EPIContainer:
@@ -35,6 +111,9 @@ class EPIContainer:
     - manifest.json (metadata + signatures + file hashes)
     - steps.jsonl (timeline of recorded events)
     - artifacts/ (captured files, content-addressed)
+    - blobs/ (large step payloads, content-addressed, see epi_core.blobs)
+    - summary.json (step counts, errors, tokens, time span; see epi_core.summary)
+    - index/steps.idx (step offsets for random access; see epi_core.step_index)
     - cache/ (API/LLM responses)
     - env.json (environment snapshot)
     """
@@ -54,83 +133,352 @@ class EPIContainer:
         
         with open(file_path, "rb") as f:
             # Read in chunks for memory efficiency
-            while chunk := f.read(8192):
+            while chunk := f.read(_READ_BUFFER_SIZE):
                 sha256.update(chunk)
         
         return sha256.hexdigest()
     
     @staticmethod
-    def _create_embedded_viewer(source_dir: Path, manifest: ManifestModel) -> str:
+    def _write_and_hash(
+        zf: zipfile.ZipFile,
+        file_path: Path,
+        arc_name: str,
+        known_hash: Optional[str] = None
+    ) -> str:
+        """
+        Compress a file into the archive and hash it in the same pass.
+        
+        Each chunk read from disk is fed to both SHA-256 and the deflate
+        stream, so the file is read exactly once. Already-compressed formats
+        are stored rather than deflated (see epi_core.capture.is_precompressed).
+        
+        Args:
+            zf: Archive open for writing
+            file_path: File to add
+            arc_name: Name inside the archive
+            known_hash: SHA-256 computed when the file was captured
+                        (skips hashing; the caller checks it is still valid)
+            
+        Returns:
+            str: Hexadecimal SHA-256 hash of the file
+        """
+        sha256 = hashlib.sha256() if known_hash is None else None
+        zinfo = zipfile.ZipInfo.from_file(file_path, arc_name)
+        zinfo.compress_type = zipfile.ZIP_STORED if is_precompressed(arc_name) else zipfile.ZIP_DEFLATED
+        
+        with open(file_path, "rb") as src, zf.open(zinfo, "w") as dest:
+            while chunk := src.read(_READ_BUFFER_SIZE):
+                if sha256 is not None:
+                    sha256.update(chunk)
+                dest.write(chunk)
+        
+        return known_hash if sha256 is None else sha256.hexdigest()
+    
+    @staticmethod
+    def _summarize(steps_file: Path) -> bytes:
+        """
+        Build summary.json for a steps.jsonl that was recorded without one.
+        
+        Args:
+            steps_file: Path to steps.jsonl
+            
+        Returns:
+            bytes: summary.json content (see epi_core.summary)
+        """
+        summary = summarize_steps(json.loads(line) for line in EPIContainer._iter_step_lines(steps_file))
+        return json.dumps(summary, indent=2).encode("utf-8")
+    
+    @staticmethod
+    def _iter_step_lines(steps_file: Path):
+        """
+        Yield the raw JSON lines of steps.jsonl, skipping blank or invalid ones.
+        
+        Args:
+            steps_file: Path to steps.jsonl
+        """
+        with open(steps_file, "r", encoding="utf-8", buffering=_READ_BUFFER_SIZE) as f:
+            yield from EPIContainer._valid_step_lines(f)
+    
+    @staticmethod
+    def _valid_step_lines(lines: Iterable[str]):
+        """
+        Yield stripped, parseable step lines.
+        
+        Lines are passed through verbatim (no re-serialization); each is only
+        parsed to make sure a torn or corrupt line cannot break the embed.
+        
+        Args:
+            lines: Text lines of a steps.jsonl
+        """
+        for line in lines:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            yield line
+    
+    @staticmethod
+    def _create_embedded_viewer(
+        source_dir: Path,
+        manifest: ManifestModel,
+        viewer_mode: str = "preview",
+        total_steps: Optional[int] = None
+    ) -> str:
         """
         Create embedded HTML viewer with injected data.
         
         Args:
             source_dir: Directory containing steps.jsonl
             manifest: Manifest to embed
+            viewer_mode: "preview" or "full" (see VIEWER_MODES)
+            total_steps: Steps in steps.jsonl, if known (e.g. from the step
+                         index); a preview then stops reading at its cap
             
         Returns:
             str: Complete HTML with embedded data
         """
-        # Load viewer template
+        steps_file = source_dir / "steps.jsonl"
+        step_lines = EPIContainer._iter_step_lines(steps_file) if steps_file.exists() else iter(())
+        
+        blobs_dir = source_dir / BLOBS_DIRNAME
+        blob_names = []
+        if blobs_dir.is_dir():
+            blob_names = [
+                blob.name for blob in sorted(blobs_dir.iterdir())
+                if blob.is_file() and not blob.name.startswith(".")
+            ]
+        
+        return EPIContainer._render_viewer(
+            manifest, step_lines, blob_names, lambda name: (blobs_dir / name).read_bytes(), viewer_mode,
+            total_steps
+        )
+    
+    @staticmethod
+    def render_viewer(epi_path: Path, viewer_mode: str = "full") -> str:
+        """
+        Build a viewer for an existing .epi file without extracting it.
+        
+        Used to open recordings whose stored viewer.html is a preview: the
+        steps are read straight from the archive's steps.jsonl.
+        
+        Args:
+            epi_path: Path to .epi file
+            viewer_mode: "full" (default) or "preview" (see VIEWER_MODES)
+            
+        Returns:
+            str: Complete HTML with embedded data
+        """
+        with zipfile.ZipFile(epi_path, "r") as zf:
+            manifest = EPIContainer._read_manifest_from_zip(zf)
+            names = zf.namelist()
+            prefix = f"{BLOBS_DIRNAME}/"
+            blob_names = sorted(name[len(prefix):] for name in names if name.startswith(prefix) and name != prefix)
+            
+            if STEPS_NAME not in names:
+                return EPIContainer._render_viewer(manifest, iter(()), blob_names, None, viewer_mode)
+            
+            # Step count from the index header (older archives have none)
+            total_steps = None
+            if STEP_INDEX_NAME in names:
+                try:
+                    total_steps = indexed_step_count(zf.read(STEP_INDEX_NAME))
+                except ValueError:
+                    pass
+            
+            with zf.open(STEPS_NAME) as raw:
+                step_lines = EPIContainer._valid_step_lines(io.TextIOWrapper(raw, encoding="utf-8"))
+                return EPIContainer._render_viewer(
+                    manifest, step_lines, blob_names, lambda name: zf.read(prefix + name), viewer_mode,
+                    total_steps
+                )
+    
+    @staticmethod
+    def render_api_viewer(manifest: ManifestModel, api_url: str) -> str:
+        """
+        Viewer that pages steps from an HTTP API instead of embedding them.
+        
+        Served by epi view --serve (see epi_core.server), which answers the
+        viewer's requests under api_url.
+        
+        Args:
+            manifest: Manifest to embed
+            api_url: Base URL of the API (e.g. "/api")
+            
+        Returns:
+            str: Complete HTML
+        """
+        shell = EPIContainer._load_viewer_shell()
+        if shell is None:
+            return EPIContainer._create_minimal_viewer(manifest)
+        
+        parts = shell.split(_EPI_DATA_PLACEHOLDER, 1)
+        if len(parts) != 2:
+            return shell
+        
+        data = (
+            '<script id="epi-data" type="application/json">{"manifest": '
+            + manifest.model_dump_json().replace("<", "\\u003c")
+            + ', "api": ' + json.dumps(api_url).replace("<", "\\u003c")
+            + '}</script>'
+        )
+        return parts[0] + data + parts[1]
+    
+    @staticmethod
+    def _render_viewer(
+        manifest: ManifestModel,
+        step_lines: Iterator[str],
+        blob_names: List[str],
+        read_blob: Optional[Callable[[str], bytes]],
+        viewer_mode: str,
+        total_steps: Optional[int] = None
+    ) -> str:
+        """
+        Splice manifest, step lines and blobs into the viewer shell.
+        
+        Args:
+            manifest: Manifest to embed
+            step_lines: Valid step lines, in order
+            blob_names: Names (sha256) of the recording's blobs
+            read_blob: Returns a blob's bytes by name
+            viewer_mode: "preview" or "full" (see VIEWER_MODES)
+            total_steps: Number of step lines, if known; otherwise a
+                         truncated preview counts the rest of step_lines
+            
+        Returns:
+            str: Complete HTML with embedded data
+        """
+        if viewer_mode not in VIEWER_MODES:
+            raise ValueError(
+                f"Unknown viewer mode: {viewer_mode!r} (expected one of {', '.join(VIEWER_MODES)})"
+            )
+        
+        shell = EPIContainer._load_viewer_shell()
+        if shell is None:
+            # Fallback: minimal viewer if template not found
+            return EPIContainer._create_minimal_viewer(manifest)
+        
+        # Splice embedded data in: step lines are copied from steps.jsonl as-is
+        # instead of being parsed into a list and re-dumped
+        parts = shell.split(_EPI_DATA_PLACEHOLDER, 1)
+        if len(parts) != 2:
+            return shell
+        
+        data_parts = [
+            '<script id="epi-data" type="application/json">{"manifest": ',
+            manifest.model_dump_json().replace("<", "\\u003c"),
+            '}</script>\n',
+        ]
+        
+        # A preview stops at the cap; data-total tells the viewer how many
+        # steps the archive's steps.jsonl holds
+        lines = []
+        size = 0
+        total = None
+        for line in step_lines:
+            if viewer_mode == "preview" and lines and (
+                len(lines) >= VIEWER_PREVIEW_STEPS or size + len(line) > VIEWER_PREVIEW_BYTES
+            ):
+                if total_steps is not None:
+                    total = max(total_steps, len(lines) + 1)
+                else:
+                    total = len(lines) + 1 + sum(1 for _ in step_lines)
+                break
+            lines.append(line)
+            size += len(line) + 1
+        
+        # Steps as compact JSON lines, which the viewer only splits on load
+        # and parses a page at a time as they scroll into view. "<" only
+        # occurs inside JSON strings, so escaping it keeps the payload valid
+        # JSON that cannot close the script element.
+        payload = "\n".join(lines).replace("<", "\\u003c").encode("utf-8")
+        attributes = ' type="application/x-ndjson"'
+        if total is not None:
+            attributes += f' data-total="{total}"'
+        if len(payload) > _EMBED_GZIP_THRESHOLD:
+            encoded = base64.b64encode(gzip.compress(payload, compresslevel=6, mtime=0)).decode("ascii")
+            data_parts.append(f'<script id="epi-steps"{attributes} data-encoding="gzip">{encoded}</script>')
+        else:
+            data_parts.append(f'<script id="epi-steps"{attributes}>{payload.decode("utf-8")}</script>')
+        
+        # Blob payloads, each once, decoded by the viewer only when opened
+        # (a preview only carries the blobs its steps reference)
+        if total is not None:
+            referenced = {sha for line in lines for sha in _BLOB_REF_PATTERN.findall(line)}
+            blob_names = [name for name in blob_names if name in referenced]
+        if blob_names and read_blob is not None:
+            blobs = {name: base64.b64encode(read_blob(name)).decode("ascii") for name in blob_names}
+            data_parts.append(
+                f'\n<script id="epi-blobs" type="application/json">{json.dumps(blobs)}</script>'
+            )
+        
+        return parts[0] + "".join(data_parts) + parts[1]
+    
+    @staticmethod
+    def _load_viewer_shell() -> Optional[str]:
+        """
+        Viewer template with CSS/JS inlined (without data).
+        
+        Cached per process and rebuilt when a template file changes, so
+        packing many small sessions does not re-read the assets every time.
+        
+        Returns:
+            str: Viewer HTML containing the data placeholder, or None if
+                 the template is missing
+        """
+        global _viewer_shell_cache
+        
         viewer_static_dir = Path(__file__).parent.parent / "epi_viewer_static"
         template_path = viewer_static_dir / "index.html"
-        app_js_path = viewer_static_dir / "app.js"
-        css_path = viewer_static_dir / "viewer_lite.css"
+        asset_paths = [
+            template_path,
+            viewer_static_dir / "app.js",
+            viewer_static_dir / "crypto.js",
+            viewer_static_dir / "zip.js",
+            viewer_static_dir / "viewer_lite.css",
+        ]
+        
+        key = []
+        for path in asset_paths:
+            try:
+                key.append(path.stat().st_mtime_ns)
+            except OSError:
+                key.append(None)
+        key = tuple(key)
+        
+        cached = _viewer_shell_cache
+        if cached is not None and cached[0] == key:
+            return cached[1]
         
         if not template_path.exists():
-            # Fallback: minimal viewer if template not found
-            return EPIContainer._create_minimal_viewer(manifest)
+            return None
         
         # Read template and assets
-        template_html = template_path.read_text(encoding="utf-8")
-        app_js = app_js_path.read_text(encoding="utf-8") if app_js_path.exists() else ""
-        crypto_js_path = viewer_static_dir / "crypto.js"
-        crypto_js = crypto_js_path.read_text(encoding="utf-8") if crypto_js_path.exists() else ""
-        css_styles = css_path.read_text(encoding="utf-8") if css_path.exists() else ""
-        
-        # Read steps from steps.jsonl
-        steps = []
-        steps_file = source_dir / "steps.jsonl"
-        if steps_file.exists():
-            for line in steps_file.read_text(encoding="utf-8").strip().split("\n"):
-                if line:
-                    try:
-                        steps.append(json.loads(line))
-                    except json.JSONDecodeError:
-                        pass
-        
-        # Create embedded data
-        embedded_data = {
-            "manifest": manifest.model_dump(mode="json"),
-            "steps": steps
-        }
-        
-        # Inject data into template
-        data_json = json.dumps(embedded_data, indent=2)
-        html_with_data = template_html.replace(
-            '<script id="epi-data" type="application/json">\n    {\n        "manifest": {},\n        "steps": []\n    }\n    </script>',
-            f'<script id="epi-data" type="application/json">{data_json}</script>'
+        template_html, app_js, crypto_js, zip_js, css_styles = (
+            path.read_text(encoding="utf-8") if path.exists() else ""
+            for path in asset_paths
         )
         
-        # Replaces Tailwind CDN with local CSS
-        html_with_css = html_with_data.replace(
+        # Inline assets while the template is still small
+        html = template_html.replace(
             '<script src="https://cdn.tailwindcss.com"></script>',
             f'<style>{css_styles}</style>'
         )
         
-        # Inline crypto.js and app.js
         js_content = ""
         if crypto_js:
             js_content += f"<script>{crypto_js}</script>\n"
+        if zip_js:
+            js_content += f"<script>{zip_js}</script>\n"
         if app_js:
             js_content += f"<script>{app_js}</script>"
-            
-        html_with_js = html_with_css.replace(
-            '<script src="app.js"></script>',
-            js_content
-        )
         
-        return html_with_js
+        html = html.replace('<script src="app.js"></script>', js_content)
+        
+        _viewer_shell_cache = (key, html)
+        return html
     
     @staticmethod
     def _create_minimal_viewer(manifest: ManifestModel) -> str:
@@ -156,62 +504,67 @@ class EPIContainer:
     def pack(
         source_dir: Path,
         manifest: ManifestModel,
-        output_path: Path
+        output_path: Path,
+        signer: Optional[Callable[[ManifestModel], ManifestModel]] = None,
+        known_hashes: Optional[Dict[str, CapturedFile]] = None,
+        viewer_mode: str = "preview"
     ) -> None:
         """
         Create a .epi file from a source directory.
         
-        Thread-safe: Uses a module-level lock to prevent concurrent ZIP corruption.
+        Thread-safe: Packs into the same output path are serialized to prevent
+        ZIP corruption; packs into different paths run concurrently.
         
-        The packing process:
+        The packing process (single pass over the source files):
         1. Write mimetype first (uncompressed) per ZIP spec
-        2. Hash all files in source_dir
-        3. Populate manifest.file_manifest with hashes
-        4. Write all files to ZIP
-        5. Write manifest.json last
+        2. Stream every file into the ZIP, hashing it while it is compressed
+        3. Populate manifest.file_manifest with hashes (adding summary.json
+           if the recorder did not write one, and index/steps.idx)
+        4. Sign the manifest (if a signer is given)
+        5. Write embedded viewer (a preview of the first steps unless
+           viewer_mode is "full"; the viewer reads the rest from steps.jsonl)
+        6. Write manifest.json last
+        
+        Signing inside pack means the viewer and manifest are written exactly
+        once, so a signed .epi costs the same I/O as an unsigned one.
         
         Args:
             source_dir: Directory containing files to pack
-            manifest: Manifest model (file_manifest will be populated)
+            manifest: Manifest model (file_manifest, and public_key/signature
+                      when signed, will be populated)
             output_path: Path for output .epi file
+            signer: Optional callable returning a signed copy of the manifest
+                    (e.g. functools.partial(sign_manifest, private_key=key))
+            known_hashes: Archive name -> CapturedFile for files hashed when
+                          they were captured (see epi_core.capture); used
+                          instead of re-hashing while the file is unchanged
+            viewer_mode: What viewer.html embeds: "preview" (default) or
+                         "full" (every step; see VIEWER_MODES)
             
         Raises:
             FileNotFoundError: If source_dir doesn't exist
-            ValueError: If source_dir is not a directory
+            ValueError: If source_dir is not a directory or viewer_mode is unknown
+            SigningError: If the signer fails (no .epi file is left behind)
         """
-        # CRITICAL: Acquire lock to prevent concurrent ZIP corruption
-        # Multiple threads writing to ZIP simultaneously causes file header mismatches
-        with _zip_pack_lock:
+        # CRITICAL: Lock the output path to prevent concurrent ZIP corruption
+        # Multiple threads writing to one ZIP simultaneously causes file header mismatches
+        with _output_path_lock(output_path):
             if not source_dir.exists():
                 raise FileNotFoundError(f"Source directory not found: {source_dir}")
             
             if not source_dir.is_dir():
                 raise ValueError(f"Source must be a directory: {source_dir}")
             
+            if viewer_mode not in VIEWER_MODES:
+                raise ValueError(
+                    f"Unknown viewer mode: {viewer_mode!r} (expected one of {', '.join(VIEWER_MODES)})"
+                )
+            
             # Ensure output directory exists
             output_path.parent.mkdir(parents=True, exist_ok=True)
             
-            # Collect all files and compute hashes
             file_manifest = {}
-            files_to_pack = []
-            
-            for file_path in source_dir.rglob("*"):
-                if file_path.is_file():
-                    # Get relative path for archive
-                    rel_path = file_path.relative_to(source_dir)
-                    arc_name = str(rel_path).replace("\\", "/")  # Use forward slashes in ZIP
-                    
-                    # Compute hash
-                    file_hash = EPIContainer._compute_file_hash(file_path)
-                    file_manifest[arc_name] = file_hash
-                    
-                    files_to_pack.append((file_path, arc_name))
-            
-            # Update manifest with file hashes
-            manifest.file_manifest = file_manifest
-            
-            # Create embedded viewer with data injection
-            viewer_html = EPIContainer._create_embedded_viewer(source_dir, manifest)
+            step_index = None
             
             # Create ZIP file
             with zipfile.ZipFile(output_path, "w", zipfile.ZIP_DEFLATED) as zf:
@@ -222,24 +575,75 @@ class EPIContainer:
                     compress_type=zipfile.ZIP_STORED  # No compression
                 )
                 
-                # 2. Write all other files
-                for file_path, arc_name in files_to_pack:
-                    zf.write(file_path, arc_name, compress_type=zipfile.ZIP_DEFLATED)
+                # 2. Write all other files, hashing as we go
+                for file_path in sorted(source_dir.rglob("*")):
+                    if file_path.is_file():
+                        # Get relative path for archive
+                        rel_path = file_path.relative_to(source_dir)
+                        arc_name = str(rel_path).replace("\\", "/")  # Use forward slashes in ZIP
+                        if arc_name == STEP_INDEX_NAME:
+                            continue  # Rebuilt below for the steps.jsonl being packed
+                        
+                        if arc_name == STEPS_NAME:
+                            # Deflated with restart points, indexed in the same pass
+                            file_manifest[arc_name], step_index = write_steps_member(zf, file_path)
+                            continue
+                        
+                        captured = (known_hashes or {}).get(arc_name)
+                        known_hash = captured.sha256 if captured and captured.is_current(file_path) else None
+                        
+                        file_manifest[arc_name] = EPIContainer._write_and_hash(
+                            zf, file_path, arc_name, known_hash
+                        )
+                
+                # Recorders write summary.json as they go; summarize anything else here
+                steps_file = source_dir / "steps.jsonl"
+                if SUMMARY_FILENAME not in file_manifest and steps_file.is_file():
+                    summary_bytes = EPIContainer._summarize(steps_file)
+                    zf.writestr(SUMMARY_FILENAME, summary_bytes, compress_type=zipfile.ZIP_DEFLATED)
+                    file_manifest[SUMMARY_FILENAME] = hashlib.sha256(summary_bytes).hexdigest()
                 
-                # 3. Write embedded viewer
+                # Step offset table for random access (see epi_core.step_index)
+                if step_index is not None:
+                    zf.writestr(STEP_INDEX_NAME, step_index, compress_type=zipfile.ZIP_DEFLATED)
+                    file_manifest[STEP_INDEX_NAME] = hashlib.sha256(step_index).hexdigest()
+                
+                # 3. Update manifest with file hashes
+                manifest.file_manifest = file_manifest
+                
+                # 4. Sign now that file_manifest is final
+                if signer is not None:
+                    try:
+                        signed_manifest = signer(manifest)
+                    except BaseException:
+                        zf.close()
+                        output_path.unlink(missing_ok=True)
+                        raise
+                    manifest.public_key = signed_manifest.public_key
+                    manifest.signature = signed_manifest.signature
+                
+                # 5. Write embedded viewer (needs the final, signed manifest)
+                total_steps = indexed_step_count(step_index) if step_index is not None else None
+                viewer_html = EPIContainer._create_embedded_viewer(
+                    source_dir, manifest, viewer_mode, total_steps
+                )
                 zf.writestr(
                     "viewer.html",
                     viewer_html,
                     compress_type=zipfile.ZIP_DEFLATED
                 )
                 
-                # 4. Write manifest.json LAST (after all files are hashed)
+                # 6. Write manifest.json LAST (after all files are hashed)
                 manifest_json = manifest.model_dump_json(indent=2)
                 zf.writestr(
                     "manifest.json",
                     manifest_json,
                     compress_type=zipfile.ZIP_DEFLATED
                 )
+            
+            # steps.jsonl was deflated by write_steps_member; complete its local header
+            if step_index is not None:
+                finish_steps_member(output_path)
     
     @staticmethod
     def unpack(epi_path: Path, dest_dir: Optional[Path] = None) -> Path:
@@ -309,57 +713,120 @@ class EPIContainer:
             raise ValueError(f"Not a valid ZIP file: {epi_path}")
         
         with zipfile.ZipFile(epi_path, "r") as zf:
-            try:
-                manifest_data = zf.read("manifest.json").decode("utf-8")
-                manifest_dict = json.loads(manifest_data)
-                return ManifestModel(**manifest_dict)
-            except KeyError:
-                raise ValueError("Missing manifest.json in .epi archive")
-            except json.JSONDecodeError as e:
-                raise ValueError(f"Invalid JSON in manifest.json: {e}")
+            return EPIContainer._read_manifest_from_zip(zf)
     
     @staticmethod
-    def verify_integrity(epi_path: Path) -> tuple[bool, dict[str, str]]:
+    def _read_manifest_from_zip(zf: zipfile.ZipFile) -> ManifestModel:
+        """
+        Parse manifest.json from an already open archive.
+        
+        Args:
+            zf: Open .epi archive
+            
+        Returns:
+            ManifestModel: Parsed manifest
+            
+        Raises:
+            ValueError: If manifest.json is missing or invalid
+        """
+        try:
+            manifest_data = zf.read("manifest.json").decode("utf-8")
+            manifest_dict = json.loads(manifest_data)
+            return ManifestModel(**manifest_dict)
+        except KeyError:
+            raise ValueError("Missing manifest.json in .epi archive")
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON in manifest.json: {e}")
+    
+    @staticmethod
+    def _hash_member(zf: zipfile.ZipFile, name: str) -> str:
+        """
+        Compute SHA-256 of an archive member by streaming it (no extraction).
+        
+        Args:
+            zf: Open .epi archive
+            name: Member name
+            
+        Returns:
+            str: Hexadecimal SHA-256 hash
+        """
+        sha256 = hashlib.sha256()
+        
+        with zf.open(name) as f:
+            while chunk := f.read(_READ_BUFFER_SIZE):
+                sha256.update(chunk)
+        
+        return sha256.hexdigest()
+    
+    @staticmethod
+    def verify_integrity(
+        epi_path: Path,
+        max_workers: Optional[int] = None
+    ) -> tuple[bool, dict[str, str]]:
         """
         Verify file integrity of a .epi archive.
         
         Checks that all files listed in manifest.file_manifest match their stored hashes.
+        Members are streamed from the archive into SHA-256 (nothing is
+        extracted to disk) and the archive is opened only once.
         
         Args:
             epi_path: Path to .epi file
+            max_workers: Hash members in parallel on this many threads
+                         (hashlib and zlib release the GIL). Default: sequential.
             
         Returns:
             tuple: (all_valid: bool, mismatches: dict[filename: str -> reason: str])
             
         Raises:
             FileNotFoundError: If .epi file doesn't exist
+            ValueError: If file is not a valid .epi archive
         """
         if not epi_path.exists():
             raise FileNotFoundError(f"EPI file not found: {epi_path}")
         
-        manifest = EPIContainer.read_manifest(epi_path)
+        if not zipfile.is_zipfile(epi_path):
+            raise ValueError(f"Not a valid ZIP file: {epi_path}")
+        
         mismatches = {}
         
-        # Extract to temp directory for verification
-        with tempfile.TemporaryDirectory(prefix="epi_verify_") as temp_dir:
-            temp_path = Path(temp_dir)
-            EPIContainer.unpack(epi_path, temp_path)
+        with zipfile.ZipFile(epi_path, "r") as zf:
+            manifest = EPIContainer._read_manifest_from_zip(zf)
+            
+            # Verify mimetype
+            try:
+                mimetype_data = zf.read("mimetype").decode("utf-8").strip()
+                if mimetype_data != EPI_MIMETYPE:
+                    raise ValueError(
+                        f"Invalid mimetype: expected '{EPI_MIMETYPE}', got '{mimetype_data}'"
+                    )
+            except KeyError:
+                raise ValueError("Missing mimetype file in .epi archive")
             
             # Check each file in manifest
-            for filename, expected_hash in manifest.file_manifest.items():
-                file_path = temp_path / filename
-                
-                if not file_path.exists():
-                    mismatches[filename] = f"File missing"
-                    continue
-                
-                actual_hash = EPIContainer._compute_file_hash(file_path)
+            members = set(zf.namelist())
+            to_hash = []
+            for filename in manifest.file_manifest:
+                if filename not in members:
+                    mismatches[filename] = "File missing"
+                else:
+                    to_hash.append(filename)
+            
+            if max_workers and max_workers > 1 and len(to_hash) > 1:
+                # ZipFile serializes raw reads internally; decompression and
+                # hashing run concurrently
+                from concurrent.futures import ThreadPoolExecutor
+                with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                    hashes = pool.map(lambda name: EPIContainer._hash_member(zf, name), to_hash)
+                    actual_hashes = dict(zip(to_hash, hashes))
+            else:
+                actual_hashes = {name: EPIContainer._hash_member(zf, name) for name in to_hash}
+            
+            for filename in to_hash:
+                expected_hash = manifest.file_manifest[filename]
+                actual_hash = actual_hashes[filename]
                 
                 if actual_hash != expected_hash:
                     mismatches[filename] = f"Hash mismatch: expected {expected_hash}, got {actual_hash}"
         
         return (len(mismatches) == 0, mismatches)
-
-
-
- 
\ No newline at end of file
@@ -0,0 +1,207 @@
+"""
+EPI Core History - Delta encoding for llm.request message histories.
+
+Chat agents resend the whole conversation on every turn, so the N-th
+llm.request carries N messages and steps.jsonl grows quadratically with
+conversation length. With delta encoding, a request whose messages start
+with the messages of an earlier request only stores what was appended:
+
+    "messages": {"$history": {"base": "<hash of the earlier request's messages>",
+                              "append": [<new messages>],
+                              "hash": "<hash of this request's messages>"}}
+
+The first request of a conversation has "base": null and appends all of
+its messages. Hashes are chained over the messages (h_i = H(h_{i-1}, m_i)),
+so the hash of every prefix of a history falls out of one pass, and
+several interleaved conversations in one recording each find their own
+base.
+
+Steps must be decoded in recording order (HistoryDecoder / iter_steps in
+epi_core.reader); a base that was never seen leaves the step's messages
+undecoded rather than guessing. The decoder remembers as many histories
+as the encoder, in the same LRU order, so it holds every base the
+encoder can still refer to.
+"""
+
+import hashlib
+import json
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+
+HISTORY_REF_KEY = "$history"
+
+# Message histories the encoder remembers as possible bases
+DEFAULT_MAX_HISTORIES = 256
+
+
+def is_history_ref(value: Any) -> bool:
+    """Check whether a messages value is delta encoded."""
+    return isinstance(value, dict) and isinstance(value.get(HISTORY_REF_KEY), dict)
+
+
+def _chain(previous: str, message: Any) -> str:
+    """Hash of a history given the hash of its prefix and its last message."""
+    canonical = json.dumps(message, sort_keys=True, separators=(",", ":"),
+                           ensure_ascii=False, default=str)
+    return hashlib.sha256(f"{previous}\n{canonical}".encode("utf-8")).hexdigest()[:32]
+
+
+def history_hashes(messages: List[Any]) -> List[str]:
+    """
+    Chained hashes of every non-empty prefix of a message list.
+
+    Args:
+        messages: Message list
+
+    Returns:
+        List where item i is the hash of messages[:i + 1]
+    """
+    hashes = []
+    current = ""
+    for message in messages:
+        current = _chain(current, message)
+        hashes.append(current)
+    return hashes
+
+
+class HistoryEncoder:
+    """
+    Replaces a request's message list by a delta against an earlier request.
+
+    Not thread-safe: the caller must encode and assign step indices under
+    one lock so a base is always written before the steps that use it.
+    """
+
+    def __init__(self, max_histories: int = DEFAULT_MAX_HISTORIES):
+        """
+        Initialize encoder.
+
+        Args:
+            max_histories: Recent histories remembered as bases (default: 256)
+        """
+        self.max_histories = max_histories
+        self._known: "OrderedDict[str, None]" = OrderedDict()
+
+    def encode(self, messages: List[Any]) -> Dict[str, Any]:
+        """
+        Encode a message list.
+
+        Args:
+            messages: The request's full message list (not modified)
+
+        Returns:
+            {"$history": {"base", "append", "hash"}} value for "messages"
+        """
+        hashes = history_hashes(messages)
+
+        # Longest prefix that an earlier request sent as its full history
+        base_count = 0
+        for count in range(len(hashes), 0, -1):
+            if hashes[count - 1] in self._known:
+                base_count = count
+                self._known.move_to_end(hashes[count - 1])
+                break
+
+        full_hash = hashes[-1] if hashes else ""
+        self._known[full_hash] = None
+        self._known.move_to_end(full_hash)
+        while len(self._known) > self.max_histories:
+            self._known.popitem(last=False)
+
+        return {HISTORY_REF_KEY: {
+            "base": hashes[base_count - 1] if base_count else None,
+            "append": list(messages[base_count:]),
+            "hash": full_hash,
+        }}
+
+
+class HistoryDecoder:
+    """
+    Rebuilds full message lists from delta-encoded requests, in recording order.
+
+    Histories are kept per encoder: steps merged from several processes
+    (see epi_core.segments) were encoded by one encoder per process.
+    """
+
+    def __init__(self, max_histories: int = DEFAULT_MAX_HISTORIES):
+        """
+        Initialize decoder.
+
+        Args:
+            max_histories: Recent histories remembered per encoder; must be
+                           at least the encoder's (default: 256)
+        """
+        self.max_histories = max_histories
+        self._histories: Dict[Any, "OrderedDict[str, List[Any]]"] = {}
+
+    def decode(self, value: Any, source: Any = None) -> Any:
+        """
+        Decode a "messages" value.
+
+        Args:
+            value: Stored messages value (plain lists pass through)
+            source: Which encoder wrote it (e.g. the recording process)
+
+        Returns:
+            Full message list, or value unchanged if it is not delta encoded
+            or its base has not been seen
+        """
+        if not is_history_ref(value):
+            return value
+
+        ref = value[HISTORY_REF_KEY]
+        base = ref.get("base")
+        append = ref.get("append") or []
+        histories = self._histories.setdefault(source, OrderedDict())
+
+        # Same LRU updates as HistoryEncoder.encode: touch the base, add the new history
+        if base is None:
+            messages = list(append)
+        elif base in histories:
+            histories.move_to_end(base)
+            messages = histories[base] + list(append)
+        else:
+            return value
+
+        if ref.get("hash"):
+            histories[ref["hash"]] = messages
+            histories.move_to_end(ref["hash"])
+            while len(histories) > self.max_histories:
+                histories.popitem(last=False)
+        return list(messages)
+
+    def decode_step(self, step: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Decode a step's content.messages (any kind) in place.
+
+        Args:
+            step: Parsed step
+
+        Returns:
+            The same step
+        """
+        content = step.get("content")
+        if isinstance(content, dict) and is_history_ref(content.get("messages")):
+            process = step.get("process")
+            source = process.get("pid") if isinstance(process, dict) else None
+            content["messages"] = self.decode(content["messages"], source)
+        return step
+
+
+def encode_messages(encoder: Optional[HistoryEncoder], content: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Delta-encode content["messages"] if it is a message list.
+
+    Args:
+        encoder: Encoder (None disables encoding)
+        content: Step content (not modified)
+
+    Returns:
+        Content with messages encoded, or content itself
+    """
+    if encoder is None or not isinstance(content, dict) or not isinstance(content.get("messages"), list):
+        return content
+    encoded = dict(content)
+    encoded["messages"] = encoder.encode(content["messages"])
+    return encoded
@@ -0,0 +1,116 @@
+"""
+EPI Core Reader - Read a recording's steps the way they were logged.
+
+steps.jsonl may store payloads in encoded form: delta-encoded llm.request
+histories (epi_core.history) and large values moved to blobs/
+(epi_core.blobs). iter_steps() streams steps from a .epi file, an
+unpacked recording directory or a bare steps.jsonl and undoes the
+encodings, so analysis code sees every request's full message list.
+
+Histories are always reconstructed (cheap, needs steps in order); blob
+references are only resolved on request, since most readers never look
+at the large payloads.
+"""
+
+import io
+import json
+import zipfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, IO, Iterator, List, Optional, Union
+
+from epi_core.blobs import BLOB_REF_KEY, BlobReader
+from epi_core.history import HISTORY_REF_KEY, HistoryDecoder
+
+
+StepSource = Union[Path, str, zipfile.ZipFile]
+
+
+@contextmanager
+def _open_steps(source: StepSource):
+    """Yield (steps.jsonl text stream, BlobReader factory) for a source."""
+    if isinstance(source, zipfile.ZipFile):
+        yield _zip_steps(source), lambda: BlobReader(source)
+        return
+
+    path = Path(source)
+    if path.is_dir():
+        steps_file = path / "steps.jsonl"
+        with (open(steps_file, "r", encoding="utf-8") if steps_file.exists() else _empty()) as f:
+            yield f, lambda: BlobReader(path)
+        return
+
+    if zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path, "r") as zf:
+            yield _zip_steps(zf), lambda: BlobReader(zf)
+        return
+
+    # A bare steps.jsonl: blobs live next to it
+    with open(path, "r", encoding="utf-8") as f:
+        yield f, lambda: BlobReader(path.parent)
+
+
+def _zip_steps(zf: zipfile.ZipFile) -> IO[str]:
+    """steps.jsonl of an open archive as a text stream (empty if missing)."""
+    try:
+        return io.TextIOWrapper(zf.open("steps.jsonl"), encoding="utf-8")
+    except KeyError:
+        return _empty()
+
+
+def _empty() -> IO[str]:
+    return io.StringIO("")
+
+
+def iter_steps(source: StepSource, resolve_blobs: bool = False) -> Iterator[Dict[str, Any]]:
+    """
+    Stream decoded steps in recording order.
+
+    Blank and malformed lines are skipped.
+
+    Args:
+        source: .epi file, recording directory, steps.jsonl, or an open ZipFile
+        resolve_blobs: Replace blob references with their payloads
+                       (default: False; references are left in place)
+
+    Yields:
+        Step dicts with full llm.request message histories
+    """
+    decoder = HistoryDecoder()
+    blobs: Optional[BlobReader] = None
+
+    with _open_steps(source) as (lines, open_blobs):
+        for line in lines:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                step = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if not isinstance(step, dict):
+                continue
+
+            # Plain-text checks keep the common case (nothing encoded) free
+            if HISTORY_REF_KEY in line:
+                decoder.decode_step(step)
+            if resolve_blobs and BLOB_REF_KEY in line:
+                if blobs is None:
+                    blobs = open_blobs()
+                step = blobs.resolve(step)
+
+            yield step
+
+
+def load_steps(source: StepSource, resolve_blobs: bool = False) -> List[Dict[str, Any]]:
+    """
+    Read all decoded steps (see iter_steps).
+
+    Args:
+        source: .epi file, recording directory, steps.jsonl, or an open ZipFile
+        resolve_blobs: Replace blob references with their payloads
+
+    Returns:
+        List of step dicts in recording order
+    """
+    return list(iter_steps(source, resolve_blobs=resolve_blobs))
@@ -3,11 +3,23 @@ EPI Core Redactor - Automatic secret redaction for security.
 
 Provides regex-based pattern matching to automatically remove sensitive
 information like API keys, tokens, and credentials from captured data.
+
+Strings are prefiltered on the literal prefix ("anchor") of each pattern,
+e.g. `sk-`, `AKIA`, `ghp_`, `eyJ`, `-----BEGIN`: a string that contains
+none of the anchors is returned untouched without running any regex, and
+otherwise only the patterns whose anchor occurs are applied, each in a
+single subn() pass that both replaces and counts.
+
+An optional bounded LRU memo (cache_size > 0) skips the scan entirely for
+strings seen before, such as a system prompt resent on every LLM call.
 """
 
+import hashlib
 import re
+import threading
+from collections import OrderedDict
 from pathlib import Path
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 import json
 
 
@@ -69,6 +81,42 @@ REDACT_ENV_VARS = {
 
 REDACTION_PLACEHOLDER = "***REDACTED***"
 
+# Regex metacharacters that end a pattern's literal prefix
+_REGEX_META = set('.^$*+?{}[]\\|()')
+
+# Characters matched case-insensitively by `re` that str.casefold() does not map
+_CASEFOLD_FIXES = {'\u0131': 'i'}  # dotless i
+
+# Anchors shorter than this are too common to be a useful prefilter
+_MIN_ANCHOR_LENGTH = 3
+
+# Strings shorter than this bypass the memo (hashing costs more than scanning)
+DEFAULT_CACHE_MIN_LENGTH = 256
+
+
+def _literal_prefix(pattern_str: str) -> str:
+    """
+    Return the literal text every match of a regex must start with.
+    
+    Args:
+        pattern_str: Regex source
+        
+    Returns:
+        str: Literal prefix ('' if the pattern has none or uses alternation)
+    """
+    if '|' in pattern_str:
+        # Top-level alternation could match without the first branch's prefix
+        return ''
+    
+    prefix = []
+    for ch in pattern_str:
+        if ch in _REGEX_META:
+            if ch in '*?{' and prefix:
+                prefix.pop()  # Previous char is optional/repeated
+            break
+        prefix.append(ch)
+    return ''.join(prefix)
+
 
 class Redactor:
     """
@@ -78,7 +126,14 @@ class Redactor:
     from captured workflow data.
     """
     
-    def __init__(self, config_path: Path | None = None, enabled: bool = True, allowlist: List[str] = None):
+    def __init__(
+        self,
+        config_path: Path | None = None,
+        enabled: bool = True,
+        allowlist: List[str] = None,
+        cache_size: int = 0,
+        cache_min_length: int = DEFAULT_CACHE_MIN_LENGTH
+    ):
         """
         Initialize redactor with optional custom configuration.
         
@@ -86,12 +141,24 @@ class Redactor:
             config_path: Optional path to config.toml with custom patterns
             enabled: Whether redaction is enabled (default: True)
             allowlist: Optional list of strings to NEVER redact
+            cache_size: Max entries in the redaction memo; 0 disables it
+                        (default: 0, can also be set in config.toml)
+            cache_min_length: Only strings at least this long are memoized
+                              (default: 256)
         """
         self.enabled = enabled
         self.patterns: List[Tuple[re.Pattern, str]] = []
         self.env_vars_to_redact = REDACT_ENV_VARS.copy()
         self.allowlist = set(allowlist) if allowlist else set()
         
+        # Redaction memo: digest -> (redacted text or None if unchanged, count)
+        self.cache_size = cache_size
+        self.cache_min_length = cache_min_length
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._cache: "OrderedDict[bytes, Tuple[Optional[str], int]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        
         # Compile default patterns
         for pattern_str, description in DEFAULT_REDACTION_PATTERNS:
             try:
@@ -104,6 +171,124 @@ class Redactor:
         # Load custom config if provided
         if config_path and config_path.exists():
             self._load_config(config_path)
+        
+        self._build_prefilter()
+    
+    def _build_prefilter(self):
+        """
+        Index patterns by their casefolded literal anchor.
+        
+        Patterns without a usable anchor are always applied.
+        """
+        self._always: List[int] = []
+        anchors: Dict[str, List[int]] = {}
+        
+        for i, (pattern, _) in enumerate(self.patterns):
+            anchor = _literal_prefix(pattern.pattern).casefold()
+            if len(anchor) >= _MIN_ANCHOR_LENGTH:
+                anchors.setdefault(anchor, []).append(i)
+            else:
+                self._always.append(i)
+        
+        self._anchors: List[Tuple[str, List[int]]] = list(anchors.items())
+        self._prefilter_size = len(self.patterns)
+        
+        # Memoized results were computed with the old pattern set
+        self.cache_clear()
+    
+    def _redact_str_cached(self, text: str) -> Tuple[str, int]:
+        """
+        Redact one string through the LRU memo.
+        
+        Args:
+            text: String to scan
+            
+        Returns:
+            tuple: (redacted_text, redaction_count)
+        """
+        key = hashlib.blake2b(
+            text.encode('utf-8', 'surrogatepass'),
+            digest_size=16
+        ).digest()
+        
+        with self._cache_lock:
+            entry = self._cache.get(key)
+            if entry is not None:
+                self._cache.move_to_end(key)
+                self.cache_hits += 1
+        
+        if entry is not None:
+            redacted, count = entry
+            return (text if redacted is None else redacted), count
+        
+        redacted, count = self._redact_str(text)
+        
+        with self._cache_lock:
+            self.cache_misses += 1
+            # Store None for unchanged strings so clean text is not kept twice
+            self._cache[key] = (None if count == 0 else redacted, count)
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        
+        return redacted, count
+    
+    def cache_info(self) -> Dict[str, int]:
+        """
+        Redaction memo statistics.
+        
+        Returns:
+            dict: hits, misses, size and maxsize
+        """
+        with self._cache_lock:
+            return {
+                "hits": self.cache_hits,
+                "misses": self.cache_misses,
+                "size": len(self._cache),
+                "maxsize": self.cache_size,
+            }
+    
+    def cache_clear(self) -> None:
+        """Empty the redaction memo and reset its counters."""
+        with self._cache_lock:
+            self._cache.clear()
+            self.cache_hits = 0
+            self.cache_misses = 0
+    
+    def _redact_str(self, text: str) -> Tuple[str, int]:
+        """
+        Redact one string.
+        
+        Args:
+            text: String to scan
+            
+        Returns:
+            tuple: (redacted_text, redaction_count)
+        """
+        if len(self.patterns) != self._prefilter_size:
+            # Patterns were added after construction
+            self._build_prefilter()
+        
+        # Fast reject: which anchors occur at all?
+        folded = text.casefold()
+        for src, dst in _CASEFOLD_FIXES.items():
+            if src in folded:
+                folded = folded.replace(src, dst)
+        
+        candidates = [i for anchor, indexes in self._anchors if anchor in folded for i in indexes]
+        if self._always:
+            candidates.extend(self._always)
+        if not candidates:
+            return text, 0
+        if len(candidates) > 1:
+            # Apply in configuration order, like a full sequential scan would
+            candidates = sorted(set(candidates))
+        
+        redaction_count = 0
+        for i in candidates:
+            text, count = self.patterns[i][0].subn(REDACTION_PLACEHOLDER, text)
+            redaction_count += count
+        
+        return text, redaction_count
     
     def _load_config(self, config_path: Path):
         """
@@ -138,6 +323,10 @@ class Redactor:
             # Load allowlist
             if 'redaction' in config and 'allowlist' in config['redaction']:
                 self.allowlist.update(config['redaction']['allowlist'])
+            
+            # Enable redaction memo (explicit constructor argument wins)
+            if 'redaction' in config and 'cache_size' in config['redaction'] and not self.cache_size:
+                self.cache_size = int(config['redaction']['cache_size'])
         
         except Exception as e:
             print(f"Warning: Could not load config from {config_path}: {e}")
@@ -185,15 +374,11 @@ class Redactor:
             # Check allowlist first
             if data in self.allowlist:
                 return data, 0
-                
-            redacted_str = data
-            for pattern, description in self.patterns:
-                matches = pattern.findall(redacted_str)
-                if matches:
-                    redacted_str = pattern.sub(REDACTION_PLACEHOLDER, redacted_str)
-                    redaction_count += len(matches) if isinstance(matches, list) else 1
             
-            return redacted_str, redaction_count
+            if self.cache_size > 0 and len(data) >= self.cache_min_length:
+                return self._redact_str_cached(data)
+            
+            return self._redact_str(data)
         
         else:
             # Primitive types (int, float, bool, None)
@@ -252,6 +437,10 @@ enabled = true
 
 # Allowlist: Strings that should NEVER be redacted (exact match)
 # allowlist = ["sk-not-actually-a-key", "my-public-token"]
+
+# Memoize redaction of long repeated strings (system prompts, chat history).
+# Number of cached strings; 0 disables the memo.
+# cache_size = 4096
 """
     
     config_path.parent.mkdir(parents=True, exist_ok=True)
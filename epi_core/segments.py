@@ -0,0 +1,172 @@
+"""
+EPI Core Segments - Per-process step journals for multi-process recordings.
+
+When `epi run` / `epi record` records a program, every Python process that
+inherits the recording environment (multiprocessing workers, subprocess
+helpers, ...) starts its own recorder. Instead of all of them appending to
+one steps.jsonl with colliding indices, each process writes its own
+segment:
+
+    <steps_dir>/segments/<pid>-<start_ns>.jsonl   (steps, local indices)
+    <steps_dir>/segments/<pid>-<start_ns>.json    (process info)
+
+pid + start time identify a process even if the OS reuses the pid.
+
+Before packing, merge_segments() performs a k-way merge of all segments by
+timestamp into a single steps.jsonl with fresh global indices, tagging
+every step with the process that recorded it:
+
+    {"index": 7, ..., "process": {"pid": 4242, "index": 3}}
+
+and writes processes.json describing every process that recorded steps.
+"""
+
+import heapq
+import json
+import os
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+
+SEGMENTS_DIRNAME = "segments"
+PROCESSES_FILENAME = "processes.json"
+
+
+def create_segment(steps_dir: Path) -> Path:
+    """
+    Create the segment for the current process.
+
+    Args:
+        steps_dir: Recording directory (EPI_STEPS_DIR)
+
+    Returns:
+        Path to this process's (empty) segment journal
+    """
+    start_ns = time.time_ns()
+    segments_dir = Path(steps_dir) / SEGMENTS_DIRNAME
+    segments_dir.mkdir(parents=True, exist_ok=True)
+
+    key = f"{os.getpid()}-{start_ns}"
+    info = {
+        "pid": os.getpid(),
+        "ppid": os.getppid(),
+        "started_at": datetime.fromtimestamp(start_ns / 1e9, tz=timezone.utc)
+                              .replace(tzinfo=None).isoformat(),
+    }
+    (segments_dir / f"{key}.json").write_text(json.dumps(info), encoding="utf-8")
+
+    segment = segments_dir / f"{key}.jsonl"
+    segment.touch()
+    return segment
+
+
+def _segment_key(path: Path) -> Tuple[Optional[int], int]:
+    """(pid, start_ns) parsed from a segment file name."""
+    pid, _, start = path.stem.partition("-")
+    return (int(pid) if pid.isdigit() else None, int(start) if start.isdigit() else 0)
+
+
+def _timestamp_key(value) -> datetime:
+    """Sortable UTC timestamp (naive) from a step's ISO-8601 timestamp."""
+    try:
+        ts = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return datetime.min
+    if ts.tzinfo is not None:
+        ts = ts.astimezone(timezone.utc).replace(tzinfo=None)
+    return ts
+
+
+def _read_segment(path: Path, order: int, pid: Optional[int]) -> Iterator[Tuple]:
+    """
+    Stream (timestamp, order, position, step, pid) tuples from one segment.
+
+    Lines that are not valid JSON objects are skipped.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        for position, line in enumerate(f):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                step = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if not isinstance(step, dict):
+                continue
+            yield (_timestamp_key(step.get("timestamp")), order, position, step, pid)
+
+
+def merge_segments(steps_dir: Path) -> int:
+    """
+    Merge per-process segments into steps_dir/steps.jsonl.
+
+    Segments are merged by timestamp (ties: segment order, then position
+    in the segment, so each process keeps its own order). An existing
+    steps.jsonl (steps recorded without segments) takes part in the merge
+    without process attribution. The segments directory is removed
+    afterwards so it is not packed.
+
+    Args:
+        steps_dir: Recording directory
+
+    Returns:
+        Number of steps in the merged steps.jsonl (0 if there were no segments)
+    """
+    steps_dir = Path(steps_dir)
+    segments_dir = steps_dir / SEGMENTS_DIRNAME
+    if not segments_dir.is_dir():
+        return 0
+
+    steps_file = steps_dir / "steps.jsonl"
+
+    # Inputs: the plain journal (if any) first, then segments by start time
+    inputs: List[Tuple[Path, Optional[dict]]] = []
+    if steps_file.exists():
+        inputs.append((steps_file, None))
+
+    for segment in sorted(segments_dir.glob("*.jsonl"), key=lambda p: _segment_key(p)[1]):
+        try:
+            info = json.loads(segment.with_suffix(".json").read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            # Process info is missing (e.g. killed mid-write): use the file name
+            info = {"pid": _segment_key(segment)[0]}
+        info["segment"] = segment.name
+        inputs.append((segment, info))
+
+    streams = [
+        _read_segment(path, order, info.get("pid") if info else None)
+        for order, (path, info) in enumerate(inputs)
+    ]
+    step_counts = [0] * len(inputs)
+
+    merged_path = steps_dir / "steps.jsonl.merging"
+    count = 0
+    with open(merged_path, "w", encoding="utf-8") as out:
+        for _, order, _, step, pid in heapq.merge(*streams):
+            if inputs[order][1] is not None:
+                step["process"] = {"pid": pid, "index": step.get("index")}
+            step["index"] = count
+            out.write(json.dumps(step, ensure_ascii=False) + "\n")
+            step_counts[order] += 1
+            count += 1
+
+    os.replace(merged_path, steps_file)
+
+    processes = []
+    for (path, info), steps in zip(inputs, step_counts):
+        # Helper processes that recorded nothing (e.g. resource trackers) are left out
+        if info is not None and steps:
+            processes.append(dict(info, steps=steps))
+    (steps_dir / PROCESSES_FILENAME).write_text(
+        json.dumps(processes, indent=2), encoding="utf-8"
+    )
+
+    # Segments are now part of steps.jsonl; don't pack them twice
+    for path in segments_dir.iterdir():
+        path.unlink()
+    segments_dir.rmdir()
+
+    return count
@@ -0,0 +1,338 @@
+"""
+EPI Core Server - Serve a .epi file to the browser viewer, in place.
+
+epi view --serve runs this instead of writing a viewer with every step
+embedded. The archive is opened once and never extracted: steps are read
+through StepReader (only the chunks a page needs are inflated), blobs and
+JSON members straight from the ZIP, so a multi-GB recording opens as fast
+as a small one. Endpoints (GET; JSON unless noted):
+
+    /                         viewer (epi_viewer_static) paging from /api
+    /static/<asset>           viewer assets (app.js, crypto.js, ...)
+    /api/manifest             manifest.json, as signed
+    /api/summary              summary.json (or a scan for older recordings)
+    /api/steps?offset=&limit=&kind=
+                              {"total", "offset", "steps"}; offset counts
+                              steps (of that kind, if given)
+    /api/search?q=&kind=&start=&limit=
+                              {"query", "steps", "next"}; scans at most
+                              SEARCH_SCAN_STEPS steps from step index start,
+                              next is where to continue (null when done)
+    /api/blobs/<sha256>       raw blob payload (application/octet-stream)
+
+Only requests addressed to the loopback name the server was opened as are
+answered (Host must be 127.0.0.1:<port> or localhost:<port>, or the
+explicit host it was bound to), so a web page that rebinds its own DNS name
+to 127.0.0.1 cannot read the recording through the user's browser.
+
+Responses carry an ETag derived from the archive (size and mtime) and the
+request; a matching If-None-Match is answered with 304. Blobs are content
+addressed and also marked immutable.
+"""
+
+import hashlib
+import json
+import threading
+import zipfile
+from array import array
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+from urllib.parse import parse_qs, urlsplit
+
+from epi_core.blobs import BlobReader
+from epi_core.container import EPIContainer
+from epi_core.step_index import StepReader
+from epi_core.summary import load_summary
+
+
+API_PREFIX = "/api"
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+# Steps one search request scans before handing back a cursor
+SEARCH_SCAN_STEPS = 200_000
+
+# Viewer assets served under /static/
+STATIC_DIR = Path(__file__).parent.parent / "epi_viewer_static"
+STATIC_ASSETS = {
+    "app.js": "text/javascript; charset=utf-8",
+    "crypto.js": "text/javascript; charset=utf-8",
+    "zip.js": "text/javascript; charset=utf-8",
+    "viewer_lite.css": "text/css; charset=utf-8",
+}
+
+
+class EvidenceArchive:
+    """
+    Read-only access to one .epi file, shared by all request threads.
+    """
+
+    def __init__(self, epi_path: Union[Path, str]):
+        """
+        Open a recording.
+
+        Args:
+            epi_path: Path to .epi file
+
+        Raises:
+            FileNotFoundError: If the file or its steps.jsonl is missing
+            ValueError: If the file is not a valid .epi archive
+        """
+        self.path = Path(epi_path)
+        self.manifest = EPIContainer.read_manifest(self.path)
+        with zipfile.ZipFile(self.path, "r") as zf:
+            self.manifest_json = zf.read("manifest.json")
+        self.steps = StepReader(self.path)
+        self.blobs = BlobReader(self.path)
+
+        stat = self.path.stat()
+        self.identity = f"{stat.st_size:x}-{stat.st_mtime_ns:x}"
+
+        self._lock = threading.Lock()
+        self._summary: Optional[Dict[str, Any]] = None
+        self._indices: Dict[Optional[str], array] = {}
+
+    def summary(self) -> Dict[str, Any]:
+        """Recording summary (computed once for archives without summary.json)."""
+        with self._lock:
+            if self._summary is None:
+                self._summary = load_summary(self.path)
+            return self._summary
+
+    def indices(self, kind: Optional[str] = None) -> array:
+        """Step indices (of one kind), in order; built from the step index once."""
+        with self._lock:
+            indices = self._indices.get(kind)
+            if indices is None:
+                indices = self._indices[kind] = array("Q", self.steps.indices(kind=kind))
+            return indices
+
+    def page(self, offset: int, limit: int, kind: Optional[str] = None) -> Dict[str, Any]:
+        """
+        One page of steps.
+
+        Args:
+            offset: Number of (matching) steps to skip
+            limit: Maximum number of steps to return
+            kind: Only steps of this kind
+
+        Returns:
+            {"total", "offset", "steps"}
+        """
+        indices = self.indices(kind)
+        return {
+            "total": len(indices),
+            "offset": offset,
+            "steps": [self.steps.get(index) for index in indices[offset:offset + limit]],
+        }
+
+    def search(self, query: str, start: int, limit: int, kind: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Steps containing query, scanning at most SEARCH_SCAN_STEPS steps.
+
+        Args:
+            query: Text to look for (see StepReader.search)
+            start: Step index to start scanning at
+            limit: Maximum number of matches to return
+            kind: Only steps of this kind
+
+        Returns:
+            {"query", "steps", "next"}
+        """
+        stop = start + SEARCH_SCAN_STEPS
+        matches = []
+        for index in self.steps.search(query, kind=kind, start=start, stop=stop):
+            matches.append(index)
+            if len(matches) == limit:
+                break
+
+        all_indices = self.indices()
+        if len(matches) == limit:
+            next_start = matches[-1] + 1
+        elif all_indices and stop <= all_indices[-1]:
+            next_start = stop
+        else:
+            next_start = None
+        return {
+            "query": query,
+            "steps": [self.steps.get(index) for index in matches],
+            "next": next_start,
+        }
+
+    def close(self) -> None:
+        """Release the archive."""
+        self.steps.close()
+        self.blobs.close()
+
+
+class _EvidenceHandler(BaseHTTPRequestHandler):
+    """Routes GET requests to the archive of the server."""
+
+    server_version = "EPI"
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:
+        if self.headers.get("Host", "").lower() not in self.server.allowed_hosts:
+            self._send_error(HTTPStatus.FORBIDDEN, "Unexpected Host header")
+            return
+
+        url = urlsplit(self.path)
+        query = {name: values[-1] for name, values in parse_qs(url.query).items()}
+        archive: EvidenceArchive = self.server.archive
+
+        try:
+            if url.path in ("/", "/index.html"):
+                html = EPIContainer.render_api_viewer(archive.manifest, API_PREFIX)
+                self._send(html.encode("utf-8"), "text/html; charset=utf-8", None)
+            elif url.path.startswith("/static/"):
+                self._send_asset(url.path[len("/static/"):])
+            elif url.path == f"{API_PREFIX}/manifest":
+                self._send(archive.manifest_json, "application/json", self._etag(url))
+            elif url.path == f"{API_PREFIX}/summary":
+                self._send_json(archive.summary(), url)
+            elif url.path == f"{API_PREFIX}/steps":
+                offset = _int_param(query, "offset", 0)
+                limit = _int_param(query, "limit", DEFAULT_PAGE_SIZE, maximum=MAX_PAGE_SIZE)
+                self._send_json(archive.page(offset, limit, query.get("kind")), url)
+            elif url.path == f"{API_PREFIX}/search":
+                text = query.get("q", "")
+                if not text:
+                    raise ValueError("Missing search text (q)")
+                start = _int_param(query, "start", 0)
+                limit = _int_param(query, "limit", DEFAULT_PAGE_SIZE, maximum=MAX_PAGE_SIZE)
+                self._send_json(archive.search(text, start, limit, query.get("kind")), url)
+            elif url.path.startswith(f"{API_PREFIX}/blobs/"):
+                digest = url.path[len(f"{API_PREFIX}/blobs/"):]
+                try:
+                    data = archive.blobs.read(digest)
+                except ValueError as e:
+                    self._send_error(HTTPStatus.INTERNAL_SERVER_ERROR, str(e))
+                    return
+                self._send(
+                    data, "application/octet-stream", f'"{digest}"',
+                    cache_control="public, max-age=31536000, immutable"
+                )
+            else:
+                self._send_error(HTTPStatus.NOT_FOUND, f"Not found: {url.path}")
+        except ValueError as e:
+            self._send_error(HTTPStatus.BAD_REQUEST, str(e))
+        except (KeyError, IndexError, FileNotFoundError) as e:
+            self._send_error(HTTPStatus.NOT_FOUND, str(e).strip("'\""))
+
+    # ==================== Responses ====================
+
+    def _etag(self, url) -> str:
+        key = f"{self.server.archive.identity}|{url.path}?{url.query}"
+        return '"' + hashlib.sha256(key.encode("utf-8")).hexdigest()[:32] + '"'
+
+    def _send_asset(self, name: str) -> None:
+        content_type = STATIC_ASSETS.get(name)
+        path = STATIC_DIR / name
+        if content_type is None or not path.is_file():
+            raise FileNotFoundError(f"No such asset: {name}")
+        stat = path.stat()
+        self._send(path.read_bytes(), content_type, f'"{stat.st_size:x}-{stat.st_mtime_ns:x}"')
+
+    def _send_json(self, value: Any, url) -> None:
+        body = json.dumps(value, default=str).encode("utf-8")
+        self._send(body, "application/json", self._etag(url))
+
+    def _send(self, body: bytes, content_type: str, etag: Optional[str],
+              cache_control: str = "no-cache") -> None:
+        if etag is not None and etag in self.headers.get("If-None-Match", ""):
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", cache_control)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", cache_control)
+        if etag is not None:
+            self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_error(self, status: HTTPStatus, message: str) -> None:
+        body = json.dumps({"error": message}).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+def _int_param(query: Dict[str, str], name: str, default: int, maximum: Optional[int] = None) -> int:
+    """Non-negative integer query parameter (capped at maximum)."""
+    value = query.get(name)
+    if value is None:
+        return default
+    try:
+        number = int(value)
+    except ValueError:
+        raise ValueError(f"Invalid {name}: {value!r}")
+    if number < 0:
+        raise ValueError(f"Invalid {name}: {value!r}")
+    return min(number, maximum) if maximum is not None else number
+
+
+class EvidenceServer(ThreadingHTTPServer):
+    """
+    Local HTTP server for one .epi file.
+
+    Example:
+        with EvidenceServer("agent.epi") as server:
+            print(server.url)
+            server.serve_forever()
+    """
+
+    daemon_threads = True
+
+    def __init__(self, epi_path: Union[Path, str], host: str = "127.0.0.1", port: int = 0,
+                 verbose: bool = False):
+        """
+        Open the archive and bind the server.
+
+        Args:
+            epi_path: Path to .epi file
+            host: Interface to listen on (default: loopback only)
+            port: Port to listen on (default: 0, any free port)
+            verbose: Log every request to stderr
+
+        Raises:
+            FileNotFoundError: If the file or its steps.jsonl is missing
+            ValueError: If the file is not a valid .epi archive
+            OSError: If the address cannot be bound
+        """
+        self.archive = EvidenceArchive(epi_path)
+        self.verbose = verbose
+        try:
+            super().__init__((host, port), _EvidenceHandler)
+        except BaseException:
+            self.archive.close()
+            raise
+
+        # DNS-rebinding guard: Host values the viewer can legitimately send
+        bound_port = self.server_address[1]
+        names = {"127.0.0.1", "localhost", f"[{host}]" if ":" in host else host.lower()}
+        self.allowed_hosts = {f"{name}:{bound_port}" for name in names}
+
+    @property
+    def url(self) -> str:
+        """Base URL of the viewer."""
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def server_close(self) -> None:
+        super().server_close()
+        self.archive.close()
@@ -0,0 +1,705 @@
+"""
+EPI Core Step Index - Random access to the steps of a .epi file.
+
+steps.jsonl used to be one plain deflated member, so reading step 90,000
+meant inflating and parsing everything before it. pack now writes it with
+write_steps_member(): still a single standard deflate member (any ZIP
+tool or zf.read() reads it as before), but deflated here rather than by
+zipfile, with a full flush at a line boundary every CHUNK_SIZE bytes, so
+inflating can start at any of those points. Next to it goes a
+fixed-width table:
+
+    index/steps.idx
+        header   "<8sHHIQQ"  magic b"EPISTIDX", version, flags
+                             (1: records sorted by step index),
+                             number of kinds, steps, chunks
+        kinds    per kind:   "<H" length + UTF-8 name (kind id = position)
+        records  "<QIIdQ"    step index, kind id, line length (bytes,
+                             without newline), timestamp (UTC epoch seconds,
+                             NaN if unknown), byte offset in steps.jsonl
+        chunks   "<QQ"       offset in steps.jsonl, offset in the
+                             compressed member data, of each restart point
+
+Records are in file order, so record i locates line i. The index is
+packed like any other file (covered by manifest.file_manifest). Steps are
+looked up by binary search over the records; for files whose step
+indices are not ascending (assembled by hand or by other tools) the
+reader sorts the records by index in memory first.
+
+StepReader reads steps through the index: get(i), range(a, b) and
+filter(kind=...) inflate only the chunks holding the lines they return.
+Recordings without an index are indexed in memory on open.
+"""
+
+import bisect
+import hashlib
+import json
+import math
+import struct
+import threading
+import zipfile
+import zlib
+from collections import OrderedDict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+from epi_core.blobs import BLOB_REF_KEY, BlobReader
+from epi_core.history import HISTORY_REF_KEY, is_history_ref
+
+
+STEP_INDEX_NAME = "index/steps.idx"
+STEPS_NAME = "steps.jsonl"
+
+# Uncompressed bytes between restart points (a step is inflated with at most this much around it)
+CHUNK_SIZE = 64 * 1024
+
+_MAGIC = b"EPISTIDX"
+_VERSION = 1
+_HEADER = struct.Struct("<8sHHIQQ")
+_KIND_LENGTH = struct.Struct("<H")
+_RECORD = struct.Struct("<QIIdQ")
+_CHUNK = struct.Struct("<QQ")
+
+# Header flags
+_SORTED = 1
+
+# ZIP local file header: fixed part, then file name and extra field
+_LOCAL_HEADER = struct.Struct("<4s5H3L2H")
+_LOCAL_SIGNATURE = b"PK\x03\x04"
+_EXTRA_FIELD = struct.Struct("<HH")
+_ZIP64_EXTRA_ID = 0x0001
+
+# Decoded llm.request histories and inflated chunks kept per reader
+_HISTORY_CACHE_SIZE = 16
+_CHUNK_CACHE_SIZE = 4
+
+
+def _epoch(timestamp: Any) -> float:
+    """Step timestamp as UTC epoch seconds (naive timestamps are UTC); NaN if unknown."""
+    if not isinstance(timestamp, str) or not timestamp:
+        return math.nan
+    try:
+        when = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
+    except ValueError:
+        return math.nan
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return when.timestamp()
+
+
+class StepIndexWriter:
+    """Builds index/steps.idx while steps.jsonl is written or scanned."""
+
+    def __init__(self):
+        self.kinds: List[str] = []
+        self._kind_ids: Dict[str, int] = {}
+        self.records: List[Tuple] = []
+        self.chunks: List[Tuple[int, int]] = []
+        self.sorted = True
+
+    def add_line(self, raw: bytes, offset: int) -> None:
+        """
+        Index one line of steps.jsonl.
+
+        Blank and malformed lines are left out (readers skip them too).
+
+        Args:
+            raw: Line as stored (a trailing newline is ignored)
+            offset: Its byte offset in steps.jsonl
+        """
+        line = raw.rstrip(b"\r\n")
+        if not line.strip():
+            return
+        try:
+            step = json.loads(line)
+        except ValueError:
+            return
+        if not isinstance(step, dict):
+            return
+
+        kind = step.get("kind")
+        kind = kind if isinstance(kind, str) else "unknown"
+        kind_id = self._kind_ids.get(kind)
+        if kind_id is None:
+            kind_id = self._kind_ids[kind] = len(self.kinds)
+            self.kinds.append(kind)
+
+        index = step.get("index")
+        index = index if isinstance(index, int) and index >= 0 else len(self.records)
+        if self.records and index < self.records[-1][0]:
+            self.sorted = False
+        self.records.append((index, kind_id, len(line), _epoch(step.get("timestamp")), offset))
+
+    def add_chunk(self, offset: int, compressed_offset: int) -> None:
+        """Record a restart point of the compressed member."""
+        self.chunks.append((offset, compressed_offset))
+
+    def to_bytes(self) -> bytes:
+        """index/steps.idx content."""
+        flags = _SORTED if self.sorted else 0
+        parts = [_HEADER.pack(_MAGIC, _VERSION, flags, len(self.kinds), len(self.records), len(self.chunks))]
+        for kind in self.kinds:
+            name = kind.encode("utf-8")
+            parts.append(_KIND_LENGTH.pack(len(name)) + name)
+        parts.extend(_RECORD.pack(*record) for record in self.records)
+        parts.extend(_CHUNK.pack(*chunk) for chunk in self.chunks)
+        return b"".join(parts)
+
+
+def _decode_index(data: bytes) -> Tuple[List[str], memoryview, int, List[Tuple[int, int]], bool]:
+    """Parse an index; returns (kinds, records buffer, number of records, chunks, sorted)."""
+    magic, version, flags, kind_count, count, chunk_count = _HEADER.unpack_from(data, 0)
+    if magic != _MAGIC or version != _VERSION:
+        raise ValueError("Not a step index (or unsupported version)")
+    pos = _HEADER.size
+    kinds = []
+    for _ in range(kind_count):
+        (length,) = _KIND_LENGTH.unpack_from(data, pos)
+        pos += _KIND_LENGTH.size
+        kinds.append(bytes(data[pos:pos + length]).decode("utf-8"))
+        pos += length
+    records = memoryview(data)[pos:pos + count * _RECORD.size]
+    pos += count * _RECORD.size
+    chunks = [_CHUNK.unpack_from(data, pos + i * _CHUNK.size) for i in range(chunk_count)]
+    if len(records) != count * _RECORD.size or pos + chunk_count * _CHUNK.size > len(data):
+        raise ValueError("Truncated step index")
+    return kinds, records, count, chunks, bool(flags & _SORTED)
+
+
+def write_steps_member(zf: zipfile.ZipFile, steps_file: Path, arc_name: str = STEPS_NAME) -> Tuple[str, bytes]:
+    """
+    Deflate steps.jsonl into an archive with restart points, hashing and indexing it.
+
+    The file is read once; every line is hashed, compressed and indexed.
+    zipfile has no way to take data that is already deflated, so the raw
+    deflate stream goes into a member opened as stored, and its ZipInfo is
+    given the real method, CRC and size afterwards (the central directory
+    is written from it). finish_steps_member() must then fix the local
+    header once the archive is closed.
+
+    Args:
+        zf: Archive open for writing (to a file)
+        steps_file: steps.jsonl to add
+        arc_name: Name inside the archive
+
+    Returns:
+        (hexadecimal SHA-256 of the file, index/steps.idx content)
+    """
+    sha256 = hashlib.sha256()
+    crc = 0
+    index = StepIndexWriter()
+    zinfo = zipfile.ZipInfo.from_file(steps_file, arc_name)
+    zinfo.compress_type = zipfile.ZIP_STORED
+    # Sizes are only known at the end: reserve ZIP64 fields when they might need them
+    force_zip64 = zinfo.file_size * 1.05 > zipfile.ZIP64_LIMIT
+
+    deflater = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -15)
+    produced = 0
+    offset = 0
+    chunk_start = 0
+    with open(steps_file, "rb") as src, zf.open(zinfo, "w", force_zip64=force_zip64) as dest:
+        index.add_chunk(0, 0)
+        for raw in src:
+            sha256.update(raw)
+            crc = zlib.crc32(raw, crc)
+            index.add_line(raw, offset)
+            offset += len(raw)
+            out = deflater.compress(raw)
+            if offset - chunk_start >= CHUNK_SIZE:
+                # Ends the deflate block on a byte boundary and drops the history
+                out += deflater.flush(zlib.Z_FULL_FLUSH)
+                chunk_start = offset
+                index.add_chunk(offset, produced + len(out))
+            dest.write(out)
+            produced += len(out)
+        dest.write(deflater.flush())
+
+    zinfo.compress_type = zipfile.ZIP_DEFLATED
+    zinfo.CRC = crc
+    zinfo.file_size = offset
+    return sha256.hexdigest(), index.to_bytes()
+
+
+def finish_steps_member(epi_path: Union[Path, str], arc_name: str = STEPS_NAME) -> None:
+    """
+    Complete a member written by write_steps_member() in a closed archive.
+
+    Copies method, CRC and uncompressed size from the central directory
+    into the member's local header (still describing the stored bytes).
+    Members that already agree are left alone.
+
+    Args:
+        epi_path: Archive written with write_steps_member()
+        arc_name: Name of the member
+    """
+    with zipfile.ZipFile(epi_path, "r") as zf:
+        info = zf.getinfo(arc_name)
+
+    with open(epi_path, "r+b") as f:
+        f.seek(info.header_offset)
+        header = list(_LOCAL_HEADER.unpack(f.read(_LOCAL_HEADER.size)))
+        signature, _, flags, method = header[:4]
+        if signature != _LOCAL_SIGNATURE:
+            raise ValueError(f"Corrupt local header for {arc_name}")
+        if method == info.compress_type:
+            return
+        if flags & 0x08:
+            raise ValueError(f"{arc_name} was written with a data descriptor; cannot complete it")
+
+        header[3] = info.compress_type
+        header[6] = info.CRC
+        if header[8] != 0xFFFFFFFF:
+            header[8] = info.file_size
+        f.seek(info.header_offset)
+        f.write(_LOCAL_HEADER.pack(*header))
+
+        if header[8] == 0xFFFFFFFF:
+            # ZIP64 extra field: uncompressed size, then compressed size
+            name_length, extra_length = header[-2:]
+            f.seek(info.header_offset + _LOCAL_HEADER.size + name_length)
+            extra = f.read(extra_length)
+            pos = 0
+            while pos + _EXTRA_FIELD.size <= len(extra):
+                field_id, size = _EXTRA_FIELD.unpack_from(extra, pos)
+                if field_id == _ZIP64_EXTRA_ID:
+                    f.seek(info.header_offset + _LOCAL_HEADER.size + name_length + pos + _EXTRA_FIELD.size)
+                    f.write(struct.pack("<Q", info.file_size))
+                    break
+                pos += _EXTRA_FIELD.size + size
+
+
+def indexed_step_count(data: bytes) -> int:
+    """
+    Number of steps an index/steps.idx covers (read from its header only).
+
+    Raises:
+        ValueError: If data is not a step index
+    """
+    try:
+        magic, version, _, _, count, _ = _HEADER.unpack_from(data, 0)
+    except struct.error:
+        raise ValueError("Truncated step index")
+    if magic != _MAGIC or version != _VERSION:
+        raise ValueError("Not a step index (or unsupported version)")
+    return count
+
+
+class StepReader:
+    """
+    Random access to a recording's steps.
+
+    Example:
+        with StepReader("agent.epi") as steps:
+            print(len(steps), steps.kinds)
+            last = steps.get(len(steps) - 1)
+            for step in steps.filter(kind="llm.error"):
+                ...
+
+    Steps are returned like epi_core.reader yields them: delta-encoded
+    llm.request histories are rebuilt (reading only the llm.request steps
+    they depend on), and blob references are resolved if asked for.
+    Safe to share between threads.
+    """
+
+    def __init__(self, source: Union[Path, str, zipfile.ZipFile], resolve_blobs: bool = False):
+        """
+        Open a recording.
+
+        Args:
+            source: .epi file, recording directory, steps.jsonl, or an open
+                    ZipFile (not closed by the reader)
+            resolve_blobs: Replace blob references with their payloads
+
+        Raises:
+            FileNotFoundError: If the recording has no steps.jsonl
+        """
+        self.resolve_blobs = resolve_blobs
+        self._lock = threading.Lock()
+        self._zip: Optional[zipfile.ZipFile] = None
+        self._owns_zip = False
+        self._file = None
+        self._base = 0
+        self._data: Optional[bytes] = None
+        self._chunk_offsets: Optional[List[int]] = None
+        self._chunk_positions: List[int] = []
+        self._chunk_ends: List[int] = []
+        self._chunks: "OrderedDict[int, bytes]" = OrderedDict()
+        self._blobs: Optional[BlobReader] = None
+        self._blob_source: Any = None
+        self._history_positions: Optional[Dict[str, int]] = None
+        # Positions in step index order, when that is not file order
+        self._order: Optional[List[int]] = None
+        self._histories: "OrderedDict[str, List[Any]]" = OrderedDict()
+
+        if isinstance(source, zipfile.ZipFile):
+            self._open_zip(source)
+        else:
+            path = Path(source)
+            if path.is_dir():
+                self._open_file(path / STEPS_NAME)
+                self._blob_source = path
+            elif zipfile.is_zipfile(path):
+                self._owns_zip = True
+                self._open_zip(zipfile.ZipFile(path, "r"))
+            else:
+                self._open_file(path)
+                self._blob_source = path.parent
+
+    # ==================== Opening ====================
+
+    def _open_zip(self, zf: zipfile.ZipFile) -> None:
+        self._zip = zf
+        self._blob_source = zf
+        try:
+            info = zf.getinfo(STEPS_NAME)
+        except KeyError:
+            raise FileNotFoundError(f"No {STEPS_NAME} in archive")
+
+        try:
+            self.kinds, self._records, self._count, chunks, is_sorted = _decode_index(zf.read(STEP_INDEX_NAME))
+        except (KeyError, ValueError, struct.error):
+            # Older archive: inflate steps.jsonl once and index it in memory
+            self._data = zf.read(STEPS_NAME)
+            self._index_in_memory(self._data.splitlines(keepends=True))
+            return
+        self._sort_records(is_sorted)
+
+        seekable = zf.filename and (info.compress_type == zipfile.ZIP_STORED or chunks)
+        if not seekable:
+            self._data = zf.read(STEPS_NAME)
+            return
+
+        # Lines are read straight from the archive file
+        self._file = open(zf.filename, "rb")
+        self._file.seek(info.header_offset)
+        header = _LOCAL_HEADER.unpack(self._file.read(_LOCAL_HEADER.size))
+        self._base = info.header_offset + _LOCAL_HEADER.size + header[-2] + header[-1]
+        if info.compress_type != zipfile.ZIP_STORED:
+            self._chunk_offsets = [chunk[0] for chunk in chunks]
+            self._chunk_positions = [chunk[1] for chunk in chunks] + [info.compress_size]
+            self._chunk_ends = self._chunk_offsets[1:] + [info.file_size]
+
+    def _open_file(self, steps_file: Path) -> None:
+        if not steps_file.is_file():
+            raise FileNotFoundError(f"Steps file not found: {steps_file}")
+        self._file = open(steps_file, "rb")
+        self._index_in_memory(self._file)
+
+    def _index_in_memory(self, lines: Iterable[bytes]) -> None:
+        index = StepIndexWriter()
+        offset = 0
+        for raw in lines:
+            index.add_line(raw, offset)
+            offset += len(raw)
+        self.kinds, self._records, self._count, _, is_sorted = _decode_index(index.to_bytes())
+        self._sort_records(is_sorted)
+
+    def _sort_records(self, is_sorted: bool) -> None:
+        """Order positions by step index (first in file wins) unless records already are."""
+        if is_sorted:
+            return
+        indices = [record[0] for record in _RECORD.iter_unpack(self._records)]
+        if all(a <= b for a, b in zip(indices, indices[1:])):
+            return  # Index written without the flag
+        self._order = sorted(range(self._count), key=indices.__getitem__)
+
+    # ==================== Index ====================
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _record(self, position: int) -> Tuple[int, int, int, float, int]:
+        return _RECORD.unpack_from(self._records, position * _RECORD.size)
+
+    def _at(self, rank: int) -> int:
+        """Position in the file of the rank-th step in index order."""
+        return rank if self._order is None else self._order[rank]
+
+    def _lower_bound(self, index: int) -> int:
+        """First rank whose step index is >= index."""
+        if 0 <= index < self._count and self._record(self._at(index))[0] == index:
+            return index
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._record(self._at(mid))[0] < index:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _position(self, index: int) -> Optional[int]:
+        """Position in the file of the step with this index."""
+        rank = self._lower_bound(index)
+        if rank < self._count:
+            position = self._at(rank)
+            if self._record(position)[0] == index:
+                return position
+        return None
+
+    def kind_of(self, index: int) -> Optional[str]:
+        """Kind of a step, from the index alone (None if there is no such step)."""
+        position = self._position(index)
+        return None if position is None else self.kinds[self._record(position)[1]]
+
+    # ==================== Reading ====================
+
+    def _read_line(self, position: int) -> bytes:
+        _, _, length, _, offset = self._record(position)
+        if self._data is not None:
+            return self._data[offset:offset + length]
+        if self._chunk_offsets is not None:
+            chunk = bisect.bisect_right(self._chunk_offsets, offset) - 1
+            start = offset - self._chunk_offsets[chunk]
+            return self._inflate_chunk(chunk)[start:start + length]
+        with self._lock:
+            self._file.seek(self._base + offset)
+            return self._file.read(length)
+
+    def _inflate_chunk(self, chunk: int) -> bytes:
+        """Uncompressed bytes of one restart chunk (a few are cached)."""
+        with self._lock:
+            data = self._chunks.get(chunk)
+            if data is not None:
+                self._chunks.move_to_end(chunk)
+                return data
+
+            self._file.seek(self._base + self._chunk_positions[chunk])
+            compressed = self._file.read(self._chunk_positions[chunk + 1] - self._chunk_positions[chunk])
+            size = self._chunk_ends[chunk] - self._chunk_offsets[chunk]
+            data = zlib.decompressobj(-15).decompress(compressed, size)
+
+            self._chunks[chunk] = data
+            if len(self._chunks) > _CHUNK_CACHE_SIZE:
+                self._chunks.popitem(last=False)
+            return data
+
+    def _load(self, position: int) -> Dict[str, Any]:
+        line = self._read_line(position)
+        step = json.loads(line)
+        if HISTORY_REF_KEY.encode() in line:
+            self._decode_history(step)
+        if self.resolve_blobs and BLOB_REF_KEY.encode() in line:
+            with self._lock:
+                if self._blobs is None:
+                    self._blobs = BlobReader(self._blob_source)
+            step = self._blobs.resolve(step)
+        return step
+
+    def get(self, index: int) -> Dict[str, Any]:
+        """
+        Read one step.
+
+        Args:
+            index: Step index
+
+        Returns:
+            Step dict
+
+        Raises:
+            IndexError: If there is no step with this index
+        """
+        position = self._position(index)
+        if position is None:
+            raise IndexError(f"No step with index {index}")
+        return self._load(position)
+
+    def range(self, start: int, stop: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Read the steps with start <= index < stop, in order.
+
+        Args:
+            start: First step index
+            stop: Index after the last step (default: to the end)
+        """
+        rank = self._lower_bound(start)
+        while rank < self._count:
+            position = self._at(rank)
+            if stop is not None and self._record(position)[0] >= stop:
+                break
+            yield self._load(position)
+            rank += 1
+
+    def filter(
+        self,
+        kind: Union[str, Iterable[str], None] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Read the steps matching the index, in order. Only matching lines are read.
+
+        Args:
+            kind: Step kind, or several kinds
+            since: Only steps at or after this time (naive = UTC)
+            until: Only steps before this time (naive = UTC)
+        """
+        for position in self._matching(kind, since, until):
+            yield self._load(position)
+
+    def indices(
+        self,
+        kind: Union[str, Iterable[str], None] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None
+    ) -> Iterator[int]:
+        """
+        Indices of the steps filter() would read, from the index alone.
+
+        Args:
+            kind: Step kind, or several kinds
+            since: Only steps at or after this time (naive = UTC)
+            until: Only steps before this time (naive = UTC)
+        """
+        for position in self._matching(kind, since, until):
+            yield self._record(position)[0]
+
+    def search(
+        self,
+        text: str,
+        kind: Union[str, Iterable[str], None] = None,
+        start: int = 0,
+        stop: Optional[int] = None
+    ) -> Iterator[int]:
+        """
+        Indices of the steps whose stored line contains text (ASCII case-insensitive).
+
+        Only raw lines are scanned, nothing is parsed: a delta-encoded
+        history matches at the request that added a message, and blob
+        payloads are not searched.
+
+        Args:
+            text: Text to look for
+            kind: Only steps of this kind (or kinds)
+            start: First step index to scan
+            stop: Index after the last step to scan (default: to the end)
+        """
+        needles = {text.encode("utf-8").lower(), json.dumps(text)[1:-1].encode("utf-8").lower()}
+        wanted = self._kind_ids(kind)
+        rank = self._lower_bound(start)
+        while rank < self._count:
+            position = self._at(rank)
+            index, kind_id, _, _, _ = self._record(position)
+            if stop is not None and index >= stop:
+                break
+            if wanted is None or kind_id in wanted:
+                line = self._read_line(position).lower()
+                if any(needle in line for needle in needles):
+                    yield index
+            rank += 1
+
+    def _kind_ids(self, kind: Union[str, Iterable[str], None]) -> Optional[Set[int]]:
+        if kind is None:
+            return None
+        names = {kind} if isinstance(kind, str) else set(kind)
+        return {i for i, name in enumerate(self.kinds) if name in names}
+
+    def _matching(
+        self,
+        kind: Union[str, Iterable[str], None],
+        since: Optional[datetime],
+        until: Optional[datetime]
+    ) -> Iterator[int]:
+        """Positions of the steps matching kind and time window."""
+        wanted = self._kind_ids(kind)
+        low = self._bound(since, -math.inf)
+        high = self._bound(until, math.inf)
+
+        for rank in range(self._count):
+            position = self._at(rank)
+            _, kind_id, _, epoch, _ = self._record(position)
+            if wanted is not None and kind_id not in wanted:
+                continue
+            if (since is not None or until is not None) and not (low <= epoch < high):
+                continue
+            yield position
+
+    @staticmethod
+    def _bound(when: Optional[datetime], default: float) -> float:
+        if when is None:
+            return default
+        if when.tzinfo is None:
+            when = when.replace(tzinfo=timezone.utc)
+        return when.timestamp()
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return self.range(0)
+
+    # ==================== Histories ====================
+
+    def _decode_history(self, step: Dict[str, Any]) -> None:
+        """Rebuild a delta-encoded message list by following its bases."""
+        content = step.get("content")
+        if not isinstance(content, dict) or not is_history_ref(content.get("messages")):
+            return
+
+        # Walk back to a cached history or the start of the conversation
+        chain = []
+        ref = content["messages"][HISTORY_REF_KEY]
+        messages = None
+        while True:
+            chain.append(ref)
+            base = ref.get("base")
+            if base is None:
+                messages = []
+                break
+            with self._lock:
+                cached = self._histories.get(base)
+            if cached is not None:
+                messages = list(cached)
+                break
+            position = self._find_history(base)
+            if position is None:
+                return  # Base not in this recording: leave encoded
+            base_step = json.loads(self._read_line(position))
+            base_messages = base_step.get("content", {}).get("messages")
+            if not is_history_ref(base_messages):
+                return
+            ref = base_messages[HISTORY_REF_KEY]
+
+        for ref in reversed(chain):
+            messages = messages + list(ref.get("append") or [])
+            if ref.get("hash"):
+                with self._lock:
+                    self._histories[ref["hash"]] = messages
+                    self._histories.move_to_end(ref["hash"])
+                    while len(self._histories) > _HISTORY_CACHE_SIZE:
+                        self._histories.popitem(last=False)
+        content["messages"] = list(messages)
+
+    def _find_history(self, digest: str) -> Optional[int]:
+        """Position of the llm.request whose history hash is digest."""
+        if self._history_positions is None:
+            positions = {}
+            kind_id = self.kinds.index("llm.request") if "llm.request" in self.kinds else -1
+            for position in range(self._count):
+                if self._record(position)[1] != kind_id:
+                    continue
+                line = self._read_line(position)
+                if HISTORY_REF_KEY.encode() not in line:
+                    continue
+                messages = json.loads(line).get("content", {}).get("messages")
+                if is_history_ref(messages) and messages[HISTORY_REF_KEY].get("hash"):
+                    positions.setdefault(messages[HISTORY_REF_KEY]["hash"], position)
+            self._history_positions = positions
+        return self._history_positions.get(digest)
+
+    # ==================== Lifecycle ====================
+
+    def close(self) -> None:
+        """Release the files the reader opened."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if self._blobs is not None:
+            self._blobs.close()
+        if self._owns_zip and self._zip is not None:
+            self._zip.close()
+            self._zip = None
+
+    def __enter__(self) -> "StepReader":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
@@ -3,11 +3,19 @@ SQLite-based storage for EPI recordings.
 
 Provides atomic, crash-safe storage replacing JSONL files.
 SQLite transactions ensure no data corruption on crashes.
+
+The database runs in WAL mode with a single dedicated writer: steps are
+queued in a bounded in-memory ring and committed in batches (one explicit
+transaction + executemany per batch) by a background thread, instead of
+one commit per step.
 """
 
+import atexit
 import sqlite3
 import json
+import threading
 import time
+from collections import deque
 from pathlib import Path
 from typing import List, Dict, Any, Optional
 from datetime import datetime
@@ -15,28 +23,113 @@ from datetime import datetime
 from .schemas import StepModel
 
 
+# Durability levels (mapped to SQLite's PRAGMA synchronous in WAL mode)
+DURABILITY_LEVELS = {
+    "off": "OFF",        # No fsync at all - fastest, OS crash may lose recent batches
+    "normal": "NORMAL",  # WAL default - survives process crashes
+    "full": "FULL",      # fsync every committed batch - survives power loss
+}
+
+_INSERT_STEP_SQL = '''INSERT INTO steps
+   (step_index, timestamp, kind, content, created_at)
+   VALUES (?, ?, ?, ?, ?)'''
+
+_UPSERT_METADATA_SQL = 'INSERT OR REPLACE INTO metadata (key, value) VALUES (?, ?)'
+
+
 class EpiStorage:
     """
     SQLite-based atomic storage for agent execution.
     Replaces JSONL (which corrupts on crashes).
+
+    Writes are batched: add_step() only enqueues the row, and a writer
+    thread commits queued rows every flush_interval seconds or as soon as
+    batch_size rows are pending. flush() forces a commit; reads always see
+    every step added before them.
     """
-    
-    def __init__(self, session_id: str, output_dir: Path):
+
+    def __init__(
+        self,
+        session_id: str,
+        output_dir: Path,
+        durability: str = "normal",
+        batch_size: int = 256,
+        flush_interval: float = 0.2,
+        max_pending: int = 10000
+    ):
         """
         Initialize SQLite storage.
-        
+
         Args:
             session_id: Unique session identifier
             output_dir: Directory for database file
+            durability: "off", "normal" or "full" (default: "normal")
+            batch_size: Commit as soon as this many steps are pending (default: 256)
+            flush_interval: Max seconds a step waits before being committed (default: 0.2)
+            max_pending: Capacity of the in-memory ring; when full, add_step()
+                         commits synchronously instead of growing (default: 10000)
+
+        Raises:
+            ValueError: If durability level is unknown
         """
+        if durability not in DURABILITY_LEVELS:
+            raise ValueError(
+                f"Unknown durability level: {durability!r} "
+                f"(expected one of {', '.join(DURABILITY_LEVELS)})"
+            )
+
         self.session_id = session_id
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
-        
+
+        self.durability = durability
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.max_pending = max(self.batch_size, max_pending)
+
         self.db_path = self.output_dir / f"{session_id}_temp.db"
-        self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
-        self._init_tables()
-    
+
+        # Connection is opened lazily by the first write or read, so a storage
+        # that never records anything leaves no database file behind.
+        self.conn: Optional[sqlite3.Connection] = None
+
+        # Pending rows (ring) and metadata, committed by the writer
+        self._pending: deque = deque()
+        self._pending_metadata: Dict[str, str] = {}
+        self._metadata_lock = threading.Lock()
+
+        # Single-writer discipline: every use of the connection holds this lock
+        self._db_lock = threading.RLock()
+        self._wakeup = threading.Event()
+        self._closed = False
+        self._writer: Optional[threading.Thread] = None
+        self._error: Optional[BaseException] = None
+
+    # ==================== Connection & writer thread ====================
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the connection and start the writer thread (caller holds _db_lock)."""
+        if self.conn is None:
+            self.conn = sqlite3.connect(
+                str(self.db_path),
+                check_same_thread=False,
+                isolation_level=None  # We manage transactions explicitly
+            )
+            self.conn.execute('PRAGMA journal_mode=WAL')
+            self.conn.execute(f'PRAGMA synchronous={DURABILITY_LEVELS[self.durability]}')
+            self._init_tables()
+
+            if self._writer is None and not self._closed:
+                self._writer = threading.Thread(
+                    target=self._writer_loop,
+                    name=f"epi-storage-{self.session_id}",
+                    daemon=True
+                )
+                self._writer.start()
+                atexit.register(self.close)
+
+        return self.conn
+
     def _init_tables(self):
         """Initialize database schema"""
         self.conn.execute('''
@@ -49,138 +142,234 @@ class EpiStorage:
                 created_at REAL NOT NULL
             )
         ''')
-        
+
         self.conn.execute('''
             CREATE TABLE IF NOT EXISTS metadata (
                 key TEXT PRIMARY KEY,
                 value TEXT NOT NULL
             )
         ''')
-        
+
         self.conn.execute('''
-            CREATE INDEX IF NOT EXISTS idx_steps_index 
+            CREATE INDEX IF NOT EXISTS idx_steps_index
             ON steps(step_index)
         ''')
-        
-        self.conn.commit()
-    
+
+    def _writer_loop(self) -> None:
+        """Background thread: drain the ring on a timer or when a batch is full."""
+        while not self._closed:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+
+            try:
+                self.flush()
+            except BaseException as e:
+                # Surfaced to the next add_step() call
+                self._error = e
+                return
+
+    def _commit_pending(self) -> None:
+        """Commit every pending row in one transaction (caller holds _db_lock)."""
+        if not self._pending and not self._pending_metadata:
+            return
+
+        conn = self._connect()
+
+        rows = []
+        popleft = self._pending.popleft
+        try:
+            while True:
+                rows.append(popleft())
+        except IndexError:
+            pass
+
+        # Swapped under the lock: keys set by callers meanwhile go to the next batch
+        with self._metadata_lock:
+            pending_metadata, self._pending_metadata = self._pending_metadata, {}
+        metadata = list(pending_metadata.items())
+
+        conn.execute('BEGIN')
+        try:
+            if rows:
+                conn.executemany(_INSERT_STEP_SQL, rows)
+            if metadata:
+                conn.executemany(_UPSERT_METADATA_SQL, metadata)
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            # Put the batch back so nothing is silently lost
+            self._pending.extendleft(reversed(rows))
+            with self._metadata_lock:
+                for key, value in metadata:
+                    self._pending_metadata.setdefault(key, value)
+            raise
+
+    # ==================== Public API ====================
+
     def add_step(self, step: StepModel) -> None:
         """
-        Atomic insert of execution step.
-        Survives process crashes.
-        
+        Queue an execution step for the next batch commit.
+
         Args:
             step: StepModel to persist
+
+        Raises:
+            RuntimeError: If storage is closed
+            sqlite3.Error: If a previous background commit failed
         """
-        self.conn.execute(
-            '''INSERT INTO steps 
-               (step_index, timestamp, kind, content, created_at) 
-               VALUES (?, ?, ?, ?, ?)''',
-            (
-                step.index,
-                step.timestamp.isoformat(),
-                step.kind,
-                step.model_dump_json(),
-                time.time()
-            )
-        )
-        self.conn.commit()
-    
+        if self._closed:
+            raise RuntimeError("Cannot add step to closed storage")
+        if self._error is not None:
+            raise self._error
+
+        self._pending.append((
+            step.index,
+            step.timestamp.isoformat(),
+            step.kind,
+            step.model_dump_json(),
+            time.time()
+        ))
+
+        pending = len(self._pending)
+        if pending >= self.max_pending:
+            # Ring is full: apply backpressure by committing on the caller
+            self.flush()
+        elif pending >= self.batch_size or self._writer is None:
+            # First write starts the writer; full batches are committed right away
+            self._wakeup.set()
+            if self._writer is None:
+                with self._db_lock:
+                    self._connect()
+
+    def flush(self) -> None:
+        """Commit all pending steps and metadata now (blocking)."""
+        with self._db_lock:
+            if self.conn is None and not self._pending and not self._pending_metadata:
+                return
+            self._commit_pending()
+
     def get_steps(self) -> List[StepModel]:
         """
         Retrieve all steps in order.
-        
+
         Returns:
             List of StepModel instances
         """
-        cursor = self.conn.execute(
-            'SELECT content FROM steps ORDER BY step_index'
-        )
-        rows = cursor.fetchall()
-        
+        with self._db_lock:
+            self._commit_pending()
+            if self.conn is None:
+                return []
+            rows = self.conn.execute(
+                'SELECT content FROM steps ORDER BY step_index'
+            ).fetchall()
+
         steps = []
         for row in rows:
             step_data = json.loads(row[0])
             steps.append(StepModel(**step_data))
-        
+
         return steps
-    
+
     def set_metadata(self, key: str, value: str) -> None:
         """
-        Set metadata key-value pair.
-        
+        Set metadata key-value pair (committed with the next batch).
+
         Args:
             key: Metadata key
             value: Metadata value
         """
-        self.conn.execute(
-            'INSERT OR REPLACE INTO metadata (key, value) VALUES (?, ?)',
-            (key, value)
-        )
-        self.conn.commit()
-    
+        with self._metadata_lock:
+            self._pending_metadata[key] = value
+
     def get_metadata(self, key: str) -> Optional[str]:
         """
         Get metadata value.
-        
+
         Args:
             key: Metadata key
-            
+
         Returns:
             Metadata value or None
         """
-        cursor = self.conn.execute(
-            'SELECT value FROM metadata WHERE key = ?',
-            (key,)
-        )
-        row = cursor.fetchone()
+        with self._db_lock:
+            self._commit_pending()
+            if self.conn is None:
+                return None
+            row = self.conn.execute(
+                'SELECT value FROM metadata WHERE key = ?',
+                (key,)
+            ).fetchone()
         return row[0] if row else None
-    
+
     def close(self) -> None:
-        """Close database connection."""
-        if self.conn:
-            self.conn.close()
-    
-    def export_to_jsonl(self, output_path: Path) -> None:
+        """Commit pending writes, stop the writer thread and close the connection."""
+        if self._closed:
+            return
+        self._closed = True
+        atexit.unregister(self.close)
+
+        self._wakeup.set()
+        if self._writer is not None and threading.current_thread() is not self._writer:
+            self._writer.join()
+
+        with self._db_lock:
+            self._commit_pending()
+            if self.conn:
+                self.conn.close()
+                self.conn = None
+
+    def export_to_jsonl(self, output_path: Path) -> int:
         """
         Export steps to JSONL file for backwards compatibility.
-        
+
+        Rows are streamed from the cursor and their stored JSON is copied
+        verbatim, so no StepModel is rebuilt and no step list is held in memory.
+
         Args:
             output_path: Path to JSONL file
+
+        Returns:
+            Number of steps written
         """
-        steps = self.get_steps()
-        with open(output_path, 'w', encoding='utf-8') as f:
-            for step in steps:
-                f.write(step.model_dump_json() + '\n')
-    
+        count = 0
+        with self._db_lock:
+            self._commit_pending()
+            with open(output_path, 'w', encoding='utf-8') as f:
+                if self.conn is None:
+                    return 0
+                cursor = self.conn.execute(
+                    'SELECT content FROM steps ORDER BY step_index'
+                )
+                while True:
+                    rows = cursor.fetchmany(1000)
+                    if not rows:
+                        break
+                    f.write(''.join(row[0] + '\n' for row in rows))
+                    count += len(rows)
+
+        return count
+
     def finalize(self) -> Path:
         """
         Finalize recording and rename to final path.
         This ensures we never have half-written files.
-        
+
         Returns:
             Path to finalized database file
         """
         # Add finalization metadata
         self.set_metadata('finalized_at', datetime.utcnow().isoformat())
         self.set_metadata('session_id', self.session_id)
-        
-        # Close connection
-        self.close()
-        
+
         # Atomic rename (SQLite transaction guarantees consistency)
         final_path = self.output_dir / "steps.jsonl"
-        
+
         # Export to JSONL for backwards compatibility
-        self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
         self.export_to_jsonl(final_path)
         self.close()
-        
-        # Clean up temp DB
-        self.db_path.unlink(missing_ok=True)
-        
-        return final_path
 
+        # Clean up temp DB (and its WAL side files)
+        for suffix in ("", "-wal", "-shm"):
+            Path(f"{self.db_path}{suffix}").unlink(missing_ok=True)
 
-
- 
\ No newline at end of file
+        return final_path
@@ -0,0 +1,212 @@
+"""
+EPI Core Summary - Precomputed step aggregates (summary.json).
+
+Listing and analytics code wants counts by kind, errors, token totals and
+the time span of a recording, and used to parse all of steps.jsonl to
+get them. The recorder now keeps these aggregates up to date as steps are
+written (StepSummary) and stores them as summary.json, which is packed
+like any other file, so manifest.file_manifest (and the signature)
+cover it:
+
+    {
+      "version": 1,
+      "steps": 42,
+      "kinds": {"llm.request": 10, "llm.response": 10, ...},
+      "errors": 1,
+      "error_details": [{"index": 17, "kind": "llm.error", "message": "..."}],
+      "llm_calls": 10,
+      "tools": {"search": 3},
+      "tokens": {"prompt": 1200, "completion": 300, "total": 1500},
+      "first_timestamp": "...", "last_timestamp": "...",
+      "duration_seconds": 12.5
+    }
+
+Readers use load_summary(), which reads summary.json and only falls back
+to scanning steps.jsonl for recordings made before it existed.
+"""
+
+import json
+import threading
+import zipfile
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Union
+
+
+SUMMARY_FILENAME = "summary.json"
+SUMMARY_VERSION = 1
+
+# Error steps listed individually in error_details (all are counted)
+MAX_ERROR_DETAILS = 20
+
+
+def _as_datetime(value: Any) -> Optional[datetime]:
+    """Step timestamp (datetime or ISO string) as a naive-or-aware datetime."""
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, str) and value:
+        try:
+            return datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    return None
+
+
+def _token_count(usage: Dict[str, Any], *keys: str) -> int:
+    """First integer among usage[key] for the given keys (0 if none)."""
+    for key in keys:
+        value = usage.get(key)
+        if isinstance(value, int) and not isinstance(value, bool):
+            return value
+    return 0
+
+
+class StepSummary:
+    """
+    Running aggregates over a recording's steps.
+
+    add() is cheap (a few dict updates under a lock) and safe to call from
+    every thread that writes steps.
+    """
+
+    def __init__(self):
+        self.steps = 0
+        self.kinds: Dict[str, int] = {}
+        self.errors = 0
+        self.error_details = []
+        self.tools: Dict[str, int] = {}
+        self.tokens = {"prompt": 0, "completion": 0, "total": 0}
+        self.first_timestamp: Optional[datetime] = None
+        self.last_timestamp: Optional[datetime] = None
+        self._lock = threading.Lock()
+
+    def add(self, index: int, kind: str, content: Any, timestamp: Any) -> None:
+        """
+        Account for one step.
+
+        Args:
+            index: Step index
+            kind: Step kind
+            content: Step content (as written)
+            timestamp: Step timestamp (datetime or ISO string)
+        """
+        content = content if isinstance(content, dict) else {}
+        when = _as_datetime(timestamp)
+
+        with self._lock:
+            self.steps += 1
+            self.kinds[kind] = self.kinds.get(kind, 0) + 1
+
+            if "error" in kind.lower():
+                self.errors += 1
+                if len(self.error_details) < MAX_ERROR_DETAILS:
+                    message = content.get("error") or content.get("error_message") or ""
+                    self.error_details.append({"index": index, "kind": kind, "message": str(message)[:500]})
+
+            if kind.startswith("tool."):
+                name = content.get("name")
+                name = name if isinstance(name, str) else "unknown"
+                self.tools[name] = self.tools.get(name, 0) + 1
+
+            if kind == "llm.response" and isinstance(content.get("usage"), dict):
+                usage = content["usage"]
+                prompt = _token_count(usage, "prompt_tokens", "input_tokens")
+                completion = _token_count(usage, "completion_tokens", "output_tokens")
+                self.tokens["prompt"] += prompt
+                self.tokens["completion"] += completion
+                self.tokens["total"] += _token_count(usage, "total_tokens") or prompt + completion
+
+            if when is not None:
+                try:
+                    if self.first_timestamp is None or when < self.first_timestamp:
+                        self.first_timestamp = when
+                    if self.last_timestamp is None or when > self.last_timestamp:
+                        self.last_timestamp = when
+                except TypeError:
+                    pass  # Mixed naive/aware timestamps: keep what we have
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Summary as written to summary.json."""
+        with self._lock:
+            duration = None
+            if self.first_timestamp is not None and self.last_timestamp is not None:
+                duration = (self.last_timestamp - self.first_timestamp).total_seconds()
+            return {
+                "version": SUMMARY_VERSION,
+                "steps": self.steps,
+                "kinds": dict(self.kinds),
+                "errors": self.errors,
+                "error_details": list(self.error_details),
+                "llm_calls": self.kinds.get("llm.request", 0),
+                "tools": dict(self.tools),
+                "tokens": dict(self.tokens),
+                "first_timestamp": self.first_timestamp.isoformat() if self.first_timestamp else None,
+                "last_timestamp": self.last_timestamp.isoformat() if self.last_timestamp else None,
+                "duration_seconds": duration,
+            }
+
+    def to_json(self) -> str:
+        """summary.json content."""
+        return json.dumps(self.to_dict(), indent=2)
+
+
+def summarize_steps(steps: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Summarize parsed steps (for recordings without summary.json).
+
+    Args:
+        steps: Step dicts with index, kind, content and timestamp
+
+    Returns:
+        Summary dict (see module docstring)
+    """
+    summary = StepSummary()
+    for position, step in enumerate(steps):
+        summary.add(step.get("index", position), step.get("kind", "unknown"),
+                    step.get("content"), step.get("timestamp"))
+    return summary.to_dict()
+
+
+def read_summary(source: Union[Path, str, zipfile.ZipFile]) -> Optional[Dict[str, Any]]:
+    """
+    Read summary.json without touching steps.jsonl.
+
+    Args:
+        source: .epi file, recording directory, or an open ZipFile
+
+    Returns:
+        Summary dict, or None if the recording has no (readable) summary
+    """
+    try:
+        if isinstance(source, zipfile.ZipFile):
+            data = source.read(SUMMARY_FILENAME)
+        elif Path(source).is_dir():
+            data = (Path(source) / SUMMARY_FILENAME).read_bytes()
+        else:
+            with zipfile.ZipFile(source, "r") as zf:
+                data = zf.read(SUMMARY_FILENAME)
+        summary = json.loads(data)
+    except (KeyError, OSError, ValueError, zipfile.BadZipFile):
+        return None
+
+    if not isinstance(summary, dict) or summary.get("version") != SUMMARY_VERSION:
+        return None
+    return summary
+
+
+def load_summary(source: Union[Path, str, zipfile.ZipFile]) -> Dict[str, Any]:
+    """
+    Summary of a recording: summary.json, or a scan of its steps if absent.
+
+    Args:
+        source: .epi file, recording directory, or an open ZipFile
+
+    Returns:
+        Summary dict (see module docstring)
+    """
+    summary = read_summary(source)
+    if summary is not None:
+        return summary
+
+    from epi_core.reader import iter_steps
+    return summarize_steps(iter_steps(source))
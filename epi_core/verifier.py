@@ -0,0 +1,403 @@
+"""
+EPI Core Verifier - Library API for verifying one or many .epi files.
+
+Combines the integrity (file hashes) and authenticity (Ed25519 signature)
+checks used by `epi verify` into reusable functions:
+- verify_file: verify a single .epi file and return a report dict
+- verify_files: verify many files on a process pool, yielding reports
+  as they complete
+- VerificationSummary: aggregate counters over a stream of reports
+- VerificationCache: persistent (SQLite) cache of per-file results, so
+  listing a directory only needs a stat() and a manifest.json read per
+  unchanged file
+
+Public keys are loaded once per signer name and cached (per process).
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+import zipfile
+import zlib
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from epi_core.container import EPIContainer
+from epi_core.trust import create_verification_report, get_signer_name, verify_signature
+
+
+class PublicKeyCache:
+    """
+    Cache of raw Ed25519 public keys by signer name.
+
+    Missing keys are cached too, so a batch signed by an unknown key only
+    touches the key directory once.
+    """
+
+    def __init__(self, keys_dir: Optional[Path] = None):
+        """
+        Initialize key cache.
+
+        Args:
+            keys_dir: Key directory (default: KeyManager default, ~/.epi/keys/)
+        """
+        self.keys_dir = keys_dir
+        self._keys: Dict[str, Optional[bytes]] = {}
+        self._key_manager = None
+
+    def get(self, name: str) -> Optional[bytes]:
+        """
+        Get a public key.
+
+        Args:
+            name: Signer / key pair name
+
+        Returns:
+            Raw 32-byte public key, or None if it is not available
+        """
+        if name not in self._keys:
+            if self._key_manager is None:
+                from epi_cli.keys import KeyManager
+                self._key_manager = KeyManager(self.keys_dir)
+
+            try:
+                self._keys[name] = self._key_manager.load_public_key(name)
+            except FileNotFoundError:
+                self._keys[name] = None
+
+        return self._keys[name]
+
+
+def verify_file(
+    epi_path: Path,
+    key_cache: Optional[PublicKeyCache] = None,
+    max_workers: Optional[int] = None
+) -> dict:
+    """
+    Verify integrity and signature of one .epi file.
+
+    Never raises for a bad file: structural problems are reported in the
+    result under "error".
+
+    Args:
+        epi_path: Path to .epi file
+        key_cache: Public key cache (default: a fresh PublicKeyCache)
+        max_workers: Threads used to hash archive members (default: sequential)
+
+    Returns:
+        dict: create_verification_report() fields plus "file" and "ok"
+              (or "file", "ok" and "error" if the file cannot be read)
+    """
+    epi_path = Path(epi_path)
+    key_cache = key_cache or PublicKeyCache()
+
+    try:
+        manifest = EPIContainer.read_manifest(epi_path)
+        integrity_ok, mismatches = EPIContainer.verify_integrity(epi_path, max_workers=max_workers)
+    except Exception as e:
+        return {"file": str(epi_path), "ok": False, "error": str(e)}
+
+    signature_valid = None
+    signer_name = None
+    if manifest.signature:
+        signer_name = get_signer_name(manifest.signature)
+        public_key = key_cache.get(signer_name or "default")
+        if public_key is None:
+            # Cannot verify signature without public key
+            signature_valid = False
+        else:
+            signature_valid, _ = verify_signature(manifest, public_key)
+
+    report = create_verification_report(
+        integrity_ok=integrity_ok,
+        signature_valid=signature_valid,
+        signer_name=signer_name,
+        mismatches=mismatches,
+        manifest=manifest
+    )
+    report["file"] = str(epi_path)
+    report["ok"] = integrity_ok and signature_valid is not False
+    return report
+
+
+def find_epi_files(directory: Path) -> List[Path]:
+    """
+    Find all .epi files below a directory.
+
+    Args:
+        directory: Directory to search (recursively)
+
+    Returns:
+        Sorted list of .epi paths
+    """
+    return sorted(p for p in Path(directory).rglob("*.epi") if p.is_file())
+
+
+# Per-process key cache for pool workers (set by _init_worker)
+_worker_key_cache: Optional[PublicKeyCache] = None
+
+
+def _init_worker(keys_dir: Optional[Path]) -> None:
+    """Process pool initializer: one key cache per worker process."""
+    global _worker_key_cache
+    _worker_key_cache = PublicKeyCache(keys_dir)
+
+
+def _verify_in_worker(epi_path: str) -> dict:
+    """Process pool task."""
+    return verify_file(Path(epi_path), _worker_key_cache)
+
+
+def verify_files(
+    paths: Iterable[Path],
+    jobs: Optional[int] = None,
+    keys_dir: Optional[Path] = None
+) -> Iterator[dict]:
+    """
+    Verify many .epi files, yielding each report as soon as it is ready.
+
+    With more than one job, files are verified on a process pool; results
+    then arrive in completion order, not input order. The number of files
+    in flight is bounded, so arbitrarily long inputs use constant memory.
+
+    Args:
+        paths: .epi files to verify
+        jobs: Worker processes (default: os.cpu_count(); 1 = in-process)
+        keys_dir: Key directory for public keys (default: ~/.epi/keys/)
+
+    Yields:
+        dict: verify_file() report per file
+    """
+    jobs = jobs or os.cpu_count() or 1
+
+    if jobs == 1:
+        key_cache = PublicKeyCache(keys_dir)
+        for path in paths:
+            yield verify_file(path, key_cache)
+        return
+
+    max_in_flight = jobs * 4
+    path_iter = iter(paths)
+
+    with ProcessPoolExecutor(
+        max_workers=jobs,
+        initializer=_init_worker,
+        initargs=(keys_dir,)
+    ) as pool:
+        pending = set()
+
+        def submit_next() -> bool:
+            for path in path_iter:
+                pending.add(pool.submit(_verify_in_worker, str(path)))
+                return True
+            return False
+
+        while len(pending) < max_in_flight and submit_next():
+            pass
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                pending.discard(future)
+                submit_next()
+                yield future.result()
+
+
+class VerificationSummary:
+    """Aggregate counters over verify_file() reports."""
+
+    def __init__(self):
+        self.total = 0
+        self.passed = 0
+        self.failed = 0
+        self.errors = 0
+        self.integrity_failed = 0
+        self.signature_invalid = 0
+        self.unsigned = 0
+        self.trust_levels: Dict[str, int] = {}
+        self._start = time.monotonic()
+
+    def add(self, report: dict) -> None:
+        """
+        Count one report.
+
+        Args:
+            report: verify_file() result
+        """
+        self.total += 1
+
+        if report.get("ok"):
+            self.passed += 1
+        else:
+            self.failed += 1
+
+        if "error" in report:
+            self.errors += 1
+            return
+
+        if not report["integrity_ok"]:
+            self.integrity_failed += 1
+        if report["signature_valid"] is False:
+            self.signature_invalid += 1
+        elif report["signature_valid"] is None:
+            self.unsigned += 1
+
+        level = report["trust_level"]
+        self.trust_levels[level] = self.trust_levels.get(level, 0) + 1
+
+    @property
+    def all_ok(self) -> bool:
+        """True if every counted file passed."""
+        return self.failed == 0
+
+    def to_dict(self) -> dict:
+        """
+        Summary as a JSON-serializable dict.
+
+        Returns:
+            dict: Counters plus elapsed time and throughput
+        """
+        elapsed = time.monotonic() - self._start
+        return {
+            "total": self.total,
+            "passed": self.passed,
+            "failed": self.failed,
+            "errors": self.errors,
+            "integrity_failed": self.integrity_failed,
+            "signature_invalid": self.signature_invalid,
+            "unsigned": self.unsigned,
+            "trust_levels": dict(self.trust_levels),
+            "elapsed_seconds": round(elapsed, 3),
+            "files_per_second": round(self.total / elapsed, 1) if elapsed > 0 else None,
+        }
+
+
+class VerificationCache:
+    """
+    Persistent cache of verification results.
+
+    Entries are keyed by absolute path and are only valid while the file's
+    size and mtime (ns) and the hash of its manifest.json are unchanged.
+    A cache hit therefore costs a stat() and reading one small member;
+    a file rewritten in place with the same size and mtime is still
+    verified again as soon as its manifest differs.
+
+    Writes are committed in one transaction by commit()/close().
+    """
+
+    def __init__(self, db_path: Path):
+        """
+        Open (or create) the cache database.
+
+        Args:
+            db_path: Path to the SQLite cache file
+        """
+        self.db_path = Path(db_path)
+        self.conn = sqlite3.connect(str(self.db_path))
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS verified (
+                path TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                manifest_hash TEXT NOT NULL,
+                result TEXT NOT NULL,
+                verified_at REAL NOT NULL
+            )
+        ''')
+
+    @staticmethod
+    def manifest_hash(manifest_bytes: bytes) -> str:
+        """
+        Hash raw manifest.json bytes.
+
+        Args:
+            manifest_bytes: manifest.json as stored in the archive
+
+        Returns:
+            str: Hexadecimal SHA-256 hash
+        """
+        return hashlib.sha256(manifest_bytes).hexdigest()
+
+    def get(self, path: Path, stat: Optional[os.stat_result] = None) -> Optional[dict]:
+        """
+        Look up a cached result.
+
+        Args:
+            path: .epi file
+            stat: Result of path.stat() if already known
+
+        Returns:
+            Cached result dict, or None if missing or stale
+        """
+        path = Path(path).resolve()
+        stat = stat or path.stat()
+
+        row = self.conn.execute(
+            'SELECT size, mtime_ns, manifest_hash, result FROM verified WHERE path = ?',
+            (str(path),)
+        ).fetchone()
+
+        if row is None or row[0] != stat.st_size or row[1] != stat.st_mtime_ns:
+            return None
+
+        try:
+            with zipfile.ZipFile(path, "r") as zf:
+                manifest_bytes = zf.read("manifest.json")
+        except (OSError, KeyError, zipfile.BadZipFile, zlib.error):
+            return None
+        if self.manifest_hash(manifest_bytes) != row[2]:
+            return None
+
+        return json.loads(row[3])
+
+    def put(
+        self,
+        path: Path,
+        result: dict,
+        manifest_hash: str,
+        stat: Optional[os.stat_result] = None
+    ) -> None:
+        """
+        Store a result for the file's current size/mtime.
+
+        Args:
+            path: .epi file
+            result: JSON-serializable result to cache
+            manifest_hash: Hash of the verified manifest.json
+            stat: Result of path.stat() taken before verification
+        """
+        path = Path(path).resolve()
+        stat = stat or path.stat()
+
+        self.conn.execute(
+            'INSERT OR REPLACE INTO verified VALUES (?, ?, ?, ?, ?, ?)',
+            (str(path), stat.st_size, stat.st_mtime_ns, manifest_hash,
+             json.dumps(result), time.time())
+        )
+
+    def prune(self, keep: Iterable[Path]) -> None:
+        """
+        Drop entries for files that are not in `keep` (deleted or moved).
+
+        Args:
+            keep: Paths that are still present
+        """
+        keep_set = {str(Path(p).resolve()) for p in keep}
+        stale = [
+            (row[0],) for row in self.conn.execute('SELECT path FROM verified')
+            if row[0] not in keep_set
+        ]
+        if stale:
+            self.conn.executemany('DELETE FROM verified WHERE path = ?', stale)
+
+    def commit(self) -> None:
+        """Persist pending writes."""
+        self.conn.commit()
+
+    def close(self) -> None:
+        """Commit and close the database."""
+        self.conn.commit()
+        self.conn.close()
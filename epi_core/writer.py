@@ -0,0 +1,565 @@
+"""
+EPI Core Writer - Step journal for the steps.jsonl timeline.
+
+steps.jsonl is the single journal shared by the sync (RecordingContext)
+and async (AsyncRecorder) recorders: it is written incrementally while
+recording and packed as-is, so finalizing a session never re-reads,
+re-validates or re-serializes its steps. Use open_journal() to get one.
+
+Two strategies are provided:
+- StepWriter: write-through, every step is appended to disk before returning
+- BufferedStepWriter: group-commit, steps are queued by the caller and
+  written in batches by a background flush thread
+
+Both writers accept already-serialized JSON lines (without the trailing
+newline), so serialization cost stays on the caller and the writer only
+deals with I/O.
+
+For recordings written from many threads at once:
+- StepSequencer: lock-free source of unique, gap-free step indices
+- SequencedJournal: per-thread append buffers merged by a single writer,
+  so steps.jsonl is always in index order (see its ordering guarantee)
+"""
+
+import atexit
+import heapq
+import itertools
+import os
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+# fsync policies (how hard we push steps to stable storage)
+FSYNC_NEVER = "never"        # Leave it to the OS page cache
+FSYNC_ON_FLUSH = "flush"     # fsync once per group commit
+FSYNC_PER_STEP = "step"      # fsync after every single step
+
+FSYNC_POLICIES = (FSYNC_NEVER, FSYNC_ON_FLUSH, FSYNC_PER_STEP)
+
+# Seconds a SequencedJournal waits for a lower, still in-flight index before
+# writing later steps anyway (only reached if a writer thread stalls)
+GAP_TIMEOUT = 5.0
+
+# SequencedJournal drops buffers of exited threads every this many merges
+_PRUNE_EVERY = 256
+
+
+class FlushPolicy:
+    """
+    Flush policy for buffered step writing.
+
+    A batch is committed to disk as soon as ANY of the limits is reached:
+    - max_steps: number of queued steps
+    - max_bytes: size of queued step data
+    - max_latency: seconds since the oldest queued step was written
+    """
+
+    def __init__(
+        self,
+        max_steps: int = 512,
+        max_bytes: int = 1024 * 1024,
+        max_latency: float = 0.25,
+        fsync: str = FSYNC_NEVER
+    ):
+        """
+        Initialize flush policy.
+
+        Args:
+            max_steps: Flush after this many queued steps (default: 512)
+            max_bytes: Flush after this many queued bytes (default: 1 MB)
+            max_latency: Maximum seconds a step may stay in memory (default: 0.25)
+            fsync: fsync policy - "never", "flush" or "step" (default: "never")
+
+        Raises:
+            ValueError: If a limit is not positive or fsync policy is unknown
+        """
+        if max_steps < 1 or max_bytes < 1 or max_latency <= 0:
+            raise ValueError("Flush policy limits must be positive")
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(
+                f"Unknown fsync policy: {fsync!r} (expected one of {', '.join(FSYNC_POLICIES)})"
+            )
+
+        self.max_steps = max_steps
+        self.max_bytes = max_bytes
+        self.max_latency = max_latency
+        self.fsync = fsync
+
+    def __repr__(self) -> str:
+        return (
+            f"FlushPolicy(max_steps={self.max_steps}, max_bytes={self.max_bytes}, "
+            f"max_latency={self.max_latency}, fsync={self.fsync!r})"
+        )
+
+
+class StepWriter:
+    """
+    Write-through step writer.
+
+    Opens the file, appends one line and closes it again for every step,
+    so the timeline on disk is always complete (the historical behavior).
+    """
+
+    def __init__(self, path: Path, fsync: str = FSYNC_NEVER):
+        """
+        Initialize write-through writer.
+
+        Args:
+            path: Path to steps.jsonl
+            fsync: fsync policy ("never" or "step"; "flush" behaves like "step")
+        """
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"Unknown fsync policy: {fsync!r}")
+
+        self.path = Path(path)
+        self.fsync = fsync
+
+    def write(self, line: str) -> None:
+        """
+        Append one serialized step.
+
+        Args:
+            line: JSON line without trailing newline
+        """
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(line + '\n')
+            if self.fsync != FSYNC_NEVER:
+                f.flush()
+                os.fsync(f.fileno())
+
+    def write_many(self, lines: List[str]) -> None:
+        """
+        Append several serialized steps with a single open/write.
+
+        Args:
+            lines: JSON lines without trailing newlines
+        """
+        if not lines:
+            return
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write('\n'.join(lines) + '\n')
+            if self.fsync != FSYNC_NEVER:
+                f.flush()
+                os.fsync(f.fileno())
+
+    def flush(self) -> None:
+        """No-op: every step is already on disk."""
+
+    def close(self) -> None:
+        """No-op: no file handle is kept open."""
+
+
+class BufferedStepWriter:
+    """
+    Group-commit step writer with a background flush thread.
+
+    write() only appends to an in-memory queue; a daemon thread commits
+    queued steps in batches according to the FlushPolicy. Call flush() for
+    an explicit durability point and close() when the recording ends.
+
+    Steps are written in the order write() was called.
+    """
+
+    def __init__(self, path: Path, policy: Optional[FlushPolicy] = None):
+        """
+        Initialize buffered writer and start its flush thread.
+
+        Args:
+            path: Path to steps.jsonl
+            policy: Flush policy (default: FlushPolicy())
+        """
+        self.path = Path(path)
+        self.policy = policy or FlushPolicy()
+
+        self._queue: deque = deque()
+        self._queued_bytes = 0
+        self._oldest: Optional[float] = None
+
+        # Serializes actual file writes (flush thread vs explicit flush())
+        self._io_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._closed = False
+        self._error: Optional[BaseException] = None
+
+        self._file = open(self.path, 'a', encoding='utf-8')
+
+        self._thread = threading.Thread(
+            target=self._flush_loop,
+            name="epi-step-writer",
+            daemon=True
+        )
+        self._thread.start()
+
+        # Never lose queued steps on interpreter shutdown
+        atexit.register(self.close)
+
+    def write(self, line: str) -> None:
+        """
+        Queue one serialized step.
+
+        Args:
+            line: JSON line without trailing newline
+
+        Raises:
+            RuntimeError: If the writer is closed
+            OSError: If a previous background flush failed
+        """
+        if self._closed:
+            raise RuntimeError("Cannot write to a closed step writer")
+        if self._error is not None:
+            raise self._error
+
+        if self._oldest is None:
+            self._oldest = time.monotonic()
+        self._queue.append(line)
+        self._queued_bytes += len(line) + 1
+
+        if self.policy.fsync == FSYNC_PER_STEP:
+            # Per-step durability cannot be deferred
+            self.flush()
+        elif (len(self._queue) >= self.policy.max_steps
+              or self._queued_bytes >= self.policy.max_bytes):
+            self._wakeup.set()
+
+    def write_many(self, lines: List[str]) -> None:
+        """
+        Queue several serialized steps (in order).
+
+        Args:
+            lines: JSON lines without trailing newlines
+
+        Raises:
+            RuntimeError: If the writer is closed
+            OSError: If a previous background flush failed
+        """
+        if self._closed:
+            raise RuntimeError("Cannot write to a closed step writer")
+        if self._error is not None:
+            raise self._error
+        if not lines:
+            return
+
+        if self._oldest is None:
+            self._oldest = time.monotonic()
+        self._queue.extend(lines)
+        self._queued_bytes += sum(len(line) for line in lines) + len(lines)
+
+        if self.policy.fsync == FSYNC_PER_STEP:
+            self.flush()
+        elif (len(self._queue) >= self.policy.max_steps
+              or self._queued_bytes >= self.policy.max_bytes):
+            self._wakeup.set()
+
+    @property
+    def pending(self) -> int:
+        """Number of steps queued but not yet written."""
+        return len(self._queue)
+
+    def flush(self) -> None:
+        """
+        Commit all queued steps to disk (blocking).
+
+        Honors the fsync policy. Safe to call from any thread.
+        """
+        with self._io_lock:
+            self._drain()
+
+    def close(self) -> None:
+        """Flush remaining steps, stop the flush thread and close the file."""
+        if self._closed:
+            return
+        self._closed = True
+        atexit.unregister(self.close)
+
+        self._wakeup.set()
+        if self._thread.is_alive() and threading.current_thread() is not self._thread:
+            self._thread.join()
+
+        with self._io_lock:
+            self._drain()
+            self._file.close()
+
+    def _flush_loop(self) -> None:
+        """Background thread: commit batches when a policy limit is hit."""
+        while not self._closed:
+            oldest = self._oldest
+            if oldest is None:
+                timeout = self.policy.max_latency
+            else:
+                timeout = max(0.0, oldest + self.policy.max_latency - time.monotonic())
+
+            self._wakeup.wait(timeout)
+            self._wakeup.clear()
+
+            try:
+                with self._io_lock:
+                    self._drain()
+            except BaseException as e:
+                # Surface the failure to the next write() instead of dying silently
+                self._error = e
+                return
+
+    def _drain(self) -> None:
+        """Write every queued step. Caller must hold _io_lock."""
+        self._oldest = None
+        self._queued_bytes = 0
+
+        if not self._queue or self._file.closed:
+            return
+
+        batch = []
+        popleft = self._queue.popleft
+        try:
+            while True:
+                batch.append(popleft())
+        except IndexError:
+            pass
+
+        batch.append('')
+        self._file.write('\n'.join(batch))
+        self._file.flush()
+
+        if self.policy.fsync != FSYNC_NEVER:
+            os.fsync(self._file.fileno())
+
+
+class StepSequencer:
+    """
+    Lock-free source of step indices.
+
+    next() is a single call into itertools.count, which is atomic in
+    CPython, so concurrent threads never get the same index and no index
+    is skipped. How many indices were taken is tallied per thread (each
+    thread only updates its own entry) rather than read back from the
+    counter, which has no API for that.
+    """
+
+    def __init__(self, start: int = 0):
+        """
+        Initialize sequencer.
+
+        Args:
+            start: First index handed out (default: 0)
+
+        Raises:
+            TypeError: If start is not an int
+        """
+        if not isinstance(start, int):
+            raise TypeError(f"start must be an int, not {type(start).__name__}")
+        self.start = start
+        self._counter = itertools.count(start)
+        self._taken: Dict[int, int] = {}
+
+    def next(self) -> int:
+        """
+        Take the next index.
+
+        Returns:
+            int: A step index no other caller receives
+        """
+        index = next(self._counter)
+        thread = threading.get_ident()
+        self._taken[thread] = self._taken.get(thread, 0) + 1
+        return index
+
+    @property
+    def issued(self) -> int:
+        """Next index to be handed out (= start + number of indices taken)."""
+        # copy() is atomic, so a thread taking its first index cannot resize the dict mid-sum
+        return self.start + sum(self._taken.copy().values())
+
+
+class SequencedJournal:
+    """
+    Merge steps written concurrently by many threads into one journal.
+
+    Every thread appends (index, line) pairs to its own buffer without
+    taking a shared lock. One thread at a time - whichever writer gets the
+    merge lock - collects all buffers, orders them by index, and hands the
+    run of consecutive indices starting at the next expected one to the
+    underlying writer as one batch. Threads whose steps were merged by
+    another thread return without doing any I/O themselves.
+
+    Ordering guarantee: steps.jsonl contains each index at most once. As
+    long as no gap timeout has fired, indices are in strictly increasing
+    order and every index below the last one written is present. The
+    order of indices is the order in which callers took them from the
+    StepSequencer; steps recorded by one thread therefore keep program
+    order, and a step that happens-before another step (in any thread)
+    has the lower index.
+
+    The one exception: a step whose index was taken but not yet written
+    holds back higher indices, and if it is still missing after
+    gap_timeout seconds (a stalled thread), later steps are written
+    anyway. The late step is then written after them, out of order, and
+    until it arrives the journal has a gap below the last index written.
+
+    With a write-through StepWriter, write() returns once the step is on
+    disk. With a BufferedStepWriter, merged steps are queued for its flush
+    thread.
+    """
+
+    def __init__(self, writer, start: int = 0, gap_timeout: float = GAP_TIMEOUT):
+        """
+        Initialize sequenced journal.
+
+        Args:
+            writer: StepWriter or BufferedStepWriter (see open_journal())
+            start: First index expected (must match the StepSequencer)
+            gap_timeout: Seconds to wait for a missing index before moving on
+        """
+        self.writer = writer
+        self.gap_timeout = gap_timeout
+        self._write_through = not isinstance(writer, BufferedStepWriter)
+
+        self._local = threading.local()
+        # (owner thread, buffer) for every thread that has written a step
+        self._buffers: list = []
+        self._buffers_lock = threading.Lock()
+
+        # Merge state, only touched by the thread holding the merge lock
+        self._merge = threading.Condition(threading.Lock())
+        self._heap: list = []
+        self._next = start
+        self._dirty = False
+        self._merges = 0
+
+    def write(self, index: int, line: Optional[str]) -> None:
+        """
+        Submit one serialized step.
+
+        Args:
+            index: Index from the StepSequencer
+            line: JSON line without trailing newline (None: skip the index)
+        """
+        buffer = getattr(self._local, "buffer", None)
+        if buffer is None:
+            buffer = self._local.buffer = deque()
+            with self._buffers_lock:
+                self._buffers.append((threading.current_thread(), buffer))
+
+        buffer.append((index, line))
+        self._dirty = True
+
+        # Single writer: whoever gets the merge lock merges for everyone. A
+        # thread that finds it taken moves on; the holder re-checks _dirty
+        # after releasing, so no submitted step is left behind.
+        while self._dirty and self._merge.acquire(blocking=False):
+            try:
+                self._dirty = False
+                self._merge_pending()
+            finally:
+                self._merge.release()
+
+        if self._write_through and self._next <= index:
+            with self._merge:
+                self._merge_pending()
+                self._wait_until_written(index)
+
+    def skip(self, index: int) -> None:
+        """
+        Release an index that will never be written (e.g. serialization failed).
+
+        Args:
+            index: Index from the StepSequencer
+        """
+        self.write(index, None)
+
+    def flush(self) -> None:
+        """Merge every submitted step and flush the underlying writer."""
+        with self._merge:
+            self._merge_pending()
+            if self._heap:
+                self._wait_until_written(max(index for index, _ in self._heap))
+        self.writer.flush()
+
+    def close(self) -> None:
+        """Write every submitted step (in index order) and close the writer."""
+        with self._merge:
+            self._merge_pending()
+            if self._heap:
+                self._wait_until_written(max(index for index, _ in self._heap))
+        self.writer.close()
+
+    def _merge_pending(self) -> None:
+        """Collect all thread buffers and write the ready run. Caller holds _merge."""
+        with self._buffers_lock:
+            buffers = list(self._buffers)
+
+        heap = self._heap
+        for _, buffer in buffers:
+            popleft = buffer.popleft
+            try:
+                while True:
+                    heapq.heappush(heap, popleft())
+            except IndexError:
+                pass
+
+        self._merges += 1
+        if self._merges % _PRUNE_EVERY == 0:
+            # Forget (drained) buffers of threads that have exited
+            with self._buffers_lock:
+                self._buffers = [
+                    entry for entry in self._buffers
+                    if entry[0].is_alive() or entry[1]
+                ]
+
+        self._write_ready(force=False)
+
+    def _write_ready(self, force: bool) -> None:
+        """Write consecutive indices from the heap (all of them if force). Caller holds _merge."""
+        heap = self._heap
+        start = self._next
+        lines = []
+        while heap and (force or heap[0][0] <= self._next):
+            index, line = heapq.heappop(heap)
+            if line is not None:
+                lines.append(line)
+            self._next = max(self._next, index + 1)
+
+        if lines:
+            self.writer.write_many(lines)
+        if self._next != start:
+            self._merge.notify_all()
+
+    def _wait_until_written(self, index: int) -> None:
+        """Block until `index` is written, waiting out in-flight lower indices. Caller holds _merge."""
+        deadline = time.monotonic() + self.gap_timeout
+        while self._next <= index:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                # A lower index never arrived: don't hold the recording hostage
+                self._write_ready(force=True)
+                return
+            self._merge.wait(min(remaining, 0.05))
+            self._merge_pending()
+
+
+def open_journal(
+    path: Path,
+    buffered: bool = False,
+    flush_policy: Optional[FlushPolicy] = None
+):
+    """
+    Open the steps.jsonl journal for a recording.
+
+    Args:
+        path: Path to steps.jsonl (created empty if missing)
+        buffered: Group-commit from a background thread (default: False)
+        flush_policy: Flush/fsync policy. In buffered mode it controls batching;
+                      in write-through mode only its fsync setting is used.
+
+    Returns:
+        StepWriter or BufferedStepWriter
+    """
+    path = Path(path)
+    path.touch(exist_ok=True)
+
+    if buffered:
+        return BufferedStepWriter(path, flush_policy)
+
+    fsync = flush_policy.fsync if flush_policy else FSYNC_NEVER
+    return StepWriter(path, fsync=fsync)
@@ -2,25 +2,28 @@
 EPI Recorder - Runtime interception and workflow capture.
 
 Python API for recording AI workflows with cryptographic verification.
+
+Public names are resolved lazily (PEP 562): `import epi_recorder` only
+loads this module, and the recorder API, wrapper clients, analytics
+(pandas) and framework integrations are imported on first use. This keeps
+the sitecustomize bootstrap injected by `epi run` / `epi install --global`
+cheap for every Python process.
 """
 
 __version__ = "2.6.0"
 
-# Export Python API
-from epi_recorder.api import (
-    EpiRecorderSession,
-    record,
-    get_current_session
-)
-
-# Export wrapper clients (new in v2.3.0)
-from epi_recorder.wrappers import (
-    wrap_openai,
-    TracedOpenAI,
-)
-
-# Export analytics (new in v2.3.0)
-from epi_recorder.analytics import AgentAnalytics
+# Public name -> defining module
+_LAZY_ATTRS = {
+    # Python API
+    "EpiRecorderSession": "epi_recorder.api",
+    "record": "epi_recorder.api",
+    "get_current_session": "epi_recorder.api",
+    # Wrapper clients (new in v2.3.0)
+    "wrap_openai": "epi_recorder.wrappers",
+    "TracedOpenAI": "epi_recorder.wrappers",
+    # Analytics (new in v2.3.0, needs pandas)
+    "AgentAnalytics": "epi_recorder.analytics",
+}
 
 # Note: Framework integrations are imported on-demand
 # from epi_recorder.integrations import EPICheckpointSaver
@@ -36,5 +39,17 @@ __all__ = [
 ]
 
 
+def __getattr__(name):
+    module_name = _LAZY_ATTRS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    import importlib
+    value = getattr(importlib.import_module(module_name), name)
+    # Cache on the module so __getattr__ only runs once per name
+    globals()[name] = value
+    return value
+
 
- 
\ No newline at end of file
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
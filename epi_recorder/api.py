@@ -6,25 +6,51 @@ with minimal code changes.
 """
 
 import asyncio
+import contextvars
 import functools
 import json
 import os
 import shutil
 import tempfile
 import threading
+import weakref
 from datetime import datetime
 from pathlib import Path
+from concurrent.futures import Future
 from typing import Any, Callable, Dict, List, Optional, Union
 
-from epi_core.container import EPIContainer
+from epi_core.blobs import DEFAULT_BLOB_THRESHOLD
+from epi_core.capture import CapturedFile, capture_file
+from epi_core.container import VIEWER_MODES, EPIContainer
 from epi_core.schemas import ManifestModel
-from epi_core.trust import sign_manifest_inplace
-from epi_recorder.patcher import RecordingContext, set_recording_context, patch_openai
+from epi_core.summary import SUMMARY_FILENAME
+from epi_core.trust import sign_manifest, sign_manifest_inplace
+from epi_core.writer import FlushPolicy
+from epi_recorder.patcher import (
+    RecordingContext,
+    patch_openai,
+    reset_recording_context,
+    set_recording_context,
+)
 from epi_recorder.environment import capture_full_environment
+from epi_recorder.async_api import BACKPRESSURE_MODES, DEFAULT_MAX_QUEUED, AsyncStepPipeline
+from epi_recorder.finalizer import completed_future, get_finalizer_pool
 
 
-# Thread-local storage for active recording sessions
-_thread_local = threading.local()
+# Active recording session of the current execution context. A ContextVar
+# (like the patcher's recording context) rather than a thread-local, so
+# concurrent sessions in asyncio tasks sharing one thread stay isolated.
+_active_session: contextvars.ContextVar[Optional["EpiRecorderSession"]] = contextvars.ContextVar(
+    'epi_active_session',
+    default=None
+)
+
+# Registry of every open session in the process (across tasks and threads)
+_open_sessions: "weakref.WeakSet[EpiRecorderSession]" = weakref.WeakSet()
+_open_sessions_lock = threading.Lock()
+
+# How a session is finalized (environment capture, pack, sign, cleanup) on exit
+FINALIZE_MODES = ("sync", "background")
 
 
 class EpiRecorderSession:
@@ -57,6 +83,17 @@ class EpiRecorderSession:
         metadata_tags: Optional[List[str]] = None,  # Renamed to avoid conflict with tags parameter
         # Legacy mode (deprecated)
         legacy_patching: bool = False,
+        # Step writing
+        buffered: bool = False,
+        flush_policy: Optional[FlushPolicy] = None,
+        blob_threshold: Optional[int] = DEFAULT_BLOB_THRESHOLD,
+        delta_history: bool = False,
+        # Finalization
+        finalize: str = "sync",
+        viewer_mode: str = "preview",
+        # Async step logging (alog_step)
+        max_queued: int = DEFAULT_MAX_QUEUED,
+        backpressure: str = "block",
     ):
         """
         Initialize EPI recording session.
@@ -74,7 +111,43 @@ class EpiRecorderSession:
             approved_by: Person or entity who approved this workflow execution
             metadata_tags: Tags for categorizing this workflow (renamed from tags to avoid conflict)
             legacy_patching: Enable deprecated monkey patching mode (default: False)
+            buffered: Write steps in batches from a background thread (default: False)
+            flush_policy: Batching/fsync policy for step writing (see epi_core.writer.FlushPolicy)
+            blob_threshold: Store str/bytes payloads larger than this (default: 16 KB)
+                            once in blobs/<sha256> and reference them from the
+                            step (see epi_core.blobs); None keeps them inline
+            delta_history: Store each llm.request's messages as the messages
+                           appended since an earlier request (see epi_core.history;
+                           default: False). Read steps back with epi_core.reader.
+            finalize: "sync" (default) packs the .epi before the with-block exits;
+                      "background" hands it to the process-wide finalizer pool
+                      (see epi_recorder.finalizer) and returns immediately.
+                      Either way, session.finalized.result() returns the .epi path.
+            viewer_mode: What viewer.html embeds: "preview" (default) holds the
+                         first steps and reads the rest from steps.jsonl,
+                         "full" embeds every step (see EPIContainer.pack)
+            max_queued: Steps alog_step holds in memory before backpressure (default: 1024)
+            backpressure: When alog_step's queue is full: "block" (default) waits,
+                          "drop-oldest" discards the oldest queued step,
+                          "spill" overflows to a temp file (see AsyncStepPipeline)
+        
+        Raises:
+            ValueError: If finalize, viewer or backpressure mode is unknown
         """
+        if finalize not in FINALIZE_MODES:
+            raise ValueError(
+                f"Unknown finalize mode: {finalize!r} (expected one of {', '.join(FINALIZE_MODES)})"
+            )
+        if viewer_mode not in VIEWER_MODES:
+            raise ValueError(
+                f"Unknown viewer mode: {viewer_mode!r} (expected one of {', '.join(VIEWER_MODES)})"
+            )
+        if backpressure not in BACKPRESSURE_MODES:
+            raise ValueError(
+                f"Unknown backpressure mode: {backpressure!r} "
+                f"(expected one of {', '.join(BACKPRESSURE_MODES)})"
+            )
+        
         self.output_path = Path(output_path)
         self.workflow_name = workflow_name or "untitled"
         self.tags = tags or []
@@ -92,11 +165,29 @@ class EpiRecorderSession:
         # Legacy mode flag (deprecated)
         self.legacy_patching = legacy_patching
         
+        # Step writing
+        self.buffered = buffered
+        self.flush_policy = flush_policy
+        self.blob_threshold = blob_threshold
+        self.delta_history = delta_history
+        
+        # Finalization (finalized is set on exit)
+        self.finalize = finalize
+        self.finalized: Optional[Future] = None
+        self.viewer_mode = viewer_mode
+        
+        # Async step logging (pipeline is started by the first alog_step)
+        self.max_queued = max_queued
+        self.backpressure = backpressure
+        self._pipeline: Optional[AsyncStepPipeline] = None
+        
         # Runtime state
         self.temp_dir: Optional[Path] = None
         self.recording_context: Optional[RecordingContext] = None
         self.start_time: Optional[datetime] = None
+        self._captured_files: Dict[str, CapturedFile] = {}
         self._entered = False
+        self._context_tokens: Optional[tuple] = None
         
     def __enter__(self) -> "EpiRecorderSession":
         """
@@ -117,12 +208,20 @@ class EpiRecorderSession:
         # Initialize recording context
         self.recording_context = RecordingContext(
             output_dir=self.temp_dir,
-            enable_redaction=self.redact
+            enable_redaction=self.redact,
+            buffered=self.buffered,
+            flush_policy=self.flush_policy,
+            blob_threshold=self.blob_threshold,
+            delta_history=self.delta_history
         )
         
-        # Set as active recording context
-        set_recording_context(self.recording_context)
-        _thread_local.active_session = self
+        # Set as active recording context (for this thread / asyncio task only)
+        self._context_tokens = (
+            set_recording_context(self.recording_context),
+            _active_session.set(self),
+        )
+        with _open_sessions_lock:
+            _open_sessions.add(self)
         
         # Only patch LLM libraries if legacy mode is enabled (deprecated)
         if self.legacy_patching:
@@ -150,7 +249,45 @@ class EpiRecorderSession:
         Exit the recording context (sync version).
         
         Finalizes recording, captures environment, packs .epi file,
-        and signs it if auto_sign is enabled.
+        and signs it if auto_sign is enabled. With finalize="background"
+        that work runs on the finalizer pool; see self.finalized.
+        """
+        end_time = datetime.utcnow()
+        
+        try:
+            # Steps still queued by alog_step (written on this thread)
+            if self._pipeline is not None:
+                self._pipeline.close()
+                self._record_pipeline_losses()
+            
+            if self.finalize == "background":
+                self.finalized = self._submit_finalize(exc_type, exc_val, end_time)
+            else:
+                self._finalize(exc_type, exc_val, end_time)
+                self.finalized = completed_future(self.output_path)
+        finally:
+            self._deactivate()
+    
+    def _submit_finalize(self, exc_type, exc_val, end_time: datetime) -> Future:
+        """Hand finalization to the process-wide pool (falls back to sync)."""
+        try:
+            return get_finalizer_pool().submit(self._finalize, exc_type, exc_val, end_time)
+        except RuntimeError:
+            # Interpreter is shutting down: finalize on this thread instead
+            self._finalize(exc_type, exc_val, end_time)
+            return completed_future(self.output_path)
+    
+    def _finalize(self, exc_type, exc_val, end_time: datetime) -> Path:
+        """
+        Capture environment, write the closing steps, pack and clean up.
+        
+        Args:
+            exc_type: Exception type that ended the session (or None)
+            exc_val: Exception instance (or None)
+            end_time: When the with-block was left
+            
+        Returns:
+            Path to the .epi file
         """
         try:
             # Capture environment snapshot BEFORE session.end
@@ -165,7 +302,6 @@ class EpiRecorderSession:
                 })
             
             # Log session end LAST to ensure it's the final step
-            end_time = datetime.utcnow()
             duration = (end_time - self.start_time).total_seconds()
             
             self.log_step("session.end", {
@@ -174,6 +310,14 @@ class EpiRecorderSession:
                 "success": exc_type is None
             })
             
+            # Commit every buffered step before packing
+            self.recording_context.close()
+            
+            # Aggregates kept while recording; saves readers a steps.jsonl scan
+            (self.temp_dir / SUMMARY_FILENAME).write_text(
+                self.recording_context.summary.to_json(), encoding="utf-8"
+            )
+            
             # Create manifest with metadata
             manifest = ManifestModel(
                 created_at=self.start_time,
@@ -184,31 +328,44 @@ class EpiRecorderSession:
                 tags=self.metadata_tags
             )
             
-            # Pack into .epi file
+            # Pack into .epi file (signed in the same pass if requested)
             EPIContainer.pack(
                 source_dir=self.temp_dir,
                 manifest=manifest,
-                output_path=self.output_path
+                output_path=self.output_path,
+                signer=self._load_signer() if self.auto_sign else None,
+                known_hashes=self._captured_files,
+                viewer_mode=self.viewer_mode
             )
             
-            # CRITICAL: Windows file system flush
-            # Allow OS to finalize file before signing
-            import time
-            time.sleep(0.1)
-            
-            # Sign if requested
-            if self.auto_sign:
-                self._sign_epi_file()
+            return self.output_path
             
         finally:
+            # Never leave a writer thread behind (idempotent after the close above)
+            if self.recording_context:
+                self.recording_context.close()
+            
             # Clean up temporary directory
             if self.temp_dir and self.temp_dir.exists():
                 shutil.rmtree(self.temp_dir, ignore_errors=True)
-            
-            # Clear recording context
-            set_recording_context(None)
-            if hasattr(_thread_local, 'active_session'):
-                delattr(_thread_local, 'active_session')
+    
+    def _deactivate(self) -> None:
+        """Detach this session from the current context and the registry."""
+        with _open_sessions_lock:
+            _open_sessions.discard(self)
+        
+        if self._context_tokens is None:
+            return
+        recording_token, session_token = self._context_tokens
+        self._context_tokens = None
+        
+        # Restore whatever was active before (e.g. an enclosing session)
+        reset_recording_context(recording_token)
+        try:
+            _active_session.reset(session_token)
+        except ValueError:
+            # Left from a different context than it was entered in
+            _active_session.set(None)
     
     # ==================== ASYNC CONTEXT MANAGER SUPPORT ====================
     
@@ -227,70 +384,43 @@ class EpiRecorderSession:
         Exit the recording context (async version).
         
         Async-compatible version of __exit__ for modern agent frameworks.
-        Uses run_in_executor for I/O operations to avoid blocking.
+        Finalization runs on the shared finalizer pool, so the event loop
+        is never blocked; in "sync" mode this awaits it, in "background"
+        mode it returns right away (see self.finalized).
         """
+        end_time = datetime.utcnow()
+        
         try:
-            # Capture environment snapshot BEFORE session.end
-            await asyncio.get_event_loop().run_in_executor(None, self._capture_environment)
-            
-            # Log exception if one occurred (before session.end)
-            if exc_type is not None:
-                self.log_step("session.error", {
-                    "error_type": exc_type.__name__,
-                    "error_message": str(exc_val),
-                    "timestamp": datetime.utcnow().isoformat()
-                })
-            
-            # Log session end LAST to ensure it's the final step
-            end_time = datetime.utcnow()
-            duration = (end_time - self.start_time).total_seconds()
-            
-            self.log_step("session.end", {
-                "timestamp": end_time.isoformat(),
-                "duration_seconds": duration,
-                "success": exc_type is None
-            })
-            
-            # Create manifest with metadata
-            manifest = ManifestModel(
-                created_at=self.start_time,
-                goal=self.goal,
-                notes=self.notes,
-                metrics=self.metrics,
-                approved_by=self.approved_by,
-                tags=self.metadata_tags
-            )
-            
-            # Pack into .epi file (run in executor to avoid blocking)
-            await asyncio.get_event_loop().run_in_executor(
-                None,
-                EPIContainer.pack,
-                self.temp_dir,
-                manifest,
-                self.output_path
-            )
-            
-            # CRITICAL: Windows file system flush
-            await asyncio.sleep(0.1)
-            
-            # Sign if requested (run in executor)
-            if self.auto_sign:
-                await asyncio.get_event_loop().run_in_executor(None, self._sign_epi_file)
+            # Let alog_step's writer finish before the closing steps
+            if self._pipeline is not None:
+                await self._pipeline.aclose()
+                self._record_pipeline_losses()
             
+            future = await self._asubmit_finalize(exc_type, exc_val, end_time)
+            self.finalized = future
         finally:
-            # Clean up temporary directory
-            if self.temp_dir and self.temp_dir.exists():
-                await asyncio.get_event_loop().run_in_executor(
+            self._deactivate()
+        
+        if self.finalize != "background":
+            await asyncio.wrap_future(future)
+    
+    async def _asubmit_finalize(self, exc_type, exc_val, end_time: datetime) -> Future:
+        """Submit finalization without blocking the loop on a full queue."""
+        pool = get_finalizer_pool()
+        loop = asyncio.get_running_loop()
+        try:
+            future = pool.submit(self._finalize, exc_type, exc_val, end_time, block=False)
+            if future is None:
+                # Queue is full: wait for a slot off the event loop
+                future = await loop.run_in_executor(
                     None,
-                    shutil.rmtree,
-                    self.temp_dir,
-                    True  # ignore_errors
+                    functools.partial(pool.submit, self._finalize, exc_type, exc_val, end_time)
                 )
-            
-            # Clear recording context
-            set_recording_context(None)
-            if hasattr(_thread_local, 'active_session'):
-                delattr(_thread_local, 'active_session')
+        except RuntimeError:
+            # Interpreter is shutting down: finalize on the loop's executor instead
+            await loop.run_in_executor(None, self._finalize, exc_type, exc_val, end_time)
+            future = completed_future(self.output_path)
+        return future
     
     def log_step(self, kind: str, content: Dict[str, Any]) -> None:
         """
@@ -312,16 +442,82 @@ class EpiRecorderSession:
         
         self.recording_context.add_step(kind, content)
     
+    def flush(self) -> None:
+        """
+        Commit all steps logged so far to disk.
+        
+        Only meaningful with buffered=True, where steps are otherwise written
+        in batches. Use it before operations that may crash the process.
+        """
+        if not self._entered:
+            raise RuntimeError("Cannot flush outside of context manager")
+        
+        self.recording_context.flush()
+    
     async def alog_step(self, kind: str, content: Dict[str, Any]) -> None:
         """
         Async version of log_step for async agent frameworks.
         
+        Never does step work on the event loop: the step is timestamped and
+        queued, and a worker thread redacts, serializes and writes queued
+        steps in batches. Only waits when the queue is full and
+        backpressure="block". Steps keep their alog_step-time timestamp but
+        are indexed when written, so they may follow log_step calls made
+        right after them.
+        
         Args:
             kind: Step type
-            content: Step data as dictionary
+            content: Step data as dictionary (don't mutate it afterwards)
+            
+        Raises:
+            RuntimeError: If called outside of the context manager
+            Exception: A previous queued step failed to serialize
         """
-        # Logging is CPU-bound, not I/O-bound, so just call sync version
-        self.log_step(kind, content)
+        if not self._entered:
+            raise RuntimeError("Cannot log step outside of context manager")
+        
+        pipeline = self._pipeline
+        if pipeline is None:
+            pipeline = self._pipeline = AsyncStepPipeline(
+                self._write_queued_step,
+                max_queued=self.max_queued,
+                backpressure=self.backpressure
+            )
+        elif pipeline.loop is not asyncio.get_running_loop():
+            # Logged from another event loop than the first alog_step
+            self.log_step(kind, content)
+            return
+        
+        if pipeline.error is not None:
+            error, pipeline.error = pipeline.error, None
+            raise error
+        
+        await pipeline.submit(kind, content)
+    
+    async def aflush(self) -> None:
+        """
+        Async version of flush: waits for queued alog_step steps, then
+        commits everything to disk without blocking the event loop.
+        """
+        if not self._entered:
+            raise RuntimeError("Cannot flush outside of context manager")
+        
+        if self._pipeline is not None:
+            await self._pipeline.join()
+        await asyncio.get_running_loop().run_in_executor(None, self.recording_context.flush)
+    
+    def _write_queued_step(self, kind: str, content: Dict[str, Any], timestamp: datetime) -> None:
+        """Write a step queued by alog_step (async writer thread)."""
+        self.recording_context.add_step(kind, content, timestamp=timestamp)
+    
+    def _record_pipeline_losses(self) -> None:
+        """Log steps alog_step discarded under backpressure="drop-oldest"."""
+        if self._pipeline.dropped:
+            self.log_step("session.steps_dropped", {
+                "count": self._pipeline.dropped,
+                "backpressure": self.backpressure,
+                "max_queued": self.max_queued
+            })
     
     def log_llm_request(self, model: str, payload: Dict[str, Any]) -> None:
         """
@@ -527,16 +723,23 @@ class EpiRecorderSession:
     def log_artifact(
         self,
         file_path: Path,
-        archive_path: Optional[str] = None
+        archive_path: Optional[str] = None,
+        hardlink: bool = False
     ) -> None:
         """
         Log a file artifact.
         
-        Copies the file into the recording's artifacts directory.
+        Captures the file into the recording's artifacts directory without
+        copying data where the filesystem allows it (reflink, then in-kernel
+        copy), and hashes it once on the way in; pack reuses that hash for
+        manifest.file_manifest instead of reading the file again.
         
         Args:
             file_path: Path to file to capture
             archive_path: Optional path within .epi archive (default: artifacts/<filename>)
+            hardlink: Hardlink the file instead of copying it (default: False).
+                      Only for files nothing will write to before the session
+                      ends; falls back to copying across filesystems.
             
         Example:
             # Capture output file
@@ -559,15 +762,17 @@ class EpiRecorderSession:
         artifacts_dir = self.temp_dir / "artifacts"
         artifacts_dir.mkdir(exist_ok=True)
         
-        # Copy file
+        # Capture file (hash computed on the way in, reused by pack)
         dest_path = artifacts_dir / file_path.name
-        shutil.copy2(file_path, dest_path)
+        captured = capture_file(file_path, dest_path, hardlink=hardlink)
+        self._captured_files[f"artifacts/{file_path.name}"] = captured
         
         # Log artifact step
         self.log_step("artifact.captured", {
             "source_path": str(file_path),
             "archive_path": archive_path,
-            "size_bytes": file_path.stat().st_size,
+            "size_bytes": captured.size,
+            "sha256": captured.sha256,
             "timestamp": datetime.utcnow().isoformat()
         })
     
@@ -591,13 +796,16 @@ class EpiRecorderSession:
                 "timestamp": datetime.utcnow().isoformat()
             })
     
-    def _sign_epi_file(self) -> None:
-        """Sign the .epi file with default key."""
+    def _load_signer(self) -> Optional[Callable[[ManifestModel], ManifestModel]]:
+        """
+        Load the default signing key and return a signer for EPIContainer.pack.
+        
+        Returns:
+            Callable that signs a manifest, or None if no key is available.
+            Signing failures are non-fatal: the manifest is left unsigned.
+        """
         try:
             from epi_cli.keys import KeyManager
-            import zipfile
-            import tempfile
-            from epi_core.trust import sign_manifest
             
             # Load key manager
             km = KeyManager()
@@ -609,70 +817,26 @@ class EpiRecorderSession:
                     km.generate_keypair(self.default_key_name)
                 except Exception:
                     # If generation fails, skip signing
-                    return
+                    return None
             
             # Load private key
             private_key = km.load_private_key(self.default_key_name)
-            
-            # Extract manifest, sign it, and repack
-            with tempfile.TemporaryDirectory() as tmpdir:
-                tmp_path = Path(tmpdir)
-                
-                # Extract all files
-                with zipfile.ZipFile(self.output_path, 'r') as zf:
-                    zf.extractall(tmp_path)
-                
-                # Load and sign manifest
-                manifest_path = tmp_path / "manifest.json"
-                manifest_data = json.loads(manifest_path.read_text(encoding="utf-8"))
-                manifest = ManifestModel(**manifest_data)
-                signed_manifest = sign_manifest(manifest, private_key, self.default_key_name)
-                
-                # Write signed manifest back
-                manifest_path.write_text(
-                    signed_manifest.model_dump_json(indent=2),
-                    encoding="utf-8"
-                )
-                
-                # Regenerate viewer.html with signed manifest
-                steps = []
-                steps_file = tmp_path / "steps.jsonl"
-                if steps_file.exists():
-                    for line in steps_file.read_text(encoding="utf-8").strip().split("\n"):
-                        if line:
-                            try:
-                                steps.append(json.loads(line))
-                            except json.JSONDecodeError:
-                                pass
-                
-                # Regenerate viewer with signed manifest
-                from epi_core.container import EPIContainer
-                viewer_html = EPIContainer._create_embedded_viewer(tmp_path, signed_manifest)
-                viewer_path = tmp_path / "viewer.html"
-                viewer_path.write_text(viewer_html, encoding="utf-8")
-                
-                # Repack the ZIP with signed manifest and updated viewer
-                # CRITICAL: Write to temp file first to prevent data loss
-                temp_output = self.output_path.with_suffix('.epi.tmp')
-                
-                with zipfile.ZipFile(temp_output, 'w', zipfile.ZIP_DEFLATED) as zf:
-                    # Write mimetype first (uncompressed)
-                    from epi_core.container import EPI_MIMETYPE
-                    zf.writestr("mimetype", EPI_MIMETYPE, compress_type=zipfile.ZIP_STORED)
-                    
-                    # Write all other files
-                    for file_path in tmp_path.rglob("*"):
-                        if file_path.is_file() and file_path.name != "mimetype":
-                            arc_name = str(file_path.relative_to(tmp_path)).replace("\\", "/")
-                            zf.write(file_path, arc_name)
-                
-                # Successfully created signed file, now safely replace original
-                self.output_path.unlink()
-                temp_output.rename(self.output_path)
-                
         except Exception as e:
             # Non-fatal: log warning but continue
             print(f"Warning: Failed to sign .epi file: {e}")
+            return None
+        
+        key_name = self.default_key_name
+        
+        def signer(manifest: ManifestModel) -> ManifestModel:
+            try:
+                return sign_manifest(manifest, private_key, key_name)
+            except Exception as e:
+                # Non-fatal: log warning but continue
+                print(f"Warning: Failed to sign .epi file: {e}")
+                return manifest
+        
+        return signer
 
 
 def _auto_generate_output_path(name_hint: Optional[str] = None) -> Path:
@@ -892,11 +1056,22 @@ def get_current_session() -> Optional[EpiRecorderSession]:
     """
     Get the currently active recording session (if any).
     
+    The session is tracked per execution context: each thread and each
+    asyncio task sees only the session it entered (tasks inherit the
+    session active when they were created).
+    
     Returns:
         EpiRecorderSession or None
     """
-    return getattr(_thread_local, 'active_session', None)
-
+    return _active_session.get()
 
 
- 
\ No newline at end of file
+def get_open_sessions() -> List[EpiRecorderSession]:
+    """
+    Get every session currently open in this process.
+    
+    Returns:
+        List of EpiRecorderSession (in no particular order)
+    """
+    with _open_sessions_lock:
+        return list(_open_sessions)
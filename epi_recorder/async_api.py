@@ -1,151 +1,438 @@
 import asyncio
+import json
+import os
+import tempfile
 import threading
-import time
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import Future, ThreadPoolExecutor
 from contextlib import asynccontextmanager
-from typing import Optional, Dict, Any
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from datetime import datetime
+from pathlib import Path
 
-from epi_core.storage import EpiStorage
 from epi_core.schemas import StepModel
+from epi_core.writer import FlushPolicy, open_journal
+
+
+# What to do when more steps are queued than the writer keeps up with
+BACKPRESSURE_MODES = ("block", "drop-oldest", "spill")
+
+# Steps held in memory per pipeline before backpressure applies
+DEFAULT_MAX_QUEUED = 1024
+
+# Queued step: (kind, content, timestamp)
+QueuedStep = Tuple[str, Dict[str, Any], datetime]
+
+_STOP = object()
+
+_writer_executor: Optional[ThreadPoolExecutor] = None
+_writer_executor_lock = threading.Lock()
+
+
+def _get_writer_executor() -> ThreadPoolExecutor:
+    """Worker threads shared by all async pipelines (one hop in flight per pipeline)."""
+    global _writer_executor
+    if _writer_executor is None:
+        with _writer_executor_lock:
+            if _writer_executor is None:
+                _writer_executor = ThreadPoolExecutor(
+                    max_workers=min(32, (os.cpu_count() or 1) + 4),
+                    thread_name_prefix="epi-async-writer"
+                )
+    return _writer_executor
+
+
+class AsyncStepPipeline:
+    """
+    Async step logging that never does step work on the event loop.
+
+    submit() only timestamps and enqueues the step. A drain task takes
+    everything queued (get_nowait until empty) and hands the batch to a
+    worker thread in one hop, where write_step does redaction,
+    serialization and file I/O. Steps are written in submission order.
+
+    When max_queued steps are waiting, backpressure applies:
+        block:        submit() waits until the writer frees up space
+        drop-oldest:  the oldest queued step is discarded (see .dropped)
+        spill:        steps overflow to an anonymous temp file and are
+                      replayed in order once the queue has drained; the
+                      file is written by the pipeline's spill thread, the
+                      loop only hands steps over
+
+    A step that fails to write does not stop the pipeline; the first
+    failure is kept in .error.
+    """
+
+    def __init__(
+        self,
+        write_step: Callable[[str, Dict[str, Any], datetime], None],
+        max_queued: int = DEFAULT_MAX_QUEUED,
+        backpressure: str = "block"
+    ):
+        """
+        Initialize pipeline (must be called from the event loop thread).
+
+        Args:
+            write_step: Writes one step; called from a worker thread
+            max_queued: Steps held in memory before backpressure (default: 1024)
+            backpressure: "block" (default), "drop-oldest" or "spill"
+
+        Raises:
+            ValueError: If max_queued is not positive or backpressure is unknown
+            RuntimeError: If no event loop is running
+        """
+        if max_queued < 1:
+            raise ValueError("max_queued must be positive")
+        if backpressure not in BACKPRESSURE_MODES:
+            raise ValueError(
+                f"Unknown backpressure mode: {backpressure!r} "
+                f"(expected one of {', '.join(BACKPRESSURE_MODES)})"
+            )
+
+        self._write_step = write_step
+        self.max_queued = max_queued
+        self.backpressure = backpressure
+
+        # Backpressure counters (event loop thread) and first write failure
+        self.dropped = 0
+        self.spilled = 0
+        self.error: Optional[BaseException] = None
+
+        self.loop = asyncio.get_running_loop()
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_queued)
+        self._spill = None  # Temp file receiving overflow (spill thread only)
+        self._spilling = False  # Overflow goes to the spill file until replayed
+        self._spill_executor: Optional[ThreadPoolExecutor] = None  # One thread: appends stay in order
+        self._handoff = None  # Spill file taken for replay, not yet handed to a worker
+        self._unwritten = 0
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._inflight: Optional[Future] = None
+        self._closed = False
+        self._task = self.loop.create_task(self._drain())
+
+    async def submit(self, kind: str, content: Dict[str, Any]) -> None:
+        """
+        Enqueue a step (only waits with backpressure="block" and a full queue).
+
+        Args:
+            kind: Step type
+            content: Step data (must not be mutated afterwards)
+
+        Raises:
+            RuntimeError: If the pipeline is closed
+        """
+        if self._closed:
+            raise RuntimeError("Async step pipeline is closed")
+
+        item = (kind, content, datetime.utcnow())
+        self._unwritten += 1
+        self._idle.clear()
+
+        # Once spilling, everything spills until replayed (keeps order)
+        if self._spilling:
+            self._spill_step(item)
+            return
+
+        try:
+            self._queue.put_nowait(item)
+        except asyncio.QueueFull:
+            if self.backpressure == "block":
+                await self._queue.put(item)
+            elif self.backpressure == "drop-oldest":
+                self._queue.get_nowait()
+                self.dropped += 1
+                self._step_written()
+                self._queue.put_nowait(item)
+            else:
+                self._spill_step(item)
+
+    async def join(self) -> None:
+        """Wait until every submitted step has been written."""
+        await self._idle.wait()
+
+    async def aclose(self) -> None:
+        """Write everything still queued and stop the drain task."""
+        if self._closed:
+            return
+        self._closed = True
+        await self._queue.put(_STOP)
+        await self._task
+
+    def close(self) -> None:
+        """
+        Synchronous close for callers that cannot await (e.g. __exit__).
+
+        Waits for the batch in flight, then writes the remaining steps on
+        the calling thread, in submission order: a spill file the drain
+        task had already taken (older than anything queued), the queue,
+        then steps spilled since.
+        """
+        if self._closed:
+            return
+        self._closed = True
+
+        if self._inflight is not None:
+            self._inflight.result()
+        self._task.cancel()
+
+        if self._spill_executor is not None:
+            # Let a handoff to the (now cancelled) drain task finish
+            self._spill_executor.submit(lambda: None).result()
+            self._replay_handoff()
+
+        batch = []
+        while not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+        self._write_batch(batch)
+
+        if self._spill_executor is not None:
+            self._spill_executor.submit(self._take_spill).result()
+            self._replay_handoff()
+            self._spill_executor.shutdown()
+
+    # ==================== Event loop side ====================
+
+    def _spill_step(self, item: QueuedStep) -> None:
+        """Hand a step to the spill thread."""
+        if self._spill_executor is None:
+            self._spill_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="epi-async-spill")
+        self._spilling = True
+        self._spill_executor.submit(self._append_spill, item)
+        self.spilled += 1
+
+    def _step_written(self, count: int = 1) -> None:
+        self._unwritten -= count
+        if self._unwritten <= 0:
+            self._idle.set()
+
+    async def _hop(self, fn: Callable, *args) -> Any:
+        """Run fn on a worker thread (the only executor hop per batch)."""
+        self._inflight = _get_writer_executor().submit(fn, *args)
+        try:
+            return await asyncio.wrap_future(self._inflight)
+        finally:
+            self._inflight = None
+
+    async def _next_spill(self) -> Any:
+        """
+        Take the spill file once every step spilled so far is in it.
+
+        Queued behind the pending appends on the spill thread; steps that
+        spill after this call go to a new file. The file waits in
+        self._handoff until it is picked up here, so a close() that
+        cancels the drain task meanwhile still replays it.
+        """
+        self._spilling = False
+        await asyncio.wrap_future(self._spill_executor.submit(self._take_spill))
+        spill, self._handoff = self._handoff, None
+        return spill
+
+    async def _drain(self) -> None:
+        """Drain task: queue -> worker thread, batch by batch."""
+        stop = False
+        while not stop:
+            # Spilled steps are newer than everything queued: replay them once
+            # the queue is empty
+            if self._spilling and self._queue.empty():
+                spill = await self._next_spill()
+                if spill is not None:
+                    await self._hop(self._replay_spill, spill)
+                continue
+
+            item = await self._queue.get()
+            batch = []
+            while True:
+                if item is _STOP:
+                    stop = True
+                else:
+                    batch.append(item)
+                if self._queue.empty():
+                    break
+                item = self._queue.get_nowait()
+
+            if batch:
+                await self._hop(self._write_batch, batch)
+
+        # Closing: steps that overflowed last
+        if self._spill_executor is not None:
+            spill = await self._next_spill()
+            if spill is not None:
+                await self._hop(self._replay_spill, spill)
+            self._spill_executor.shutdown(wait=False)
+
+    # ==================== Spill thread side ====================
+
+    def _append_spill(self, item: QueuedStep) -> None:
+        """Serialize a step into the spill file."""
+        try:
+            if self._spill is None:
+                self._spill = tempfile.TemporaryFile("w+", encoding="utf-8", prefix="epi-spill-")
+            kind, content, timestamp = item
+            self._spill.write(json.dumps([kind, content, timestamp.isoformat()], default=str) + "\n")
+        except Exception as e:
+            # The step is lost; don't keep join() waiting for it
+            if self.error is None:
+                self.error = e
+            self._account(1)
+
+    def _take_spill(self) -> None:
+        """Move the current spill file (if any) to the handoff slot."""
+        if self._spill is not None:
+            self._handoff, self._spill = self._spill, None
+
+    def _replay_handoff(self) -> None:
+        """Replay a spill file left in the handoff slot (close() only)."""
+        spill, self._handoff = self._handoff, None
+        if spill is not None:
+            self._replay_spill(spill)
+
+    # ==================== Worker thread side ====================
+
+    def _write_batch(self, batch: List[QueuedStep]) -> None:
+        """Write queued steps (worker thread), then account for them on the loop."""
+        for kind, content, timestamp in batch:
+            try:
+                self._write_step(kind, content, timestamp)
+            except Exception as e:
+                if self.error is None:
+                    self.error = e
+        self._account(len(batch))
+
+    def _replay_spill(self, spill) -> None:
+        """Write every step from a spill file, in order, and discard it."""
+        with spill:
+            spill.seek(0)
+            batch = []
+            for line in spill:
+                kind, content, timestamp = json.loads(line)
+                batch.append((kind, content, datetime.fromisoformat(timestamp)))
+                if len(batch) >= self.max_queued:
+                    self._write_batch(batch)
+                    batch = []
+            self._write_batch(batch)
+
+    def _account(self, count: int) -> None:
+        """Mark steps written (from any thread)."""
+        if not count:
+            return
+        try:
+            self.loop.call_soon_threadsafe(self._step_written, count)
+        except RuntimeError:
+            # Loop already closed: nobody is waiting anymore
+            pass
+
 
 class AsyncRecorder:
     """
     Async-native recorder that doesn't block the event loop.
-    Uses background thread for SQLite writes.
+    Steps go to the same steps.jsonl journal as the sync recorder,
+    group-committed by its background flush thread.
     """
-    
-    def __init__(self, session_name: str, output_dir: str = "."):
+
+    def __init__(
+        self,
+        session_name: str,
+        output_dir: str = ".",
+        flush_policy: Optional[FlushPolicy] = None,
+        max_queued: int = DEFAULT_MAX_QUEUED,
+        backpressure: str = "block"
+    ):
         self.session_name = session_name
         self.output_dir = output_dir
-        
-        # Thread-safe queue for steps
-        self._queue = asyncio.Queue()
-        
-        # Background thread executor (1 thread is enough for SQLite)
+        self.flush_policy = flush_policy
+        self.max_queued = max_queued
+        self.backpressure = backpressure
+
+        # Background thread executor for blocking journal calls (open/close)
         self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="epi_writer")
-        
-        # Storage instance (created in background thread)
-        self._storage: Optional[EpiStorage] = None
-        self._writer_task: Optional[asyncio.Task] = None
-        
-        # State tracking
+
+        # Journal instance (opened in background thread)
+        self._journal = None
+        self._pipeline: Optional[AsyncStepPipeline] = None
+
+        # State tracking (index is assigned by the writer, in write order)
         self._step_count = 0
-        self._done = asyncio.Event()
-        self._error: Optional[Exception] = None
-    
+
     async def start(self):
-        """Initialize storage in background thread and start writer"""
-        # Create storage in thread (SQLite init is also blocking)
-        loop = asyncio.get_event_loop()
-        self._storage = await loop.run_in_executor(
-            self._executor,
-            lambda: EpiStorage(self.session_name, self.output_dir)
+        """Open the journal in background thread and start the step pipeline"""
+        # Opening touches the filesystem, keep it off the event loop
+        steps_file = Path(self.output_dir) / "steps.jsonl"
+        loop = asyncio.get_running_loop()
+
+        def open_steps_journal():
+            steps_file.parent.mkdir(parents=True, exist_ok=True)
+            return open_journal(steps_file, buffered=True, flush_policy=self.flush_policy)
+
+        self._journal = await loop.run_in_executor(self._executor, open_steps_journal)
+
+        self._pipeline = AsyncStepPipeline(
+            self._write_to_journal,
+            max_queued=self.max_queued,
+            backpressure=self.backpressure
         )
-        
-        # Start background writer task
-        self._writer_task = asyncio.create_task(self._writer_loop())
-    
+
+    @property
+    def dropped(self) -> int:
+        """Steps discarded by backpressure="drop-oldest"."""
+        return self._pipeline.dropped if self._pipeline else 0
+
     async def record_step(self, step_type: str, content: dict):
         """Non-blocking step recording"""
-        if self._error:
-            raise self._error
-        
+        if self._pipeline is None:
+            raise RuntimeError("AsyncRecorder is not started")
+        if self._pipeline.error:
+            raise self._pipeline.error
+
+        await self._pipeline.submit(step_type, content)
+
+    def _write_to_journal(self, step_type: str, content: dict, timestamp: datetime):
+        """Serialize a step and hand it to the journal (writer thread)"""
         self._step_count += 1
-        
-        # Put in queue (never blocks, just buffers in memory)
-        await self._queue.put({
-            'index': self._step_count,
-            'type': step_type,
-            'content': content,
-            'timestamp': datetime.utcnow() # StepModel expects datetime
-        })
-    
-    async def _writer_loop(self):
-        """Background task: Drains queue to SQLite"""
-        try:
-            while True:
-                # Wait for item with timeout to check for shutdown
-                try:
-                    step_data = await asyncio.wait_for(self._queue.get(), timeout=0.5)
-                except asyncio.TimeoutError:
-                    continue
-                
-                if step_data is None: # Shutdown sentinel
-                   self._queue.task_done()
-                   break
-
-                # Write to SQLite in background thread (non-blocking for async)
-                loop = asyncio.get_event_loop()
-                await loop.run_in_executor(
-                    self._executor,
-                    self._write_to_storage,
-                    step_data
-                )
-                
-                self._queue.task_done()
-                
-        except asyncio.CancelledError:
-            # Graceful shutdown
-            pass
-        except Exception as e:
-            self._error = e
-    
-    def _write_to_storage(self, step_data: dict):
-        """Synchronous SQLite write (runs in background thread)"""
-        if self._storage:
-            # Construct StepModel
-            step = StepModel(
-                index=step_data['index'],
-                timestamp=step_data['timestamp'],
-                kind=step_data['type'],
-                content=step_data['content']
-            )
-            self._storage.add_step(step)
-    
+        step = StepModel(
+            index=self._step_count,
+            timestamp=timestamp,
+            kind=step_type,
+            content=content
+        )
+        self._journal.write(step.model_dump_json())
+
     async def stop(self):
-        """Finalize: Drain queue, close storage"""
-        if not self._writer_task:
+        """Finalize: Drain queue, close journal"""
+        if self._pipeline is None:
             return
-        
-        # Signal writer to finish
-        await self._queue.put(None)
-        await self._queue.join()
-        
-        # Wait for task
-        self._writer_task.cancel()
-        try:
-            await self._writer_task
-        except asyncio.CancelledError:
-            pass
-        
-        # Finalize storage in background thread
-        if self._storage:
-            loop = asyncio.get_event_loop()
+
+        await self._pipeline.aclose()
+
+        # Flush and close the journal in background thread; steps.jsonl is
+        # already the final output, so there is nothing to export
+        if self._journal:
+            loop = asyncio.get_running_loop()
             await loop.run_in_executor(
                 self._executor,
-                self._storage.finalize
+                self._journal.close
             )
-        
+
         # Shutdown executor
         self._executor.shutdown(wait=True)
 
 @asynccontextmanager
-async def record_async(session_name: str, output_dir: str = "."):
+async def record_async(
+    session_name: str,
+    output_dir: str = ".",
+    flush_policy: Optional[FlushPolicy] = None,
+    max_queued: int = DEFAULT_MAX_QUEUED,
+    backpressure: str = "block"
+):
     """
     Async context manager for recording.
-    
+
     Usage:
         async with record_async("my_agent") as rec:
             await agent.arun("task")  # Non-blocking
     """
-    recorder = AsyncRecorder(session_name, output_dir)
+    recorder = AsyncRecorder(session_name, output_dir, flush_policy, max_queued, backpressure)
     await recorder.start()
     try:
         yield recorder
     finally:
         await recorder.stop()
-
-
-
- 
\ No newline at end of file
@@ -3,6 +3,16 @@ EPI Recorder Bootstrap - Initialize recording in child process.
 
 This module is loaded via sitecustomize.py in the child process
 to set up LLM patching and recording context.
+
+Every recorded process (the script itself, multiprocessing workers,
+subprocess helpers, forked children) writes its own segment under
+EPI_STEPS_DIR/segments/; the parent merges them into one timeline before
+packing (see epi_core.segments).
+
+It runs before the user's first line in every recorded (or, with
+`epi install --global`, every) Python process, so it only loads the
+recorder core: `epi_recorder` resolves its public API lazily, and
+analytics (pandas), wrappers and integrations are never imported here.
 """
 
 import os
@@ -10,14 +20,50 @@ import sys
 from pathlib import Path
 
 
+# Set once recording has been initialized in this process
+_initialized = False
+
+
+def _blob_threshold():
+    """Blob threshold from EPI_BLOB_THRESHOLD (bytes; 0 keeps payloads inline)."""
+    from epi_core.blobs import DEFAULT_BLOB_THRESHOLD
+    
+    value = os.environ.get("EPI_BLOB_THRESHOLD")
+    if not value:
+        return DEFAULT_BLOB_THRESHOLD
+    try:
+        return int(value) or None
+    except ValueError:
+        print(f"Warning: Invalid EPI_BLOB_THRESHOLD {value!r}, using default", file=sys.stderr)
+        return DEFAULT_BLOB_THRESHOLD
+
+
+def _start_segment(steps_path: Path, enable_redaction: bool) -> None:
+    """Record this process into a new segment of the steps directory."""
+    from epi_core.segments import create_segment
+    from epi_recorder.patcher import RecordingContext, set_recording_context
+    
+    context = RecordingContext(
+        steps_path,
+        enable_redaction=enable_redaction,
+        steps_file=create_segment(steps_path),
+        blob_threshold=_blob_threshold(),
+        delta_history=os.environ.get("EPI_DELTA_HISTORY") == "1"
+    )
+    set_recording_context(context)
+
+
 def initialize_recording():
     """
     Initialize EPI recording in child process.
     
     This is called automatically via sitecustomize.py when EPI_RECORD=1.
+    Calling it again in the same process is a no-op.
     """
+    global _initialized
+
     # Check if recording is enabled
-    if os.environ.get("EPI_RECORD") != "1":
+    if _initialized or os.environ.get("EPI_RECORD") != "1":
         return
     
     # Get recording parameters from environment
@@ -35,11 +81,17 @@ def initialize_recording():
     
     try:
         # Import recording modules
-        from epi_recorder.patcher import RecordingContext, set_recording_context, patch_all
+        from epi_recorder.patcher import patch_all
+        
+        # Create recording context (this process's own segment)
+        _start_segment(steps_path, enable_redaction)
+        _initialized = True
         
-        # Create recording context
-        context = RecordingContext(steps_path, enable_redaction=enable_redaction)
-        set_recording_context(context)
+        # Forked children don't re-run sitecustomize: give them their own segment
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(
+                after_in_child=lambda: _start_segment(steps_path, enable_redaction)
+            )
         
         # Patch LLM libraries
         patch_results = patch_all()
@@ -9,11 +9,20 @@ import os
 import platform
 import sys
 import json
+import threading
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 import importlib.metadata
 
 
+# Installed-packages snapshot shared by every session in the process.
+# Scanning distribution metadata costs ~100-200 ms, far more than a short
+# session itself; the result only changes when something is (un)installed,
+# which updates the mtime of the site-packages directory it lands in.
+_packages_cache: Optional[Tuple[Tuple, Dict[str, str]]] = None
+_packages_cache_lock = threading.Lock()
+
+
 def capture_os_info() -> Dict[str, str]:
     """
     Capture operating system information.
@@ -46,13 +55,50 @@ def capture_python_info() -> Dict[str, str]:
     }
 
 
+def _packages_cache_key() -> Tuple:
+    """sys.path plus mtimes of its install directories (change on (un)install)."""
+    mtimes = []
+    for entry in sys.path:
+        # Other entries (script dir, cwd) change all the time and hold no installs
+        if os.path.basename(entry.rstrip("/\\")) not in ("site-packages", "dist-packages"):
+            continue
+        try:
+            mtimes.append(os.stat(entry).st_mtime_ns)
+        except OSError:
+            mtimes.append(None)
+    return (tuple(sys.path), tuple(mtimes))
+
+
 def capture_installed_packages() -> Dict[str, str]:
     """
     Capture installed Python packages and their versions.
     
+    The scan is cached per process and redone only when sys.path or one
+    of its directories changes.
+    
     Returns:
         dict: Package name -> version
     """
+    global _packages_cache
+    
+    key = _packages_cache_key()
+    cached = _packages_cache
+    if cached is not None and cached[0] == key:
+        return dict(cached[1])
+    
+    with _packages_cache_lock:
+        # Another session may have rescanned while we waited
+        cached = _packages_cache
+        if cached is not None and cached[0] == key:
+            return dict(cached[1])
+        
+        packages = _scan_installed_packages()
+        _packages_cache = (key, packages)
+        return dict(packages)
+
+
+def _scan_installed_packages() -> Dict[str, str]:
+    """Read installed packages from distribution metadata (or pip)."""
     packages = {}
     
     try:
@@ -0,0 +1,161 @@
+"""
+EPI Recorder Finalizer - Process-wide pool for background session finalize.
+
+Finalizing a session (environment snapshot, packing and signing the .epi,
+removing the temp directory) can take far longer than the recorded work
+itself. Async sessions always finalize on this pool (sized to the CPU
+count, shared by every session in the process); with
+EpiRecorderSession(..., finalize="background") sync sessions hand their
+finalize work to it too, and the session exposes a Future:
+
+    with record("run.epi", finalize="background") as epi:
+        ...
+    # returns immediately; later (or never, atexit drains the pool):
+    epi.finalized.result()  # -> Path of the .epi
+
+The pool is shared by all sessions in the process, has a bounded number of
+pending finalizations (submitting beyond it blocks the caller until a slot
+frees up, so a burst of sessions cannot pile up unbounded temp data), and
+is drained at interpreter exit so no recording is lost.
+"""
+
+import atexit
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Callable, Optional
+
+
+# Pending (queued or running) finalizations per process
+DEFAULT_MAX_PENDING = 32
+
+
+class FinalizerPool:
+    """
+    Thread pool for session finalization with bounded queue depth.
+
+    submit() blocks while max_pending finalizations are queued or running.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, max_pending: int = DEFAULT_MAX_PENDING):
+        """
+        Initialize finalizer pool.
+
+        Args:
+            max_workers: Worker threads (default: CPU count)
+            max_pending: Max finalizations queued or running (default: 32)
+
+        Raises:
+            ValueError: If max_pending is not positive
+        """
+        if max_pending < 1:
+            raise ValueError("max_pending must be positive")
+
+        # Packing is zlib + hashing, which release the GIL: one thread per core
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_pending = max_pending
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix="epi-finalizer"
+        )
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._pending = set()
+        self._lock = threading.Lock()
+
+    def submit(self, fn: Callable, *args, block: bool = True, **kwargs) -> Optional[Future]:
+        """
+        Schedule a finalization.
+
+        Args:
+            fn: Callable doing the finalize work
+            *args, **kwargs: Passed to fn
+            block: Wait for a free slot when the queue is full (default: True);
+                   if False, return None instead
+
+        Returns:
+            Future with fn's result (or exception), or None if the queue is
+            full and block is False
+
+        Raises:
+            RuntimeError: If the pool has been shut down
+        """
+        if not self._slots.acquire(blocking=block):
+            return None
+        try:
+            future = self._executor.submit(fn, *args, **kwargs)
+        except BaseException:
+            self._slots.release()
+            raise
+
+        with self._lock:
+            self._pending.add(future)
+        future.add_done_callback(self._done)
+        return future
+
+    @property
+    def pending(self) -> int:
+        """Number of finalizations queued or running."""
+        with self._lock:
+            return len(self._pending)
+
+    def drain(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for every submitted finalization to finish.
+
+        Args:
+            timeout: Max seconds to wait (default: no limit)
+
+        Returns:
+            bool: True if nothing is pending anymore
+        """
+        with self._lock:
+            pending = list(self._pending)
+        _, not_done = wait(pending, timeout=timeout)
+        return not not_done
+
+    def shutdown(self) -> None:
+        """Drain and stop the worker threads."""
+        self.drain()
+        self._executor.shutdown(wait=True)
+
+    def _done(self, future: Future) -> None:
+        with self._lock:
+            self._pending.discard(future)
+        self._slots.release()
+
+
+_pool: Optional[FinalizerPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_finalizer_pool() -> FinalizerPool:
+    """
+    Get the process-wide finalizer pool (created on first use).
+
+    Returns:
+        FinalizerPool shared by all sessions
+    """
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = FinalizerPool()
+                # Never exit with recordings still being packed
+                atexit.register(_pool.shutdown)
+    return _pool
+
+
+def completed_future(result=None) -> Future:
+    """
+    Future that is already resolved (used for synchronous finalize).
+
+    Args:
+        result: Result value
+
+    Returns:
+        Done Future
+    """
+    future = Future()
+    future.set_result(result)
+    return future
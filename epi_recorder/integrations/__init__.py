@@ -10,10 +10,11 @@ Available integrations:
   - OpenTelemetry:  EPISpanExporter, setup_epi_tracing()
 """
 
-from .langgraph import EPICheckpointSaver
-
 # Lazy imports — only fail when actually used, not on import
 def __getattr__(name):
+    if name == "EPICheckpointSaver":
+        from .langgraph import EPICheckpointSaver
+        return EPICheckpointSaver
     if name in ("EPICallback", "enable_epi", "disable_epi"):
         from .litellm import EPICallback, enable_epi, disable_epi
         return {"EPICallback": EPICallback, "enable_epi": enable_epi, "disable_epi": disable_epi}[name]
@@ -6,6 +6,7 @@ to capture requests and responses for workflow recording.
 """
 
 import json
+import threading
 import time
 from datetime import datetime
 from pathlib import Path
@@ -13,8 +14,11 @@ from typing import Any, Callable, Dict, List, Optional
 from functools import wraps
 
 from epi_core.schemas import StepModel
+from epi_core.blobs import DEFAULT_BLOB_THRESHOLD, BlobWriter
+from epi_core.history import HistoryEncoder, encode_messages
 from epi_core.redactor import get_default_redactor
-from epi_core.storage import EpiStorage
+from epi_core.summary import StepSummary
+from epi_core.writer import FlushPolicy, SequencedJournal, StepSequencer, open_journal
 
 
 class RecordingContext:
@@ -22,42 +26,83 @@ class RecordingContext:
     Global recording context for capturing LLM calls.
     
     Stores steps during recording and provides thread-safe access.
+    
+    add_step() may be called from any number of threads at once (e.g. tool
+    calls fanned out on a ThreadPoolExecutor). Each step takes its index
+    from a lock-free StepSequencer and is serialized (and redacted) on the
+    calling thread; a SequencedJournal then writes steps.jsonl in index
+    order, so indices are unique, gap-free and ascending in the file, and a
+    step that happens-before another has the lower index.
     """
     
-    def __init__(self, output_dir: Path, enable_redaction: bool = True):
+    def __init__(
+        self,
+        output_dir: Path,
+        enable_redaction: bool = True,
+        buffered: bool = False,
+        flush_policy: Optional[FlushPolicy] = None,
+        steps_file: Optional[Path] = None,
+        blob_threshold: Optional[int] = DEFAULT_BLOB_THRESHOLD,
+        delta_history: bool = False
+    ):
         """
         Initialize recording context.
         
         Args:
             output_dir: Directory where steps.jsonl will be written
             enable_redaction: Whether to redact secrets (default: True)
+            buffered: Group-commit steps from a background thread instead of
+                      appending each step synchronously (default: False)
+            flush_policy: Flush/fsync policy. In buffered mode it controls batching;
+                          in write-through mode only its fsync setting is used.
+            steps_file: Journal to write instead of output_dir/steps.jsonl
+                        (e.g. a per-process segment, see epi_core.segments)
+            blob_threshold: Move str/bytes values larger than this into
+                            output_dir/blobs (see epi_core.blobs); None keeps
+                            every payload inline
+            delta_history: Store each llm.request's messages as a delta
+                           against an earlier request (see epi_core.history;
+                           default: False)
         """
         self.output_dir = output_dir
-        self.step_index = 0
         self.enable_redaction = enable_redaction
         self.redactor = get_default_redactor() if enable_redaction else None
+        self.blobs = BlobWriter(output_dir, blob_threshold) if blob_threshold else None
+        self.history = HistoryEncoder() if delta_history else None
+        self._history_lock = threading.Lock()
+        
+        # Aggregates for summary.json, kept up to date as steps are written
+        self.summary = StepSummary()
         
         # Ensure output directory exists
         self.output_dir.mkdir(parents=True, exist_ok=True)
         
-        # Initialize SQLite storage (crash-safe, atomic)
-        import uuid
-        session_id = str(uuid.uuid4())[:8]
-        self.storage = EpiStorage(session_id, self.output_dir)
-        
-        # Keep JSONL path for backwards compatibility
-        self.steps_file = self.output_dir / "steps.jsonl"
-        
-        # Create empty steps.jsonl file immediately (for tests and early access)
-        self.steps_file.touch(exist_ok=True)
+        # Step journal (write-through by default, group-commit when buffered).
+        # steps.jsonl is created empty immediately (for tests and early access).
+        self.steps_file = Path(steps_file) if steps_file else self.output_dir / "steps.jsonl"
+        self.buffered = buffered
+        self._sequencer = StepSequencer()
+        self._journal = SequencedJournal(open_journal(self.steps_file, buffered, flush_policy))
+    
+    @property
+    def step_index(self) -> int:
+        """Index the next step will get (= number of steps recorded so far)."""
+        return self._sequencer.issued
     
-    def add_step(self, kind: str, content: Dict[str, Any]) -> None:
+    def add_step(
+        self,
+        kind: str,
+        content: Dict[str, Any],
+        timestamp: Optional[datetime] = None
+    ) -> None:
         """
-        Add a step to the recording.
+        Add a step to the recording. Safe to call from multiple threads.
         
         Args:
             kind: Step type (e.g., "llm.request", "llm.response")
             content: Step content data
+            timestamp: When the step happened (default: now); set by callers
+                       that record the step later than it occurred
         """
         # Redact if enabled
         if self.redactor:
@@ -65,39 +110,63 @@ class RecordingContext:
             
             # Add redaction step if secrets were found
             if redaction_count > 0:
-                redaction_step = StepModel(
-                    index=self.step_index,
-                    timestamp=datetime.utcnow(),
-                    kind="security.redaction",
-                    content={
-                        "count": redaction_count,
-                        "target_step": kind
-                    }
-                )
-                self._write_step(redaction_step)
-                self.step_index += 1
+                self._write_step("security.redaction", {
+                    "count": redaction_count,
+                    "target_step": kind
+                }, timestamp)
             
             content = redacted_content
         
-        # Create step
-        step = StepModel(
-            index=self.step_index,
-            timestamp=datetime.utcnow(),
-            kind=kind,
-            content=content
-        )
+        # Large payloads go to blobs/ (after redaction: secrets never reach a blob)
+        if self.blobs:
+            content = self.blobs.externalize(content)
         
-        # Write to file
-        self._write_step(step)
+        # Delta-encoded histories need their base earlier in the file, so
+        # encoding and index assignment happen together
+        if self.history and kind == "llm.request" and isinstance(content, dict) and isinstance(content.get("messages"), list):
+            with self._history_lock:
+                self._write_step(kind, encode_messages(self.history, content), timestamp)
+            return
         
-        # Store in memory - REMOVED for scalability
-        # self.steps.append(step)
-        self.step_index += 1
+        # Create and write step
+        self._write_step(kind, content, timestamp)
     
-    def _write_step(self, step: StepModel) -> None:
-        """Write step to steps.jsonl file."""
-        with open(self.steps_file, 'a', encoding='utf-8') as f:
-            f.write(step.model_dump_json() + '\n')
+    def _write_step(
+        self,
+        kind: str,
+        content: Dict[str, Any],
+        timestamp: Optional[datetime] = None
+    ) -> None:
+        """Sequence, serialize and submit one step to steps.jsonl."""
+        index = self._sequencer.next()
+        timestamp = timestamp or datetime.utcnow()
+        try:
+            line = StepModel(
+                index=index,
+                timestamp=timestamp,
+                kind=kind,
+                content=content
+            ).model_dump_json()
+        except BaseException:
+            # Never leave a hole that would hold back other threads' steps
+            self._journal.skip(index)
+            raise
+        
+        self._journal.write(index, line)
+        self.summary.add(index, kind, content, timestamp)
+    
+    def flush(self) -> None:
+        """
+        Commit all pending steps to steps.jsonl.
+        
+        No-op in write-through mode. In buffered mode this is the explicit
+        durability point: every step added before the call is on disk after it.
+        """
+        self._journal.flush()
+    
+    def close(self) -> None:
+        """Flush pending steps and release the step writer."""
+        self._journal.close()
 
 
 import contextvars
@@ -122,6 +191,21 @@ def set_recording_context(context: Optional[RecordingContext]) -> contextvars.To
     return _recording_context.set(context)
 
 
+def reset_recording_context(token: contextvars.Token) -> None:
+    """
+    Restore the recording context that was active before set_recording_context().
+    
+    Args:
+        token: Token returned by set_recording_context()
+    """
+    try:
+        _recording_context.reset(token)
+    except ValueError:
+        # Token belongs to another context (e.g. entered in one task, left in
+        # another): just clear this context's value
+        _recording_context.set(None)
+
+
 def get_recording_context() -> Optional[RecordingContext]:
     """Get recording context for current execution context."""
     return _recording_context.get()
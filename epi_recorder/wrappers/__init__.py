@@ -2,11 +2,21 @@
 EPI Wrapper Clients - Proxy wrappers for LLM clients.
 
 Provides transparent tracing without monkey patching.
+
+Wrapper modules are imported on first attribute access (PEP 562).
 """
 
-from epi_recorder.wrappers.openai import wrap_openai, TracedOpenAI, TracedCompletions, TracedChat
-from epi_recorder.wrappers.anthropic import wrap_anthropic, TracedAnthropic, TracedMessages
-from epi_recorder.wrappers.base import TracedClientBase
+# Public name -> submodule
+_LAZY_ATTRS = {
+    "wrap_openai": "openai",
+    "TracedOpenAI": "openai",
+    "TracedCompletions": "openai",
+    "TracedChat": "openai",
+    "wrap_anthropic": "anthropic",
+    "TracedAnthropic": "anthropic",
+    "TracedMessages": "anthropic",
+    "TracedClientBase": "base",
+}
 
 __all__ = [
     "wrap_openai",
@@ -18,3 +28,18 @@ __all__ = [
     "TracedMessages",
     "TracedClientBase",
 ]
+
+
+def __getattr__(name):
+    submodule = _LAZY_ATTRS.get(name)
+    if submodule is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    import importlib
+    value = getattr(importlib.import_module(f".{submodule}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -2,7 +2,8 @@
  * EPI Viewer - Static JavaScript Application
  * 
  * Renders .epi workflow timeline with zero code execution.
- * All data is loaded from embedded JSON.
+ * All data is loaded from embedded JSON; steps are parsed and rendered
+ * a page at a time as they scroll into view.
  */
 
 // Load embedded data
@@ -20,6 +21,211 @@ function loadEPIData() {
     }
 }
 
+// Steps are embedded as JSON lines in #epi-steps (gzip + base64 for large
+// recordings). They are only split into lines on load; a step is parsed when
+// the timeline page holding it is rendered. A preview embeds only the first
+// steps and records the recording's step count in data-total; the rest are
+// read from steps.jsonl once the user opens the .epi file (see loadArchive).
+let epiSteps = [];
+let epiStepsTotal = 0;
+let epiManifest = null;
+let epiArchive = null;
+
+// Served by epi view --serve (see epi_core.server), #epi-data carries the
+// API's base URL instead: pages of steps, search results and blobs are
+// fetched from it as they are needed.
+let epiApi = null;
+
+async function fetchJSON(url) {
+    const response = await fetch(url);
+    if (!response.ok) throw new Error(`${url}: HTTP ${response.status}`);
+    return response.json();
+}
+
+async function loadStepLines(data) {
+    const stepsScript = document.getElementById('epi-steps');
+    if (!stepsScript) {
+        // Viewers that embed a parsed "steps" array in #epi-data
+        return data && Array.isArray(data.steps) ? data.steps.map(step => JSON.stringify(step)) : [];
+    }
+    epiStepsTotal = Number(stepsScript.dataset.total) || 0;
+    let text = stepsScript.textContent;
+    if (stepsScript.dataset.encoding === 'gzip') {
+        const binary = atob(text.trim());
+        const bytes = new Uint8Array(binary.length);
+        for (let i = 0; i < binary.length; i++) bytes[i] = binary.charCodeAt(i);
+        const stream = new Blob([bytes]).stream().pipeThrough(new DecompressionStream('gzip'));
+        text = await new Response(stream).text();
+    }
+    return text.split('\n').filter(line => line.length > 0);
+}
+
+async function sha256Hex(bytes) {
+    const digest = new Uint8Array(await crypto.subtle.digest('SHA-256', bytes));
+    return Array.from(digest, b => b.toString(16).padStart(2, '0')).join('');
+}
+
+// Read every step from the .epi the viewer was packed with. steps.jsonl
+// must match the hash in this viewer's (signed) manifest.
+async function loadArchive(file) {
+    const archive = await openZipArchive(file);
+    const bytes = await readZipMember(archive, 'steps.jsonl');
+    if (bytes === null) throw new Error('The file has no steps.jsonl');
+
+    const expected = epiManifest && epiManifest.file_manifest && epiManifest.file_manifest['steps.jsonl'];
+    if (!expected || await sha256Hex(bytes) !== expected) {
+        throw new Error('steps.jsonl does not match the manifest of this viewer');
+    }
+
+    const lines = new TextDecoder('utf-8').decode(bytes).split('\n').filter(line => line.trim().length > 0);
+    epiArchive = archive;
+    epiSteps = lines;
+    epiStepsTotal = 0;
+    historyCache.clear();
+    renderTimeline(epiSteps.length);
+}
+
+function parseStep(position) {
+    try {
+        return JSON.parse(epiSteps[position]);
+    } catch (e) {
+        console.error(`Failed to parse step ${position}:`, e);
+        return { index: position, kind: 'invalid', timestamp: null, content: {} };
+    }
+}
+
+// Delta-encoded llm.request histories store only the messages appended since
+// an earlier request: {"$history": {"base": hash|null, "append": [...], "hash"}}.
+// Bases are looked up on demand by scanning back for the line carrying their
+// hash; the most recently rebuilt lists are cached by hash.
+const HISTORY_CACHE_SIZE = 64;
+const historyCache = new Map();
+
+function historyRef(step) {
+    const messages = step && step.content && step.content.messages;
+    const ref = messages && messages.$history;
+    return ref && typeof ref === 'object' ? ref : null;
+}
+
+function cacheHistory(hash, messages) {
+    historyCache.delete(hash);
+    historyCache.set(hash, messages);
+    if (historyCache.size > HISTORY_CACHE_SIZE) historyCache.delete(historyCache.keys().next().value);
+}
+
+function findHistory(hash, before) {
+    for (let i = before - 1; i >= 0; i--) {
+        if (epiSteps[i].indexOf(hash) === -1) continue;
+        const ref = historyRef(parseStep(i));
+        if (ref && ref.hash === hash) return { ref, position: i };
+    }
+    return null;
+}
+
+function resolveHistory(ref, position) {
+    const chain = [ref];
+    let messages = [];
+    let current = ref;
+    while (current.base !== null && current.base !== undefined) {
+        if (historyCache.has(current.base)) {
+            messages = historyCache.get(current.base);
+            break;
+        }
+        const found = findHistory(current.base, position);
+        if (!found) return null;
+        chain.push(found.ref);
+        current = found.ref;
+        position = found.position;
+    }
+    for (let i = chain.length - 1; i >= 0; i--) {
+        messages = messages.concat(Array.isArray(chain[i].append) ? chain[i].append : []);
+        if (chain[i].hash) cacheHistory(chain[i].hash, messages);
+    }
+    return messages;
+}
+
+// Rebuild full message lists for consecutive steps starting at position
+// start; an unknown base is left as is.
+function decodeHistories(steps, start) {
+    steps.forEach((step, offset) => {
+        const ref = historyRef(step);
+        if (!ref) return;
+        const messages = resolveHistory(ref, start + offset);
+        if (messages) step.content.messages = messages;
+    });
+}
+
+// Large payloads are stored once in blobs/<sha256> and referenced from steps
+// as {"$blob": sha256, "type": "text"|"bytes", "size": n}. The packer embeds
+// them base64-encoded in #epi-blobs (a preview only those its steps use);
+// that table is only parsed (and a blob only decoded) when the user opens
+// one. Other blobs are read from the opened .epi file.
+let epiBlobs = null;
+
+function isBlobRef(value) {
+    return value !== null && typeof value === 'object' && typeof value.$blob === 'string' && 'type' in value;
+}
+
+async function loadBlob(ref) {
+    if (epiBlobs === null) {
+        const blobScript = document.getElementById('epi-blobs');
+        try {
+            epiBlobs = blobScript ? JSON.parse(blobScript.textContent) : {};
+        } catch (e) {
+            console.error('Failed to parse EPI blobs:', e);
+            epiBlobs = {};
+        }
+    }
+    const encoded = epiBlobs[ref.$blob];
+    let bytes = null;
+    if (encoded !== undefined) {
+        bytes = Uint8Array.from(atob(encoded), c => c.charCodeAt(0));
+    } else if (epiArchive) {
+        bytes = await readZipMember(epiArchive, `blobs/${ref.$blob}`);
+    } else if (epiApi) {
+        const response = await fetch(`${epiApi}/blobs/${encodeURIComponent(ref.$blob)}`);
+        if (response.ok) bytes = new Uint8Array(await response.arrayBuffer());
+    }
+    if (bytes === null) return null;
+    if (ref.type !== 'text') return `[${ref.size} bytes of binary data]`;
+    return new TextDecoder('utf-8').decode(bytes);
+}
+
+function formatSize(bytes) {
+    return bytes >= 1024 * 1024 ? `${(bytes / 1024 / 1024).toFixed(1)} MB` : `${Math.ceil(bytes / 1024)} KB`;
+}
+
+// Placeholder for a blob; filled in by the click handler below
+function renderBlobRef(ref, format = 'plain') {
+    return `<button type="button" class="epi-blob text-xs underline text-indigo-700" data-blob="${escapeHTML(ref.$blob)}"
+        data-type="${escapeHTML(ref.type)}" data-size="${Number(ref.size) || 0}" data-format="${format}">
+        Show payload (${formatSize(Number(ref.size) || 0)})</button>`;
+}
+
+// Text that may be a blob reference
+function renderText(value, format = 'plain') {
+    if (isBlobRef(value)) return renderBlobRef(value, format);
+    if (typeof value !== 'string') value = value === undefined || value === null ? '' : JSON.stringify(value, null, 2);
+    return format === 'message' ? formatMessageContent(value) : escapeHTML(value);
+}
+
+document.addEventListener('click', async (event) => {
+    const button = event.target.closest && event.target.closest('button.epi-blob');
+    if (!button) return;
+    const ref = { $blob: button.dataset.blob, type: button.dataset.type, size: Number(button.dataset.size) };
+    let text = null;
+    try {
+        text = await loadBlob(ref);
+    } catch (e) {
+        console.error('Failed to load blob:', e);
+    }
+    const holder = document.createElement('span');
+    holder.innerHTML = text === null
+        ? `<span class="text-xs text-red-600">Payload ${escapeHTML(ref.$blob.slice(0, 12))}… not found</span>`
+        : (button.dataset.format === 'message' ? formatMessageContent(text) : escapeHTML(text));
+    button.replaceWith(holder);
+});
+
 // Render trust badge
 async function renderTrustBadge(manifest) {
     const badge = document.getElementById('trust-badge');
@@ -271,7 +477,7 @@ function renderLLMRequest(content) {
             html += `
                 <div class="chat-bubble ${align} ${bgColor} ${textColor} rounded-lg px-4 py-2 text-sm">
                     <div class="text-xs font-medium mb-1 uppercase">${msg.role}</div>
-                    <div class="whitespace-pre-wrap">${escapeHTML(msg.content)}</div>
+                    <div class="whitespace-pre-wrap">${renderText(msg.content)}</div>
                 </div>
             `;
         }
@@ -298,7 +504,7 @@ function renderLLMResponse(content) {
             html += `
                 <div class="chat-bubble mr-auto bg-green-100 text-green-900 rounded-lg px-4 py-2 text-sm">
                     <div class="text-xs font-medium mb-1 uppercase">Assistant</div>
-                    <div class="whitespace-pre-wrap">${formatMessageContent(choice.message.content)}</div>
+                    <div class="whitespace-pre-wrap">${renderText(choice.message.content, 'message')}</div>
                     ${choice.finish_reason ? `<div class="text-xs text-green-700 mt-2">• ${choice.finish_reason}</div>` : ''}
                 </div>
             `;
@@ -363,7 +569,7 @@ function renderHTTPRequest(content) {
                 <span class="ml-2 font-mono text-xs break-all">${escapeHTML(content.url || '')}</span>
             </div>
             ${content.headers ? `<div class="text-xs text-indigo-600">Headers: ${Object.keys(content.headers).length}</div>` : ''}
-            ${content.body ? `<pre class="mt-2 text-xs bg-indigo-100 p-2 rounded overflow-auto max-h-32">${escapeHTML(typeof content.body === 'string' ? content.body : JSON.stringify(content.body, null, 2))}</pre>` : ''}
+            ${content.body ? `<pre class="mt-2 text-xs bg-indigo-100 p-2 rounded overflow-auto max-h-32">${renderText(content.body)}</pre>` : ''}
         </div>
     `;
 }
@@ -379,7 +585,7 @@ function renderHTTPResponse(content) {
                 <span class="ml-2 text-xs">${content.url || ''}</span>
                 ${content.latency_seconds ? `<span class="ml-auto text-xs">⚡ ${content.latency_seconds}s</span>` : ''}
             </div>
-            ${content.body ? `<pre class="mt-2 text-xs bg-gray-100 p-2 rounded overflow-auto max-h-32">${escapeHTML(typeof content.body === 'string' ? content.body.slice(0, 500) : JSON.stringify(content.body, null, 2).slice(0, 500))}${(content.body.length > 500) ? '...' : ''}</pre>` : ''}
+            ${content.body ? `<pre class="mt-2 text-xs bg-gray-100 p-2 rounded overflow-auto max-h-32">${isBlobRef(content.body) ? renderBlobRef(content.body) : escapeHTML(typeof content.body === 'string' ? content.body.slice(0, 500) : JSON.stringify(content.body, null, 2).slice(0, 500))}${(!isBlobRef(content.body) && content.body.length > 500) ? '...' : ''}</pre>` : ''}
         </div>
     `;
 }
@@ -411,12 +617,64 @@ function escapeHTML(str) {
     return div.innerHTML;
 }
 
+// The timeline is split into pages of PAGE_SIZE steps. Each page starts as an
+// empty placeholder of estimated height and is rendered when it comes near the
+// viewport; once it scrolls far away it is emptied again (keeping its measured
+// height), so the DOM only holds a few pages however long the recording is.
+const PAGE_SIZE = 50;
+const ESTIMATED_STEP_HEIGHT = 140;
+let pageObserver = null;
+let timelineCount = 0;
+
+function renderPage(page) {
+    if (page.dataset.rendered) return;
+    page.dataset.rendered = '1';
+    const start = Number(page.dataset.start);
+    const end = Math.min(start + PAGE_SIZE, timelineCount);
+
+    if (epiApi) {
+        // Steps come back with histories rebuilt; the page may have been
+        // released again by the time they arrive
+        fetchJSON(`${epiApi}/steps?offset=${start}&limit=${end - start}`)
+            .then(result => { if (page.dataset.rendered) fillPage(page, result.steps); })
+            .catch(e => console.error('Failed to load steps:', e));
+        return;
+    }
+
+    const steps = [];
+    for (let i = start; i < end; i++) steps.push(parseStep(i));
+    decodeHistories(steps, start);
+    fillPage(page, steps);
+}
+
+function fillPage(page, steps) {
+    const fragment = document.createDocumentFragment();
+    for (const step of steps) fragment.appendChild(renderStep(step));
+    page.replaceChildren(fragment);
+    page.style.height = '';
+}
+
+function releasePage(page) {
+    if (!page.dataset.rendered) return;
+    page.style.height = `${page.offsetHeight}px`;
+    page.replaceChildren();
+    delete page.dataset.rendered;
+}
+
 // Render timeline
-function renderTimeline(steps) {
+function renderTimeline(count) {
     const timeline = document.getElementById('timeline');
     if (!timeline) return;
+    timelineCount = count;
+
+    const summary = document.getElementById('timeline-summary');
+    if (summary) {
+        summary.textContent = epiStepsTotal > count
+            ? `First ${count.toLocaleString()} of ${epiStepsTotal.toLocaleString()} captured workflow steps`
+            : `${count.toLocaleString()} captured workflow steps`;
+    }
 
-    if (steps.length === 0) {
+    if (count === 0) {
         timeline.innerHTML = `
             <div class="px-6 py-12 text-center text-gray-500">
                 No steps recorded
@@ -425,12 +683,133 @@ function renderTimeline(steps) {
         return;
     }
 
-    timeline.innerHTML = '';
-    for (const step of steps) {
-        timeline.appendChild(renderStep(step));
+    if (pageObserver) pageObserver.disconnect();
+    pageObserver = 'IntersectionObserver' in window
+        ? new IntersectionObserver((entries) => {
+            for (const entry of entries) {
+                if (entry.isIntersecting) renderPage(entry.target);
+                else releasePage(entry.target);
+            }
+        }, { rootMargin: '1500px 0px' })
+        : null;
+
+    const fragment = document.createDocumentFragment();
+    if (epiStepsTotal > count) fragment.appendChild(renderPreviewNotice(count));
+    const pages = [];
+    for (let start = 0; start < count; start += PAGE_SIZE) {
+        const page = document.createElement('div');
+        page.className = 'timeline-page divide-y divide-gray-200';
+        page.dataset.start = start;
+        page.style.height = `${Math.min(PAGE_SIZE, count - start) * ESTIMATED_STEP_HEIGHT}px`;
+        fragment.appendChild(page);
+        pages.push(page);
+    }
+    timeline.replaceChildren(fragment);
+
+    for (const page of pages) {
+        if (pageObserver) pageObserver.observe(page);
+        else renderPage(page);
     }
 }
 
+// Search: the server scans the archive (a batch at a time, see
+// epi_core.server); otherwise the loaded lines are scanned here
+const SEARCH_LIMIT = 100;
+
+async function searchSteps(query, start) {
+    if (epiApi) {
+        const url = `${epiApi}/search?q=${encodeURIComponent(query)}&start=${start}&limit=${SEARCH_LIMIT}`;
+        return fetchJSON(url);
+    }
+    const needle = query.toLowerCase();
+    const steps = [];
+    let position = start;
+    for (; position < epiSteps.length && steps.length < SEARCH_LIMIT; position++) {
+        if (epiSteps[position].toLowerCase().indexOf(needle) === -1) continue;
+        const step = parseStep(position);
+        decodeHistories([step], position);
+        steps.push(step);
+    }
+    return { query, steps, next: position < epiSteps.length ? position : null };
+}
+
+async function renderSearch(query) {
+    const timeline = document.getElementById('timeline');
+    if (!timeline) return;
+    if (pageObserver) pageObserver.disconnect();
+
+    const header = document.createElement('div');
+    header.className = 'px-6 py-4 text-sm text-gray-700';
+    header.innerHTML = `Searching for <span class="font-mono">${escapeHTML(query)}</span>…
+        <button type="button" class="underline text-indigo-700 cursor-pointer">Show all steps</button>`;
+    header.querySelector('button').addEventListener('click', () => {
+        const form = document.getElementById('timeline-search');
+        if (form) form.reset();
+        renderTimeline(timelineCount);
+    });
+    timeline.replaceChildren(header);
+
+    let found = 0;
+    let start = 0;
+    while (start !== null) {
+        let result;
+        try {
+            result = await searchSteps(query, start);
+        } catch (e) {
+            console.error('Search failed:', e);
+            break;
+        }
+        if (!timeline.contains(header)) return;  // Another search or the full timeline took over
+        for (const step of result.steps) timeline.appendChild(renderStep(step));
+        found += result.steps.length;
+        start = result.next;
+        // Keep going while a batch turned up nothing; otherwise wait to be asked
+        if (start !== null && result.steps.length > 0) {
+            const more = document.createElement('button');
+            more.type = 'button';
+            more.className = 'px-6 py-4 text-sm underline text-indigo-700 cursor-pointer';
+            more.textContent = 'More results';
+            timeline.appendChild(more);
+            await new Promise(resolve => more.addEventListener('click', resolve, { once: true }));
+            more.remove();
+        }
+    }
+    if (timeline.contains(header)) {
+        header.firstChild.textContent = `${found.toLocaleString()} step(s) matching `;
+    }
+}
+
+document.addEventListener('submit', (event) => {
+    if (event.target.id !== 'timeline-search') return;
+    event.preventDefault();
+    const query = new FormData(event.target).get('q').trim();
+    if (query) renderSearch(query);
+    else renderTimeline(timelineCount);
+});
+
+// Shown above a preview: the full timeline is in the .epi's steps.jsonl
+function renderPreviewNotice(count) {
+    const notice = document.createElement('div');
+    notice.className = 'px-6 py-4 bg-yellow-50 text-sm text-gray-700';
+    notice.innerHTML = `
+        Showing the first ${count.toLocaleString()} of ${epiStepsTotal.toLocaleString()} steps.
+        <label class="underline text-indigo-700 cursor-pointer">Open the .epi file<input type="file" accept=".epi,.zip" class="hidden"></label>
+        to load the full timeline (or run <span class="font-mono">epi view</span>).
+        <div class="epi-preview-error text-red-600"></div>
+    `;
+    notice.querySelector('input').addEventListener('change', async (event) => {
+        const file = event.target.files && event.target.files[0];
+        if (!file) return;
+        try {
+            await loadArchive(file);
+        } catch (e) {
+            console.error('Failed to load .epi file:', e);
+            notice.querySelector('.epi-preview-error').textContent = e.message;
+        }
+    });
+    return notice;
+}
+
 // Helper: Format message content with bolding
 function formatMessageContent(text) {
     if (!text) return '';
@@ -468,10 +847,25 @@ async function init() {
         return;
     }
 
+    epiManifest = data.manifest;
+    let count = 0;
+    try {
+        if (data.api) {
+            epiApi = data.api;
+            count = (await fetchJSON(`${epiApi}/steps?limit=0`)).total;
+        } else {
+            epiSteps = await loadStepLines(data);
+            count = epiSteps.length;
+        }
+    } catch (e) {
+        console.error('Failed to load EPI steps:', e);
+        epiSteps = [];
+    }
+
     await renderTrustBadge(data.manifest);
     renderMetadata(data.manifest);  // New metadata section
     renderManifest(data.manifest);
-    renderTimeline(data.steps);
+    renderTimeline(count);
 }
 
 // Run on load
@@ -0,0 +1,83 @@
+/**
+ * EPI Viewer - Minimal ZIP reader
+ *
+ * Reads members of a .epi archive chosen by the user (a File or Blob) without
+ * unpacking it: the central directory is parsed from the end of the file and
+ * a member is inflated with DecompressionStream('deflate-raw') when asked for.
+ * Only what EPIContainer.pack writes is supported (stored or deflated
+ * members, no ZIP64).
+ */
+
+const ZIP_EOCD_SIGNATURE = 0x06054b50;
+const ZIP_CENTRAL_SIGNATURE = 0x02014b50;
+const ZIP_LOCAL_SIGNATURE = 0x04034b50;
+const ZIP_EOCD_SIZE = 22;
+
+async function readZipBytes(blob, start, end) {
+    return new DataView(await blob.slice(start, end).arrayBuffer());
+}
+
+// Open an archive: returns { blob, entries: Map(name -> entry) }
+async function openZipArchive(blob) {
+    // End of central directory record, possibly followed by a comment
+    const tailStart = Math.max(0, blob.size - ZIP_EOCD_SIZE - 0xffff);
+    const tail = await readZipBytes(blob, tailStart, blob.size);
+    let eocd = -1;
+    for (let i = tail.byteLength - ZIP_EOCD_SIZE; i >= 0; i--) {
+        if (tail.getUint32(i, true) === ZIP_EOCD_SIGNATURE) {
+            eocd = i;
+            break;
+        }
+    }
+    if (eocd < 0) throw new Error('Not a ZIP archive');
+
+    const count = tail.getUint16(eocd + 10, true);
+    const directorySize = tail.getUint32(eocd + 12, true);
+    const directoryOffset = tail.getUint32(eocd + 16, true);
+    if (count === 0xffff || directoryOffset === 0xffffffff) throw new Error('ZIP64 archives are not supported');
+
+    const directory = await readZipBytes(blob, directoryOffset, directoryOffset + directorySize);
+    const decoder = new TextDecoder('utf-8');
+    const entries = new Map();
+    let position = 0;
+    for (let i = 0; i < count; i++) {
+        if (directory.getUint32(position, true) !== ZIP_CENTRAL_SIGNATURE) {
+            throw new Error('Corrupt ZIP central directory');
+        }
+        const nameLength = directory.getUint16(position + 28, true);
+        const extraLength = directory.getUint16(position + 30, true);
+        const commentLength = directory.getUint16(position + 32, true);
+        const name = decoder.decode(new Uint8Array(
+            directory.buffer, directory.byteOffset + position + 46, nameLength));
+        entries.set(name, {
+            method: directory.getUint16(position + 10, true),
+            compressedSize: directory.getUint32(position + 20, true),
+            size: directory.getUint32(position + 24, true),
+            localOffset: directory.getUint32(position + 42, true),
+        });
+        position += 46 + nameLength + extraLength + commentLength;
+    }
+    return { blob, entries };
+}
+
+// Uncompressed content of a member as a ReadableStream (null if absent)
+async function zipMemberStream(archive, name) {
+    const entry = archive.entries.get(name);
+    if (!entry) return null;
+
+    const header = await readZipBytes(archive.blob, entry.localOffset, entry.localOffset + 30);
+    if (header.getUint32(0, true) !== ZIP_LOCAL_SIGNATURE) throw new Error(`Corrupt ZIP member: ${name}`);
+    const start = entry.localOffset + 30 + header.getUint16(26, true) + header.getUint16(28, true);
+    const data = archive.blob.slice(start, start + entry.compressedSize).stream();
+
+    if (entry.method === 0) return data;
+    if (entry.method === 8) return data.pipeThrough(new DecompressionStream('deflate-raw'));
+    throw new Error(`Unsupported compression method ${entry.method} for ${name}`);
+}
+
+// Uncompressed content of a member as a Uint8Array (null if absent)
+async function readZipMember(archive, name) {
+    const stream = await zipMemberStream(archive, name);
+    if (!stream) return null;
+    return new Uint8Array(await new Response(stream).arrayBuffer());
+}
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+EPI Artifact Capture Benchmark
+
+Times a session that captures one large artifact: log_artifact (capture +
+hash) and pack, for a compressible and an already-compressed file. The
+"copy2" rows replay the previous behaviour (shutil.copy2 into the
+recording, then hash and deflate at pack time) for comparison.
+
+Usage:
+    python scripts/benchmark_artifacts.py [--size-mb 512]
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+from unittest import mock
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from epi_core import container  # noqa: E402
+from epi_core.capture import CAPTURE_COPY, CapturedFile, fingerprint  # noqa: E402
+from epi_recorder.api import EpiRecorderSession  # noqa: E402
+
+
+def make_file(path: Path, size_mb: int, compressible: bool) -> None:
+    """Write a test artifact of size_mb MB"""
+    block = (b"epoch loss accuracy\n" * 52429)[:1024 * 1024] if compressible else None
+    with open(path, "wb") as f:
+        for _ in range(size_mb):
+            f.write(block if compressible else os.urandom(1024 * 1024))
+
+
+def legacy_capture(source: Path, dest: Path, hardlink: bool = False) -> CapturedFile:
+    """shutil.copy2 without a capture hash (pack hashes the file itself)"""
+    shutil.copy2(source, dest)
+    size, mtime_ns = fingerprint(dest)
+    return CapturedFile("", size, mtime_ns, CAPTURE_COPY)
+
+
+def run(source: Path, legacy: bool) -> tuple:
+    """Record one session capturing source; return (capture s, total s)"""
+    with tempfile.TemporaryDirectory(dir=source.parent) as tmp:
+        patches = []
+        if legacy:
+            patches = [
+                mock.patch("epi_recorder.api.capture_file", legacy_capture),
+                mock.patch.object(container, "is_precompressed", lambda name: False),
+                mock.patch.object(CapturedFile, "is_current", lambda self, path: False),
+            ]
+        for p in patches:
+            p.start()
+        try:
+            start = time.perf_counter()
+            with EpiRecorderSession(Path(tmp) / "bench.epi", auto_sign=False) as epi:
+                epi.log_artifact(source)
+                captured = time.perf_counter() - start
+            return captured, time.perf_counter() - start
+        finally:
+            for p in patches:
+                p.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark artifact capture and packing")
+    parser.add_argument("--size-mb", type=int, default=512, help="Artifact size in MB (default: 512)")
+    options = parser.parse_args()
+
+    print("=" * 60)
+    print("EPI ARTIFACT CAPTURE BENCHMARK")
+    print("=" * 60)
+    print(f"{'artifact':>18}{'path':>10}{'capture s':>12}{'total s':>10}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, compressible in (("metrics.log", True), ("model.parquet", False)):
+            source = Path(tmp) / name
+            make_file(source, options.size_mb, compressible)
+            for legacy in (True, False):
+                captured, total = run(source, legacy)
+                path = "copy2" if legacy else "capture"
+                print(f"{name:>18}{path:>10}{captured:>12.2f}{total:>10.2f}")
+            source.unlink()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+EPI Async Logging Benchmark
+
+Measures how long the event loop is held per logged step, for the sync
+log_step path and the async alog_step pipeline, across prompt sizes. A
+heartbeat task records the gaps between its wake-ups while steps
+are being logged, i.e. the event-loop stalls an agent would see.
+
+Usage:
+    python scripts/benchmark_async_logging.py [--sizes 1000 100000 1000000] [--steps 200]
+"""
+import argparse
+import asyncio
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from epi_recorder.api import EpiRecorderSession  # noqa: E402
+
+
+async def heartbeat(stalls: list, stop: asyncio.Event):
+    """Record the gaps between wake-ups (ms)"""
+    last = time.perf_counter()
+    while not stop.is_set():
+        await asyncio.sleep(0)
+        now = time.perf_counter()
+        stalls.append((now - last) * 1000)
+        last = now
+
+
+async def run(size: int, steps: int, use_async: bool) -> tuple:
+    """Log steps with a prompt of `size` chars, return (seconds, p50/p99/max stall ms)"""
+    prompt = "lorem ipsum " * (size // 12)
+    with tempfile.TemporaryDirectory() as tmp:
+        async with EpiRecorderSession(Path(tmp) / "bench.epi", auto_sign=False) as epi:
+            stalls, stop = [], asyncio.Event()
+            beat = asyncio.create_task(heartbeat(stalls, stop))
+            await asyncio.sleep(0)
+
+            start = time.perf_counter()
+            for i in range(steps):
+                content = {"messages": [{"role": "user", "content": prompt}], "i": i}
+                if use_async:
+                    await epi.alog_step("llm.request", content)
+                else:
+                    epi.log_step("llm.request", content)
+                await asyncio.sleep(0)
+            await epi.aflush()
+            elapsed = time.perf_counter() - start
+
+            stop.set()
+            await beat
+    stalls.sort()
+    return elapsed, stalls[len(stalls) // 2], stalls[int(len(stalls) * 0.99)], stalls[-1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark event-loop stalls from step logging")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 100_000, 1_000_000],
+                        help="Prompt sizes in characters (default: 1000 100000 1000000)")
+    parser.add_argument("--steps", type=int, default=200, help="Steps per run (default: 200)")
+    options = parser.parse_args()
+
+    print("=" * 60)
+    print("EPI ASYNC LOGGING BENCHMARK")
+    print("=" * 60)
+    print(f"{'prompt':>10}{'path':>12}{'seconds':>10}{'p50 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+
+    for size in options.sizes:
+        for use_async in (False, True):
+            elapsed, p50, p99, worst = asyncio.run(run(size, options.steps, use_async))
+            path = "alog_step" if use_async else "log_step"
+            print(f"{size:>10}{path:>12}{elapsed:>10.2f}{p50:>10.2f}{p99:>10.2f}{worst:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+EPI CLI Startup Benchmark
+
+Measures wall-clock time of short `epi` invocations, where interpreter
+start-up and imports dominate:
+
+    epi --help
+    epi ls
+    epi verify <file.epi>
+
+Each command runs in a fresh interpreter (python -m epi_cli.main ...) from
+a scratch directory holding one unsigned recording, so results are
+comparable across checkouts.
+
+Usage:
+    python scripts/benchmark_cli_startup.py [--runs N]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+
+def make_recording(workdir: Path) -> Path:
+    """Pack a small .epi into workdir/epi-recordings/ and return its path"""
+    sys.path.insert(0, str(PROJECT_ROOT))
+    from epi_core.container import EPIContainer
+    from epi_core.schemas import ManifestModel
+
+    source = workdir / "source"
+    source.mkdir()
+    (source / "steps.jsonl").write_text(
+        '{"index": 0, "timestamp": "2025-01-01T00:00:00", "kind": "session.start", "content": {}}\n',
+        encoding="utf-8",
+    )
+
+    recordings = workdir / "epi-recordings"
+    recordings.mkdir()
+    epi_path = recordings / "bench.epi"
+    EPIContainer.pack(source, ManifestModel(cli_command="benchmark"), epi_path)
+    return epi_path
+
+
+def time_command(args, cwd: Path, env: dict, runs: int) -> list:
+    """Run `python -m epi_cli.main <args>` repeatedly, return timings in ms"""
+    cmd = [sys.executable, "-m", "epi_cli.main"] + args
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(cmd, cwd=cwd, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark epi CLI startup time")
+    parser.add_argument("--runs", type=int, default=10, help="Runs per command (default: 10)")
+    options = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        epi_path = make_recording(workdir)
+
+        env = os.environ.copy()
+        env["PYTHONPATH"] = str(PROJECT_ROOT)
+        # Keep key generation out of the measurement
+        env["HOME"] = str(workdir)
+        env["USERPROFILE"] = str(workdir)
+        subprocess.run(
+            [sys.executable, "-m", "epi_cli.main", "keys", "list"],
+            cwd=workdir, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+
+        commands = [
+            ("epi --help", ["--help"]),
+            ("epi ls", ["ls"]),
+            ("epi verify", ["verify", str(epi_path)]),
+        ]
+
+        python_only = []
+        for _ in range(options.runs):
+            start = time.perf_counter()
+            subprocess.run([sys.executable, "-c", "pass"])
+            python_only.append((time.perf_counter() - start) * 1000)
+
+        print("=" * 60)
+        print("EPI CLI STARTUP BENCHMARK")
+        print("=" * 60)
+        print(f"{'command':<16}{'min ms':>10}{'median ms':>12}{'max ms':>10}")
+        print(f"{'python -c pass':<16}{min(python_only):>10.1f}"
+              f"{statistics.median(python_only):>12.1f}{max(python_only):>10.1f}")
+        for label, args in commands:
+            timings = time_command(args, workdir, env, options.runs)
+            print(f"{label:<16}{min(timings):>10.1f}"
+                  f"{statistics.median(timings):>12.1f}{max(timings):>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+EPI Concurrent Recording Benchmark
+
+Records steps from many threads into one RecordingContext (the pattern of
+an agent fanning tool/LLM calls out on a ThreadPoolExecutor) and reports
+throughput for write-through and buffered journals. Every run also checks
+the ordering guarantee: steps.jsonl must hold indices 0..N-1 exactly once,
+in ascending order, and each thread's steps in program order.
+
+Usage:
+    python scripts/benchmark_concurrent_steps.py [--threads 16 32] [--steps 2000]
+"""
+import argparse
+import json
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from epi_recorder.patcher import RecordingContext  # noqa: E402
+
+
+def record(threads: int, steps_per_thread: int, buffered: bool) -> float:
+    """Record threads x steps_per_thread steps, verify the file, return seconds"""
+    with tempfile.TemporaryDirectory() as tmp:
+        ctx = RecordingContext(Path(tmp), enable_redaction=False, buffered=buffered)
+
+        def worker(worker_id: int):
+            for i in range(steps_per_thread):
+                ctx.add_step("llm.request", {
+                    "worker": worker_id,
+                    "seq": i,
+                    "messages": [{"role": "user", "content": "x" * 200}],
+                })
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            list(pool.map(worker, range(threads)))
+        ctx.close()
+        elapsed = time.perf_counter() - start
+
+        steps = [json.loads(line) for line in ctx.steps_file.read_text(encoding="utf-8").splitlines()]
+        total = threads * steps_per_thread
+        assert [s["index"] for s in steps] == list(range(total)), "indices not 0..N-1 in order"
+
+        last_seq = {}
+        for s in steps:
+            worker_id, seq = s["content"]["worker"], s["content"]["seq"]
+            assert seq == last_seq.get(worker_id, -1) + 1, "per-thread order broken"
+            last_seq[worker_id] = seq
+
+        return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark concurrent step recording")
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 4, 16, 32],
+                        help="Thread counts to run (default: 1 4 16 32)")
+    parser.add_argument("--steps", type=int, default=2000, help="Steps per thread (default: 2000)")
+    options = parser.parse_args()
+
+    print("=" * 60)
+    print("EPI CONCURRENT RECORDING BENCHMARK")
+    print("=" * 60)
+    print(f"{'threads':>8}{'mode':>16}{'steps':>10}{'seconds':>10}{'steps/s':>12}")
+
+    for threads in options.threads:
+        for buffered in (False, True):
+            elapsed = record(threads, options.steps, buffered)
+            total = threads * options.steps
+            mode = "buffered" if buffered else "write-through"
+            print(f"{threads:>8}{mode:>16}{total:>10}{elapsed:>10.2f}{total / elapsed:>12.0f}")
+
+    print("[OK] Ordering guarantee held for every run")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+EPI Concurrent Sessions Benchmark
+
+Runs many short recording sessions at once - the pattern of a server that
+records every request as its own .epi - as asyncio tasks on one event loop
+and as threads, and reports completed sessions per second (target: 500/s).
+Every run also checks isolation: each .epi must contain the steps of its
+own request and nothing else.
+
+Usage:
+    python scripts/benchmark_sessions.py [--sessions 1000] [--concurrency 100] [--steps 5]
+"""
+import argparse
+import asyncio
+import json
+import sys
+import tempfile
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from epi_recorder.api import record  # noqa: E402
+from epi_recorder.patcher import get_recording_context  # noqa: E402
+
+
+def log_request_steps(request_id: int, steps: int) -> None:
+    """Log steps through the ambient recording context (as wrappers do)"""
+    for i in range(steps):
+        get_recording_context().add_step("llm.request", {
+            "request_id": request_id,
+            "seq": i,
+            "messages": [{"role": "user", "content": f"request {request_id}"}],
+        })
+
+
+def run_async(out_dir: Path, sessions: int, concurrency: int, steps: int) -> float:
+    """Record sessions as asyncio tasks, return seconds"""
+    async def one(request_id: int, limit: asyncio.Semaphore):
+        async with limit:
+            async with record(out_dir / f"async_{request_id}.epi", auto_sign=False, redact=False):
+                log_request_steps(request_id, steps)
+                await asyncio.sleep(0)
+
+    async def main():
+        limit = asyncio.Semaphore(concurrency)
+        await asyncio.gather(*(one(n, limit) for n in range(sessions)))
+
+    start = time.perf_counter()
+    asyncio.run(main())
+    return time.perf_counter() - start
+
+
+def run_threads(out_dir: Path, sessions: int, concurrency: int, steps: int) -> float:
+    """Record sessions on a thread pool, return seconds"""
+    def one(request_id: int):
+        with record(out_dir / f"thread_{request_id}.epi", auto_sign=False, redact=False):
+            log_request_steps(request_id, steps)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(one, range(sessions)))
+    return time.perf_counter() - start
+
+
+def check_isolation(out_dir: Path, prefix: str, sessions: int, steps: int) -> None:
+    """Every .epi must hold exactly its own request's steps, in order"""
+    for request_id in range(sessions):
+        with zipfile.ZipFile(out_dir / f"{prefix}_{request_id}.epi") as zf:
+            lines = zf.read("steps.jsonl").decode("utf-8").splitlines()
+        content = [json.loads(line)["content"] for line in lines]
+        requests = [c for c in content if "request_id" in c]
+        assert [c["request_id"] for c in requests] == [request_id] * steps, "cross-talk between sessions"
+        assert [c["seq"] for c in requests] == list(range(steps)), "session order broken"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark concurrent recording sessions")
+    parser.add_argument("--sessions", type=int, default=1000, help="Sessions per run (default: 1000)")
+    parser.add_argument("--concurrency", type=int, default=100,
+                        help="Sessions open at the same time (default: 100)")
+    parser.add_argument("--steps", type=int, default=5, help="Steps per session (default: 5)")
+    options = parser.parse_args()
+
+    print("=" * 60)
+    print("EPI CONCURRENT SESSIONS BENCHMARK")
+    print("=" * 60)
+    print(f"{'mode':>10}{'sessions':>10}{'open':>8}{'seconds':>10}{'sessions/s':>14}")
+
+    for mode, runner in (("asyncio", run_async), ("threads", run_threads)):
+        with tempfile.TemporaryDirectory() as tmp:
+            out_dir = Path(tmp)
+            elapsed = runner(out_dir, options.sessions, options.concurrency, options.steps)
+            check_isolation(out_dir, "async" if mode == "asyncio" else "thread",
+                            options.sessions, options.steps)
+            print(f"{mode:>10}{options.sessions:>10}{options.concurrency:>8}"
+                  f"{elapsed:>10.2f}{options.sessions / elapsed:>14.0f}")
+
+    print("[OK] No cross-talk between sessions")
+
+
+if __name__ == "__main__":
+    main()
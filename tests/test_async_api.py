@@ -0,0 +1,342 @@
+"""
+Tests for async step logging (epi_recorder.async_api)
+"""
+
+import asyncio
+import json
+import tempfile
+import threading
+import time
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from epi_recorder.api import EpiRecorderSession
+from epi_recorder.async_api import AsyncStepPipeline, record_async
+
+
+def read_steps(output_path):
+    with zipfile.ZipFile(output_path) as zf:
+        return [json.loads(l) for l in zf.read("steps.jsonl").decode().splitlines()]
+
+
+class GatedWriter:
+    """write_step that records calls and can be held back."""
+
+    def __init__(self):
+        self.gate = threading.Event()
+        self.gate.set()
+        self.steps = []
+        self.threads = set()
+
+    def __call__(self, kind, content, timestamp):
+        self.gate.wait(5)
+        self.threads.add(threading.get_ident())
+        self.steps.append((kind, content["i"]))
+
+
+class TestAsyncStepPipeline:
+    """Test queueing, batching and backpressure."""
+
+    def test_writes_in_order_off_the_loop(self):
+        writer = GatedWriter()
+
+        async def main():
+            pipeline = AsyncStepPipeline(writer)
+            for i in range(100):
+                await pipeline.submit("custom.event", {"i": i})
+            await pipeline.aclose()
+            return threading.get_ident()
+
+        loop_thread = asyncio.run(main())
+
+        assert [i for _, i in writer.steps] == list(range(100))
+        assert loop_thread not in writer.threads
+
+    def test_batches_everything_queued_per_hop(self):
+        writer = GatedWriter()
+        hops = []
+
+        async def main():
+            pipeline = AsyncStepPipeline(writer)
+            original = pipeline._write_batch
+            pipeline._write_batch = lambda batch: (hops.append(len(batch)), original(batch))
+            for i in range(50):
+                await pipeline.submit("custom.event", {"i": i})
+            await pipeline.aclose()
+
+        asyncio.run(main())
+
+        # Submitting without yielding queues everything for a single hop
+        assert hops == [50]
+
+    def test_block_waits_for_space(self):
+        writer = GatedWriter()
+        writer.gate.clear()
+
+        async def main():
+            pipeline = AsyncStepPipeline(writer, max_queued=2, backpressure="block")
+            await pipeline.submit("custom.event", {"i": 0})
+            await asyncio.sleep(0.05)  # first step is now held by the writer
+            await pipeline.submit("custom.event", {"i": 1})
+            await pipeline.submit("custom.event", {"i": 2})
+
+            third = asyncio.ensure_future(pipeline.submit("custom.event", {"i": 3}))
+            await asyncio.sleep(0.05)
+            assert not third.done()
+
+            writer.gate.set()
+            await asyncio.wait_for(third, 5)
+            await pipeline.aclose()
+
+        asyncio.run(main())
+        assert [i for _, i in writer.steps] == [0, 1, 2, 3]
+
+    def test_drop_oldest_discards_queued_steps(self):
+        writer = GatedWriter()
+        writer.gate.clear()
+
+        async def main():
+            pipeline = AsyncStepPipeline(writer, max_queued=3, backpressure="drop-oldest")
+            await pipeline.submit("custom.event", {"i": 0})
+            await asyncio.sleep(0.05)
+            for i in range(1, 10):
+                await pipeline.submit("custom.event", {"i": i})
+            writer.gate.set()
+            await pipeline.aclose()
+            return pipeline.dropped
+
+        dropped = asyncio.run(main())
+
+        assert dropped == 6
+        assert [i for _, i in writer.steps] == [0, 7, 8, 9]
+
+    def test_spill_keeps_every_step_in_order(self):
+        writer = GatedWriter()
+        writer.gate.clear()
+
+        async def main():
+            pipeline = AsyncStepPipeline(writer, max_queued=4, backpressure="spill")
+            await pipeline.submit("custom.event", {"i": 0})
+            await asyncio.sleep(0.05)
+            for i in range(1, 50):
+                await pipeline.submit("custom.event", {"i": i})
+            spilled = pipeline.spilled
+            writer.gate.set()
+            await pipeline.join()
+            # Queue is usable again after the spill was replayed
+            await pipeline.submit("custom.event", {"i": 50})
+            await pipeline.aclose()
+            return spilled
+
+        spilled = asyncio.run(main())
+
+        assert spilled == 45
+        assert [i for _, i in writer.steps] == list(range(51))
+
+    def test_spill_is_written_off_the_event_loop(self):
+        writer = GatedWriter()
+        writer.gate.clear()
+        spill_threads = set()
+
+        async def main():
+            pipeline = AsyncStepPipeline(writer, max_queued=2, backpressure="spill")
+            original = pipeline._append_spill
+            pipeline._append_spill = lambda item: (spill_threads.add(threading.get_ident()), original(item))
+
+            # Two overload episodes, each spilled and replayed in order
+            for episode in range(2):
+                writer.gate.clear()
+                await pipeline.submit("custom.event", {"i": episode * 20})
+                await asyncio.sleep(0.05)
+                for i in range(episode * 20 + 1, episode * 20 + 20):
+                    await pipeline.submit("custom.event", {"i": i})
+                writer.gate.set()
+                await pipeline.join()
+            await pipeline.aclose()
+            return threading.get_ident()
+
+        loop_thread = asyncio.run(main())
+
+        assert spill_threads and loop_thread not in spill_threads
+        assert [i for _, i in writer.steps] == list(range(40))
+
+    def test_sync_close_replays_spill(self):
+        writer = GatedWriter()
+        writer.gate.clear()
+
+        async def main():
+            pipeline = AsyncStepPipeline(writer, max_queued=2, backpressure="spill")
+            await pipeline.submit("custom.event", {"i": 0})
+            await asyncio.sleep(0.05)
+            for i in range(1, 10):
+                await pipeline.submit("custom.event", {"i": i})
+            writer.gate.set()
+            pipeline.close()
+
+        asyncio.run(main())
+        assert [i for _, i in writer.steps] == list(range(10))
+
+    def test_failed_step_is_kept_and_others_written(self):
+        def write_step(kind, content, timestamp):
+            if content["i"] == 1:
+                raise TypeError("not serializable")
+            written.append(content["i"])
+
+        written = []
+
+        async def main():
+            pipeline = AsyncStepPipeline(write_step)
+            for i in range(3):
+                await pipeline.submit("custom.event", {"i": i})
+            await pipeline.aclose()
+            return pipeline.error
+
+        error = asyncio.run(main())
+
+        assert isinstance(error, TypeError)
+        assert written == [0, 2]
+
+    def test_rejects_unknown_backpressure(self):
+        async def main():
+            AsyncStepPipeline(lambda *a: None, backpressure="later")
+
+        with pytest.raises(ValueError):
+            asyncio.run(main())
+
+
+class TestSessionAlogStep:
+    """Test EpiRecorderSession.alog_step on the async pipeline."""
+
+    def test_alog_steps_precede_session_end(self):
+        async def main(output_path):
+            async with EpiRecorderSession(output_path, auto_sign=False) as epi:
+                for i in range(20):
+                    await epi.alog_step("custom.event", {"i": i})
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            output_path = Path(tmpdir) / "async.epi"
+            asyncio.run(main(output_path))
+            steps = read_steps(output_path)
+
+        events = [s["content"]["i"] for s in steps if s["kind"] == "custom.event"]
+        assert events == list(range(20))
+        assert steps[-1]["kind"] == "session.end"
+        assert [s["index"] for s in steps] == list(range(len(steps)))
+
+    def test_redaction_runs_off_the_loop(self, monkeypatch):
+        from epi_recorder.patcher import RecordingContext
+
+        threads = set()
+        original = RecordingContext.add_step
+
+        def tracking_add_step(self, *args, **kwargs):
+            threads.add(threading.get_ident())
+            return original(self, *args, **kwargs)
+
+        monkeypatch.setattr(RecordingContext, "add_step", tracking_add_step)
+
+        async def main(output_path):
+            async with EpiRecorderSession(output_path, auto_sign=False) as epi:
+                threads.clear()
+                await epi.alog_step("custom.event", {"key": "sk-" + "a" * 48})
+                await epi.aflush()
+                return threading.get_ident()
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            output_path = Path(tmpdir) / "redacted.epi"
+            loop_thread = asyncio.run(main(output_path))
+            steps = read_steps(output_path)
+
+        assert threads and loop_thread not in threads
+        assert any(s["kind"] == "security.redaction" for s in steps)
+
+    def test_sync_exit_writes_queued_steps(self):
+        async def main(output_path):
+            with EpiRecorderSession(output_path, auto_sign=False) as epi:
+                for i in range(10):
+                    await epi.alog_step("custom.event", {"i": i})
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            output_path = Path(tmpdir) / "sync_exit.epi"
+            asyncio.run(main(output_path))
+            steps = read_steps(output_path)
+
+        events = [s["content"]["i"] for s in steps if s["kind"] == "custom.event"]
+        assert events == list(range(10))
+        assert steps[-1]["kind"] == "session.end"
+
+    def test_sync_exit_while_spill_is_handed_off(self, monkeypatch):
+        # Slow spill appends: the drain task is still waiting for the spill
+        # file when __exit__ closes the pipeline
+        append_spill = AsyncStepPipeline._append_spill
+
+        def slow_append_spill(self, item):
+            time.sleep(0.002)
+            append_spill(self, item)
+
+        monkeypatch.setattr(AsyncStepPipeline, "_append_spill", slow_append_spill)
+
+        async def main(output_path):
+            with EpiRecorderSession(output_path, auto_sign=False, max_queued=2, backpressure="spill") as epi:
+                for i in range(100):
+                    await epi.alog_step("custom.event", {"i": i})
+                await asyncio.sleep(0.05)
+                assert epi._pipeline.spilled == 98
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            output_path = Path(tmpdir) / "spill_exit.epi"
+            asyncio.run(main(output_path))
+            steps = read_steps(output_path)
+
+        events = [s["content"]["i"] for s in steps if s["kind"] == "custom.event"]
+        assert events == list(range(100))
+
+    def test_serialization_error_surfaces_on_next_call(self):
+        async def main(output_path):
+            async with EpiRecorderSession(output_path, auto_sign=False, redact=False) as epi:
+                await epi.alog_step("custom.bad", {"value": object()})
+                await epi.aflush()
+                with pytest.raises(Exception):
+                    await epi.alog_step("custom.event", {})
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            asyncio.run(main(Path(tmpdir) / "error.epi"))
+
+    def test_dropped_steps_are_recorded(self):
+        async def main(output_path):
+            async with EpiRecorderSession(
+                output_path, auto_sign=False, max_queued=1, backpressure="drop-oldest"
+            ) as epi:
+                for i in range(50):
+                    await epi.alog_step("custom.event", {"i": i})
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            output_path = Path(tmpdir) / "dropped.epi"
+            asyncio.run(main(output_path))
+            steps = read_steps(output_path)
+
+        events = [s for s in steps if s["kind"] == "custom.event"]
+        dropped = [s for s in steps if s["kind"] == "session.steps_dropped"]
+        assert dropped and len(events) + dropped[0]["content"]["count"] == 50
+
+    def test_rejects_unknown_backpressure(self):
+        with pytest.raises(ValueError):
+            EpiRecorderSession("x.epi", backpressure="later")
+
+
+class TestRecordAsync:
+    """Test AsyncRecorder on the shared pipeline."""
+
+    def test_backpressure_option(self):
+        async def run(tmpdir):
+            async with record_async("async_session", tmpdir, max_queued=2, backpressure="spill") as rec:
+                for i in range(100):
+                    await rec.record_step("custom.event", {"i": i})
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            asyncio.run(run(tmpdir))
+            lines = (Path(tmpdir) / "steps.jsonl").read_text().splitlines()
+
+        assert [json.loads(l)["content"]["i"] for l in lines] == list(range(100))
@@ -0,0 +1,167 @@
+"""
+Tests for content-addressed payload blobs (epi_core.blobs)
+"""
+
+import hashlib
+import json
+import tempfile
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from epi_core.blobs import BLOBS_DIRNAME, BlobReader, BlobWriter, is_blob_ref
+from epi_core.container import EPIContainer
+from epi_recorder.api import EpiRecorderSession
+
+
+LARGE = "retrieved document " * 2000
+
+
+def read_archive(output_path):
+    with zipfile.ZipFile(output_path) as zf:
+        steps = [json.loads(l) for l in zf.read("steps.jsonl").decode().splitlines()]
+        names = zf.namelist()
+        viewer = zf.read("viewer.html").decode("utf-8")
+        manifest = json.loads(zf.read("manifest.json"))
+    return steps, names, viewer, manifest
+
+
+class TestBlobWriter:
+    """Test moving large payloads out of step content."""
+
+    def test_large_values_become_references(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            writer = BlobWriter(Path(tmpdir), threshold=1024)
+            content = {"messages": [{"role": "user", "content": LARGE}, {"role": "system", "content": "hi"}]}
+
+            result = writer.externalize(content)
+
+            ref = result["messages"][0]["content"]
+            assert is_blob_ref(ref)
+            assert ref["type"] == "text"
+            assert ref["size"] == len(LARGE.encode("utf-8"))
+            assert result["messages"][1]["content"] == "hi"
+            # Input is left untouched
+            assert content["messages"][0]["content"] == LARGE
+
+            blob = Path(tmpdir) / BLOBS_DIRNAME / ref["$blob"]
+            assert blob.read_bytes() == LARGE.encode("utf-8")
+            assert ref["$blob"] == hashlib.sha256(blob.read_bytes()).hexdigest()
+
+    def test_small_content_is_returned_unchanged(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            writer = BlobWriter(Path(tmpdir), threshold=1024)
+            content = {"a": ["x" * 10, {"b": 1}]}
+            assert writer.externalize(content) is content
+            assert not (Path(tmpdir) / BLOBS_DIRNAME).exists()
+
+    def test_identical_payloads_are_stored_once(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            writer = BlobWriter(Path(tmpdir), threshold=1024)
+            first = writer.externalize({"text": LARGE})
+            second = writer.externalize({"history": [LARGE]})
+
+            assert first["text"] == second["history"][0]
+            assert len(list((Path(tmpdir) / BLOBS_DIRNAME).iterdir())) == 1
+
+    def test_bytes_payloads(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            writer = BlobWriter(Path(tmpdir), threshold=16)
+            data = bytes(range(256))
+            ref = writer.externalize({"image": data})["image"]
+
+            assert ref["type"] == "bytes"
+            assert BlobReader(Path(tmpdir)).resolve(ref) == data
+
+    def test_rejects_non_positive_threshold(self):
+        with pytest.raises(ValueError):
+            BlobWriter(Path("."), threshold=0)
+
+
+class TestBlobReader:
+    """Test resolving references from directories and archives."""
+
+    def test_resolve_from_directory(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            step = {"content": BlobWriter(Path(tmpdir), threshold=1024).externalize({"text": LARGE})}
+            assert BlobReader(Path(tmpdir)).resolve(step) == {"content": {"text": LARGE}}
+
+    def test_missing_blob_is_left_as_reference(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            ref = {"$blob": "0" * 64, "type": "text", "size": 1}
+            assert BlobReader(Path(tmpdir)).resolve({"text": ref}) == {"text": ref}
+
+    def test_malformed_digest_is_rejected(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with pytest.raises(KeyError):
+                BlobReader(Path(tmpdir)).read("../steps.jsonl")
+
+    def test_tampered_blob_is_detected(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            ref = BlobWriter(Path(tmpdir), threshold=1024).externalize({"text": LARGE})["text"]
+            (Path(tmpdir) / BLOBS_DIRNAME / ref["$blob"]).write_text("tampered")
+
+            with pytest.raises(ValueError):
+                BlobReader(Path(tmpdir)).read(ref["$blob"])
+
+
+class TestRecordedBlobs:
+    """Test blobs end to end through a recording session."""
+
+    def test_session_externalizes_and_packs_blobs(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            output_path = Path(tmpdir) / "rag.epi"
+            with EpiRecorderSession(output_path, auto_sign=False) as epi:
+                for _ in range(3):
+                    epi.log_step("llm.request", {"messages": [{"role": "user", "content": LARGE}]})
+
+            steps, names, viewer, manifest = read_archive(output_path)
+
+            requests = [s for s in steps if s["kind"] == "llm.request"]
+            refs = [s["content"]["messages"][0]["content"] for s in requests]
+            assert all(is_blob_ref(r) for r in refs)
+            assert len({r["$blob"] for r in refs}) == 1
+
+            blob_name = f"{BLOBS_DIRNAME}/{refs[0]['$blob']}"
+            assert blob_name in names
+            assert blob_name in manifest["file_manifest"]
+            assert 'id="epi-blobs"' in viewer
+            assert EPIContainer.verify_integrity(output_path)[0]
+
+            with BlobReader(output_path) as blobs:
+                assert blobs.resolve(requests[0])["content"]["messages"][0]["content"] == LARGE
+
+    def test_secrets_are_redacted_before_externalizing(self):
+        secret = "sk-" + "a" * 48
+        with tempfile.TemporaryDirectory() as tmpdir:
+            output_path = Path(tmpdir) / "secret.epi"
+            with EpiRecorderSession(output_path, auto_sign=False) as epi:
+                epi.log_step("llm.request", {"prompt": LARGE + secret})
+
+            with zipfile.ZipFile(output_path) as zf:
+                blobs = [n for n in zf.namelist() if n.startswith(f"{BLOBS_DIRNAME}/")]
+                assert blobs
+                assert all(secret.encode() not in zf.read(n) for n in blobs)
+
+    def test_threshold_none_keeps_payloads_inline(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            output_path = Path(tmpdir) / "inline.epi"
+            with EpiRecorderSession(output_path, auto_sign=False, blob_threshold=None) as epi:
+                epi.log_step("llm.request", {"prompt": LARGE})
+
+            steps, names, _, _ = read_archive(output_path)
+            assert [s["content"]["prompt"] for s in steps if s["kind"] == "llm.request"] == [LARGE]
+            assert not any(n.startswith(f"{BLOBS_DIRNAME}/") for n in names)
+
+    def test_detector_sees_resolved_payloads(self):
+        from epi_analyzer.detector import MistakeDetector
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            output_path = Path(tmpdir) / "detect.epi"
+            with EpiRecorderSession(output_path, auto_sign=False) as epi:
+                epi.log_step("llm.request", {"messages": [{"role": "user", "content": LARGE}]})
+
+            detector = MistakeDetector(str(output_path))
+            requests = [s for s in detector.steps if s["type"] == "llm.request"]
+            assert requests[0]["content"]["messages"][0]["content"] == LARGE
@@ -1,12 +1,53 @@
 """
 Simple functional tests for bootstrap module
 """
+import json
+import os
+import subprocess
+import sys
+
 import pytest
 from pathlib import Path
 from unittest.mock import patch, MagicMock
+from epi_recorder import bootstrap
 from epi_recorder.bootstrap import initialize_recording
 
 
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# Modules the recorder core must never pull in at startup
+HEAVY_MODULES = [
+    "pandas",
+    "matplotlib",
+    "epi_recorder.analytics.engine",
+    "epi_recorder.wrappers.openai",
+    "epi_recorder.integrations.langgraph",
+    "epi_recorder.api",
+]
+
+
+@pytest.fixture(autouse=True)
+def reset_bootstrap():
+    """Each test starts with recording not yet initialized"""
+    bootstrap._initialized = False
+    yield
+    bootstrap._initialized = False
+
+
+def run_import_probe(code, env_overrides=None):
+    """Run code in a fresh interpreter and return its JSON output"""
+    env = os.environ.copy()
+    env.pop("EPI_RECORD", None)
+    env.update(env_overrides or {})
+    env["PYTHONPATH"] = str(PROJECT_ROOT)
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True, text=True, env=env, cwd=str(PROJECT_ROOT), timeout=60
+    )
+    assert result.returncode == 0, result.stderr
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
 class TestBootstrapInitialization:
     """Test bootstrap initialization"""
     
@@ -56,4 +97,69 @@ class TestBootstrapInitialization:
 
 
 
- 
\ No newline at end of file
+ 
+
+    def test_initialize_recording_is_idempotent(self, tmp_path, monkeypatch):
+        """Test that a second call (sitecustomize + auto-init) does nothing"""
+        steps_dir = tmp_path / "steps"
+        steps_dir.mkdir()
+
+        monkeypatch.setenv('EPI_RECORD', '1')
+        monkeypatch.setenv('EPI_STEPS_DIR', str(steps_dir))
+
+        with patch('epi_recorder.patcher.RecordingContext') as context_cls, \
+             patch('epi_recorder.patcher.set_recording_context'), \
+             patch('epi_recorder.patcher.patch_all') as patch_all:
+
+            initialize_recording()
+            initialize_recording()
+
+        assert context_cls.call_count == 1
+        assert patch_all.call_count == 1
+
+
+class TestImportBudget:
+    """Startup cost of `import epi_recorder` and the bootstrap"""
+
+    PROBE = (
+        "import sys, json\n"
+        "import epi_recorder, epi_recorder.bootstrap\n"
+        "print(json.dumps({'modules': sorted(sys.modules)}))\n"
+    )
+
+    def test_import_loads_no_heavy_modules(self):
+        """Test that importing the package does not load analytics/wrappers"""
+        probe = run_import_probe(self.PROBE)
+        loaded = set(probe["modules"])
+        for name in HEAVY_MODULES:
+            assert name not in loaded, f"{name} imported at startup"
+
+    def test_import_without_recording_skips_core(self):
+        """Test that the bare package import stays within budget (no recorder core)"""
+        probe = run_import_probe(self.PROBE)
+        # Without recording enabled, nothing beyond the package itself loads
+        assert "epi_core.schemas" not in probe["modules"]
+
+    def test_bootstrap_with_recording_loads_core_only(self, tmp_path):
+        """Test that an active bootstrap loads the recorder core only"""
+        probe = run_import_probe(
+            self.PROBE,
+            {"EPI_RECORD": "1", "EPI_STEPS_DIR": str(tmp_path)}
+        )
+        loaded = set(probe["modules"])
+        assert "epi_recorder.patcher" in loaded
+        for name in HEAVY_MODULES:
+            assert name not in loaded, f"{name} imported by bootstrap"
+
+    def test_lazy_attributes_resolve(self):
+        """Test that public names still import on first use"""
+        from epi_recorder import record, EpiRecorderSession, wrap_openai, TracedOpenAI
+        from epi_recorder.wrappers import wrap_anthropic
+        import epi_recorder
+
+        assert callable(record)
+        assert callable(wrap_openai)
+        assert callable(wrap_anthropic)
+        assert "AgentAnalytics" in dir(epi_recorder)
+        with pytest.raises(AttributeError):
+            epi_recorder.does_not_exist
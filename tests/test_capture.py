@@ -0,0 +1,182 @@
+"""
+Tests for artifact capture (epi_core.capture) and its use by pack
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from epi_core import capture
+from epi_core.capture import (
+    CAPTURE_COPY,
+    CAPTURE_HARDLINK,
+    CapturedFile,
+    capture_file,
+    fingerprint,
+    is_precompressed,
+)
+from epi_core.container import EPIContainer
+from epi_core.schemas import ManifestModel
+from epi_recorder.api import EpiRecorderSession
+
+
+DATA = os.urandom(3 * 1024 * 1024 + 17)
+
+
+def make_source(tmpdir, name="model.bin", data=DATA):
+    path = Path(tmpdir) / name
+    path.write_bytes(data)
+    return path
+
+
+class TestCaptureFile:
+    """Test copying files into a recording."""
+
+    def test_copy_matches_source_and_hash(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            source = make_source(tmpdir)
+            dest = Path(tmpdir) / "dest.bin"
+
+            captured = capture_file(source, dest)
+
+            assert dest.read_bytes() == DATA
+            assert captured.sha256 == hashlib.sha256(DATA).hexdigest()
+            assert captured.size == len(DATA)
+            assert not os.path.samefile(source, dest)
+            # Timestamps preserved like shutil.copy2
+            assert dest.stat().st_mtime_ns == source.stat().st_mtime_ns
+
+    def test_user_space_fallback(self, monkeypatch):
+        monkeypatch.setattr(capture, "_reflink", lambda src, dest: False)
+        monkeypatch.setattr(capture, "_copy_file_range", lambda src, dest, size: False)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            source = make_source(tmpdir)
+            dest = Path(tmpdir) / "dest.bin"
+
+            captured = capture_file(source, dest)
+
+            assert captured.method == CAPTURE_COPY
+            assert dest.read_bytes() == DATA
+            assert captured.sha256 == hashlib.sha256(DATA).hexdigest()
+
+    def test_empty_file(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            source = make_source(tmpdir, data=b"")
+            captured = capture_file(source, Path(tmpdir) / "dest.bin")
+            assert captured.sha256 == hashlib.sha256(b"").hexdigest()
+
+    def test_hardlink_is_opt_in(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            source = make_source(tmpdir)
+            dest = Path(tmpdir) / "dest.bin"
+
+            captured = capture_file(source, dest, hardlink=True)
+
+            assert captured.method == CAPTURE_HARDLINK
+            assert os.path.samefile(source, dest)
+            assert captured.sha256 == hashlib.sha256(DATA).hexdigest()
+
+    def test_replaces_existing_destination(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            source = make_source(tmpdir, data=b"new")
+            dest = Path(tmpdir) / "dest.bin"
+            dest.write_bytes(b"old content that is longer")
+
+            capture_file(source, dest)
+            assert dest.read_bytes() == b"new"
+
+    def test_is_current_detects_changes(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            dest = Path(tmpdir) / "dest.bin"
+            captured = capture_file(make_source(tmpdir), dest)
+            assert captured.is_current(dest)
+
+            dest.write_bytes(b"changed")
+            assert not captured.is_current(dest)
+
+    def test_precompressed_suffixes(self):
+        assert is_precompressed("artifacts/data.parquet")
+        assert is_precompressed("plot.PNG")
+        assert is_precompressed("logs.tar.gz")
+        assert not is_precompressed("steps.jsonl")
+        assert not is_precompressed("blobs/" + "0" * 64)
+
+
+class TestPackWithCapturedHashes:
+    """Test that pack reuses capture hashes and stores compressed formats."""
+
+    def test_known_hash_is_used_while_file_is_unchanged(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            source_dir = Path(tmpdir) / "src"
+            (source_dir / "artifacts").mkdir(parents=True)
+            artifact = source_dir / "artifacts" / "out.bin"
+            artifact.write_bytes(b"payload")
+
+            # A deliberately wrong hash proves pack did not re-read to hash
+            size, mtime_ns = fingerprint(artifact)
+            known = {"artifacts/out.bin": CapturedFile("f" * 64, size, mtime_ns, CAPTURE_COPY)}
+
+            output = Path(tmpdir) / "out.epi"
+            manifest = ManifestModel()
+            EPIContainer.pack(source_dir, manifest, output, known_hashes=known)
+            assert manifest.file_manifest["artifacts/out.bin"] == "f" * 64
+
+    def test_stale_known_hash_is_ignored(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            source_dir = Path(tmpdir) / "src"
+            (source_dir / "artifacts").mkdir(parents=True)
+            artifact = source_dir / "artifacts" / "out.bin"
+            artifact.write_bytes(b"payload")
+            known = {"artifacts/out.bin": CapturedFile("f" * 64, 1, 0, CAPTURE_COPY)}
+
+            manifest = ManifestModel()
+            EPIContainer.pack(source_dir, manifest, Path(tmpdir) / "out.epi", known_hashes=known)
+            assert manifest.file_manifest["artifacts/out.bin"] == hashlib.sha256(b"payload").hexdigest()
+
+    def test_precompressed_files_are_stored(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            source_dir = Path(tmpdir) / "src"
+            source_dir.mkdir()
+            (source_dir / "image.png").write_bytes(DATA)
+            (source_dir / "notes.txt").write_text("text " * 1000)
+
+            output = Path(tmpdir) / "out.epi"
+            EPIContainer.pack(source_dir, ManifestModel(), output)
+
+            with zipfile.ZipFile(output) as zf:
+                assert zf.getinfo("image.png").compress_type == zipfile.ZIP_STORED
+                assert zf.getinfo("notes.txt").compress_type == zipfile.ZIP_DEFLATED
+            assert EPIContainer.verify_integrity(output)[0]
+
+
+class TestSessionArtifacts:
+    """Test log_artifact end to end."""
+
+    @pytest.mark.parametrize("hardlink", [False, True])
+    def test_artifact_hash_reaches_step_and_manifest(self, hardlink):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            source = make_source(tmpdir, "results.parquet")
+            output = Path(tmpdir) / "artifact.epi"
+
+            with EpiRecorderSession(output, auto_sign=False) as epi:
+                epi.log_artifact(source, hardlink=hardlink)
+
+            digest = hashlib.sha256(DATA).hexdigest()
+            with zipfile.ZipFile(output) as zf:
+                manifest = json.loads(zf.read("manifest.json"))
+                steps = [json.loads(l) for l in zf.read("steps.jsonl").decode().splitlines()]
+                assert zf.read("artifacts/results.parquet") == DATA
+                assert zf.getinfo("artifacts/results.parquet").compress_type == zipfile.ZIP_STORED
+
+            assert manifest["file_manifest"]["artifacts/results.parquet"] == digest
+            captured = [s for s in steps if s["kind"] == "artifact.captured"]
+            assert captured[0]["content"]["sha256"] == digest
+            assert EPIContainer.verify_integrity(output)[0]
+            # The source is left alone
+            assert source.read_bytes() == DATA
@@ -0,0 +1,95 @@
+"""
+Tests for lazy subcommand loading in the epi CLI
+"""
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from typer.testing import CliRunner
+
+from epi_cli.main import app, EpiCommandGroup
+
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+runner = CliRunner()
+
+SUBCOMMAND_MODULES = [
+    "epi_cli.run",
+    "epi_cli.verify",
+    "epi_cli.record",
+    "epi_cli.view",
+    "epi_cli.ls",
+    "epi_cli.chat",
+    "epi_cli.debug",
+    "epi_cli.install",
+]
+
+
+def loaded_modules(code):
+    """Run code in a fresh interpreter and return the names in sys.modules"""
+    env = os.environ.copy()
+    env["PYTHONPATH"] = str(PROJECT_ROOT)
+    result = subprocess.run(
+        [sys.executable, "-c", code + "\nimport sys, json; print(json.dumps(sorted(sys.modules)))"],
+        capture_output=True, text=True, env=env, cwd=str(PROJECT_ROOT), timeout=60
+    )
+    assert result.returncode == 0, result.stderr
+    return set(json.loads(result.stdout.strip().splitlines()[-1]))
+
+
+class TestLazyCommandRegistry:
+    """Test that subcommand modules load only when invoked"""
+
+    def test_registry_covers_subcommands(self):
+        """Test that every subcommand module is registered"""
+        targets = {target.split(":")[0] for target, _ in EpiCommandGroup.lazy_commands.values()}
+        assert targets == set(SUBCOMMAND_MODULES)
+
+    def test_importing_main_loads_no_subcommands(self):
+        """Test that importing the CLI app imports no subcommand module"""
+        loaded = loaded_modules("import epi_cli.main")
+        for name in SUBCOMMAND_MODULES:
+            assert name not in loaded, f"{name} imported at startup"
+        assert "epi_core.container" not in loaded
+        assert "cryptography" not in loaded
+
+    def test_help_lists_lazy_commands_without_loading(self):
+        """Test that --help shows every command from placeholders"""
+        loaded = loaded_modules(
+            "from typer.testing import CliRunner\n"
+            "from epi_cli.main import app\n"
+            "result = CliRunner().invoke(app, ['--help'])\n"
+            "assert result.exit_code == 0, result.output\n"
+            "for name in ('run', 'verify', 'record', 'view', 'ls', 'chat', 'debug', 'global'):\n"
+            "    assert name in result.output, name\n"
+        )
+        for name in SUBCOMMAND_MODULES:
+            assert name not in loaded, f"{name} imported by --help"
+
+    def test_invoking_command_loads_only_its_module(self):
+        """Test that dispatching one command imports just that module"""
+        loaded = loaded_modules(
+            "from typer.testing import CliRunner\n"
+            "from epi_cli.main import app\n"
+            "result = CliRunner().invoke(app, ['verify', '--help'])\n"
+            "assert result.exit_code == 0, result.output\n"
+        )
+        assert "epi_cli.verify" in loaded
+        for name in SUBCOMMAND_MODULES:
+            if name != "epi_cli.verify":
+                assert name not in loaded, f"{name} imported by verify"
+
+    def test_lazy_subcommand_help(self):
+        """Test that loaded commands keep their registered help and options"""
+        result = runner.invoke(app, ["ls", "--help"])
+        assert result.exit_code == 0
+        assert "List local recordings" in result.output
+        assert "--reverify" in result.output
+
+        result = runner.invoke(app, ["global", "--help"])
+        assert result.exit_code == 0
+        assert "install" in result.output
+        assert "--install-completion" not in result.output
@@ -296,6 +296,40 @@ class TestEPIContainer:
         assert "test.txt" in mismatches
         assert "missing" in mismatches["test.txt"].lower()
     
+    def test_verify_integrity_does_not_extract(self, temp_workspace, sample_files, monkeypatch):
+        """Test that verification streams members instead of unpacking."""
+        output_path = temp_workspace / "test.epi"
+        EPIContainer.pack(sample_files, ManifestModel(cli_command="test command"), output_path)
+        
+        def no_unpack(*args, **kwargs):
+            raise AssertionError("verify_integrity must not extract the archive")
+        
+        monkeypatch.setattr(EPIContainer, "unpack", no_unpack)
+        
+        assert EPIContainer.verify_integrity(output_path) == (True, {})
+    
+    def test_verify_integrity_parallel_detects_tampering(self, temp_workspace, sample_files):
+        """Test parallel verification reports the same mismatches as sequential."""
+        import zipfile
+        
+        output_path = temp_workspace / "test.epi"
+        EPIContainer.pack(sample_files, ManifestModel(cli_command="test command"), output_path)
+        assert EPIContainer.verify_integrity(output_path, max_workers=4) == (True, {})
+        
+        tampered_path = temp_workspace / "tampered.epi"
+        with zipfile.ZipFile(output_path, "r") as zf_in:
+            with zipfile.ZipFile(tampered_path, "w") as zf_out:
+                for item in zf_in.namelist():
+                    data = b"Tampered" if item == "test.txt" else zf_in.read(item)
+                    zf_out.writestr(item, data)
+        
+        sequential = EPIContainer.verify_integrity(tampered_path)
+        parallel = EPIContainer.verify_integrity(tampered_path, max_workers=4)
+        
+        assert parallel == sequential
+        assert not parallel[0]
+        assert list(parallel[1]) == ["test.txt"]
+    
     def test_verify_integrity_with_nonexistent_file(self, temp_workspace):
         """Test verify_integrity with nonexistent .epi file."""
         fake_path = temp_workspace / "nonexistent.epi"
@@ -342,10 +376,199 @@ class TestEPIContainer:
         
         assert output_path.exists()
     
+    def test_embedded_viewer_data_is_valid_json(self, temp_workspace, sample_files):
+        """Test that streamed step lines form a valid embedded JSON document."""
+        import json
+        import re
+        
+        steps_file = sample_files / "steps.jsonl"
+        steps_file.write_text(
+            '{"index": 0, "kind": "test", "content": {}}\n'
+            '{invalid json}\n'
+            '{"index": 2, "kind": "test2", "content": {"x": "</b>"}}\n'
+        )
+        
+        output_path = temp_workspace / "test.epi"
+        manifest = ManifestModel(cli_command="test command")
+        EPIContainer.pack(sample_files, manifest, output_path)
+        
+        extract_dir = EPIContainer.unpack(output_path)
+        viewer_html = (extract_dir / "viewer.html").read_text()
+        match = re.search(
+            r'<script id="epi-data" type="application/json">(.*?)</script>',
+            viewer_html,
+            re.DOTALL
+        )
+        data = json.loads(match.group(1))
+        match = re.search(
+            r'<script id="epi-steps" type="application/x-ndjson">(.*?)</script>',
+            viewer_html,
+            re.DOTALL
+        )
+        steps = [json.loads(line) for line in match.group(1).split("\n")]
+        
+        assert [s["index"] for s in steps] == [0, 2]
+        assert steps[1]["content"]["x"] == "</b>"
+        assert "</b>" not in match.group(1)
+        assert data["manifest"]["file_manifest"] == manifest.file_manifest
+    
+    def test_embedded_viewer_gzips_large_step_payloads(self, temp_workspace, sample_files):
+        """Test that long recordings embed compact, gzipped step lines."""
+        import base64
+        import gzip
+        import json
+        import re
+        
+        steps = [
+            {"index": i, "kind": "tool.call", "content": {"name": "search", "query": f"query {i}"}}
+            for i in range(20000)
+        ]
+        steps_file = sample_files / "steps.jsonl"
+        steps_file.write_text("".join(json.dumps(s, indent=None) + "\n" for s in steps))
+        
+        output_path = temp_workspace / "test.epi"
+        EPIContainer.pack(sample_files, ManifestModel(), output_path, viewer_mode="full")
+        
+        extract_dir = EPIContainer.unpack(output_path)
+        viewer_html = (extract_dir / "viewer.html").read_text()
+        match = re.search(
+            r'<script id="epi-steps" type="application/x-ndjson" data-encoding="gzip">(.*?)</script>',
+            viewer_html,
+            re.DOTALL
+        )
+        lines = gzip.decompress(base64.b64decode(match.group(1))).decode("utf-8").split("\n")
+        
+        assert [json.loads(line) for line in lines] == steps
+        assert len(viewer_html) < steps_file.stat().st_size / 4
+    
+    def test_embedded_viewer_is_a_preview_by_default(self, temp_workspace, sample_files):
+        """Test that viewer.html embeds only the first steps unless asked for all."""
+        import json
+        import re
+        from epi_core.container import VIEWER_PREVIEW_STEPS
+        
+        sha = "ab" * 32
+        steps = [
+            {"index": i, "kind": "tool.call", "content": {"name": "search", "query": f"query {i}"}}
+            for i in range(VIEWER_PREVIEW_STEPS * 2)
+        ]
+        steps[-1]["content"]["result"] = {"$blob": sha, "type": "text", "size": 5}
+        (sample_files / "steps.jsonl").write_text("".join(json.dumps(s) + "\n" for s in steps))
+        (sample_files / "blobs").mkdir()
+        (sample_files / "blobs" / sha).write_text("large")
+        
+        output_path = temp_workspace / "test.epi"
+        EPIContainer.pack(sample_files, ManifestModel(), output_path)
+        
+        extract_dir = EPIContainer.unpack(output_path)
+        viewer_html = (extract_dir / "viewer.html").read_text()
+        match = re.search(
+            r'<script id="epi-steps" type="application/x-ndjson" data-total="(\d+)">(.*?)</script>',
+            viewer_html,
+            re.DOTALL
+        )
+        
+        assert int(match.group(1)) == len(steps)
+        assert [json.loads(line) for line in match.group(2).split("\n")] == steps[:VIEWER_PREVIEW_STEPS]
+        assert 'id="epi-blobs"' not in viewer_html
+        
+        # The full viewer is built from the archive itself (as epi view does)
+        full_html = EPIContainer.render_viewer(output_path)
+        assert '<script id="epi-steps" type="application/x-ndjson">' in full_html
+        assert 'id="epi-blobs"' in full_html
+        
+        with pytest.raises(ValueError):
+            EPIContainer.pack(sample_files, ManifestModel(), output_path, viewer_mode="everything")
+    
+    def test_preview_with_known_count_stops_at_cap(self, temp_workspace, sample_files, monkeypatch):
+        """Test that a preview does not parse the steps past its cap when the count is known."""
+        import json
+        from epi_core import container
+        from epi_core.container import VIEWER_PREVIEW_STEPS
+        
+        count = VIEWER_PREVIEW_STEPS * 10
+        (sample_files / "steps.jsonl").write_text("".join(
+            json.dumps({"index": i, "kind": "tool.call", "content": {}}) + "\n" for i in range(count)
+        ))
+        output_path = temp_workspace / "test.epi"
+        EPIContainer.pack(sample_files, ManifestModel(), output_path)
+        
+        parsed = []
+        real_loads = json.loads
+        monkeypatch.setattr(container.json, "loads", lambda s, **kw: (parsed.append(1), real_loads(s, **kw))[1])
+        
+        html = EPIContainer._create_embedded_viewer(sample_files, ManifestModel(), "preview", count)
+        assert f'data-total="{count}"' in html
+        assert len(parsed) <= VIEWER_PREVIEW_STEPS + 1
+        
+        # From an archive, the count comes from index/steps.idx
+        parsed.clear()
+        html = EPIContainer.render_viewer(output_path, viewer_mode="preview")
+        assert f'data-total="{count}"' in html
+        assert len(parsed) <= VIEWER_PREVIEW_STEPS + 2  # + manifest.json
+    
+    def test_pack_hashes_match_packed_content(self, temp_workspace, sample_files):
+        """Test that hashes computed while compressing match the stored bytes."""
+        import hashlib
+        import zipfile
+        
+        (sample_files / "big.bin").write_bytes(bytes(range(256)) * 10000)
+        output_path = temp_workspace / "test.epi"
+        manifest = ManifestModel(cli_command="test command")
+        
+        EPIContainer.pack(sample_files, manifest, output_path)
+        
+        with zipfile.ZipFile(output_path) as zf:
+            for name, expected in manifest.file_manifest.items():
+                assert hashlib.sha256(zf.read(name)).hexdigest() == expected
+    
+    def test_pack_with_signer_signs_manifest_and_viewer(self, temp_workspace, sample_files):
+        """Test that signing happens inside pack, covering the final file_manifest."""
+        import functools
+        import zipfile
+        from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+        from epi_core.trust import sign_manifest, verify_signature
+        
+        private_key = Ed25519PrivateKey.generate()
+        signer = functools.partial(sign_manifest, private_key=private_key, key_name="test")
+        
+        output_path = temp_workspace / "signed.epi"
+        manifest = ManifestModel(cli_command="test command")
+        EPIContainer.pack(sample_files, manifest, output_path, signer=signer)
+        
+        stored = EPIContainer.read_manifest(output_path)
+        public_key = bytes.fromhex(stored.public_key)
+        assert verify_signature(stored, public_key)[0]
+        assert stored.signature == manifest.signature
+        
+        with zipfile.ZipFile(output_path) as zf:
+            names = zf.namelist()
+            viewer_html = zf.read("viewer.html").decode("utf-8")
+        assert names.count("manifest.json") == 1
+        assert manifest.signature in viewer_html
+    
+    def test_pack_removes_output_when_signer_fails(self, temp_workspace, sample_files):
+        """Test that a failing signer does not leave a half-written .epi file."""
+        from epi_core.trust import SigningError
+        
+        def failing_signer(manifest):
+            raise SigningError("no key")
+        
+        output_path = temp_workspace / "signed.epi"
+        with pytest.raises(SigningError):
+            EPIContainer.pack(
+                sample_files,
+                ManifestModel(cli_command="test command"),
+                output_path,
+                signer=failing_signer
+            )
+        
+        assert not output_path.exists()
+    
     def test_minimal_viewer_fallback(self, temp_workspace, sample_files, monkeypatch):
         """Test that minimal viewer is used when template is missing."""
         # Mock template path to non-existent location
-        def mock_create_viewer(source_dir, manifest):
+        def mock_create_viewer(source_dir, manifest, viewer_mode="preview", total_steps=None):
             # Force use of minimal viewer
             from epi_core.container import EPIContainer
             return EPIContainer._create_minimal_viewer(manifest)
@@ -366,4 +589,74 @@ class TestEPIContainer:
 
 
 
- 
\ No newline at end of file
+ 
+    
+    def test_pack_different_paths_runs_concurrently(self, temp_workspace, sample_files, monkeypatch):
+        """Test that packs into different .epi files do not wait for each other."""
+        import threading
+        
+        # Both packs must be inside pack at the same time to pass the barrier
+        barrier = threading.Barrier(2, timeout=5)
+        original_viewer = EPIContainer._create_embedded_viewer
+        
+        def viewer_at_barrier(source_dir, manifest, viewer_mode="preview", total_steps=None):
+            barrier.wait()
+            return original_viewer(source_dir, manifest, viewer_mode, total_steps)
+        
+        monkeypatch.setattr(EPIContainer, "_create_embedded_viewer", staticmethod(viewer_at_barrier))
+        
+        errors = []
+        
+        def pack(name):
+            try:
+                EPIContainer.pack(sample_files, ManifestModel(cli_command=name), temp_workspace / f"{name}.epi")
+            except Exception as e:
+                errors.append(e)
+        
+        threads = [threading.Thread(target=pack, args=(name,)) for name in ("a", "b")]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert errors == []
+        for name in ("a", "b"):
+            assert EPIContainer.verify_integrity(temp_workspace / f"{name}.epi")[0]
+    
+    def test_pack_same_path_is_serialized(self, temp_workspace, sample_files, monkeypatch):
+        """Test that packs into one .epi file never overlap."""
+        import threading
+        import time
+        from epi_core import container
+        
+        active = []
+        overlaps = []
+        original_viewer = EPIContainer._create_embedded_viewer
+        
+        def tracking_viewer(source_dir, manifest, viewer_mode="preview", total_steps=None):
+            active.append(1)
+            if len(active) > 1:
+                overlaps.append(True)
+            time.sleep(0.02)
+            active.pop()
+            return original_viewer(source_dir, manifest, viewer_mode, total_steps)
+        
+        monkeypatch.setattr(EPIContainer, "_create_embedded_viewer", staticmethod(tracking_viewer))
+        
+        output_path = temp_workspace / "shared.epi"
+        threads = [
+            threading.Thread(
+                target=EPIContainer.pack,
+                args=(sample_files, ManifestModel(cli_command=str(i)), output_path)
+            )
+            for i in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert overlaps == []
+        assert EPIContainer.verify_integrity(output_path)[0]
+        # Lock table only holds paths being packed right now
+        assert container._pack_locks == {}
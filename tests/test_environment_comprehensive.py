@@ -209,4 +209,35 @@ class TestEnvironmentSnapshot:
 
 
 
- 
\ No newline at end of file
+ 
+
+class TestInstalledPackagesCache:
+    """Test the per-process installed-packages snapshot"""
+    
+    def test_scan_is_reused_across_calls(self, monkeypatch):
+        """Test that repeated captures scan distribution metadata once"""
+        from epi_recorder import environment
+        
+        monkeypatch.setattr(environment, "_packages_cache", None)
+        with patch.object(environment, "_scan_installed_packages", return_value={"pkg": "1.0"}) as scan:
+            first = environment.capture_installed_packages()
+            second = environment.capture_installed_packages()
+        
+        assert first == second == {"pkg": "1.0"}
+        assert scan.call_count == 1
+        
+        # Callers get their own copy
+        first["other"] = "2.0"
+        assert "other" not in environment._packages_cache[1]
+    
+    def test_rescan_when_sys_path_changes(self, monkeypatch, tmp_path):
+        """Test that a changed import path invalidates the snapshot"""
+        from epi_recorder import environment
+        
+        monkeypatch.setattr(environment, "_packages_cache", None)
+        with patch.object(environment, "_scan_installed_packages", return_value={}) as scan:
+            environment.capture_installed_packages()
+            monkeypatch.setattr(sys, "path", sys.path + [str(tmp_path)])
+            environment.capture_installed_packages()
+        
+        assert scan.call_count == 2
@@ -0,0 +1,168 @@
+"""
+Tests for background session finalization (epi_recorder.finalizer)
+"""
+
+import asyncio
+import json
+import tempfile
+import threading
+import time
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from epi_core.container import EPIContainer
+from epi_recorder.api import EpiRecorderSession
+from epi_recorder.finalizer import FinalizerPool, completed_future, get_finalizer_pool
+
+
+class TestFinalizerPool:
+    """Test the bounded finalizer pool."""
+
+    def test_submit_returns_future(self):
+        pool = FinalizerPool(max_workers=1)
+        try:
+            assert pool.submit(lambda x: x * 2, 21).result(timeout=5) == 42
+        finally:
+            pool.shutdown()
+
+    def test_queue_depth_is_bounded(self):
+        pool = FinalizerPool(max_workers=1, max_pending=2)
+        release = threading.Event()
+        try:
+            pool.submit(release.wait)
+            pool.submit(release.wait)
+            assert pool.pending == 2
+
+            # Third submission blocks until a slot frees up
+            submitted = threading.Event()
+            thread = threading.Thread(
+                target=lambda: (pool.submit(lambda: None), submitted.set())
+            )
+            thread.start()
+            assert not submitted.wait(0.2)
+
+            release.set()
+            assert submitted.wait(5)
+            thread.join()
+        finally:
+            release.set()
+            pool.shutdown()
+
+        assert pool.pending == 0
+
+    def test_drain_waits_for_pending(self):
+        pool = FinalizerPool(max_workers=2)
+        done = []
+        try:
+            for i in range(4):
+                pool.submit(lambda i=i: (time.sleep(0.05), done.append(i)))
+            assert pool.drain(timeout=5)
+            assert sorted(done) == [0, 1, 2, 3]
+        finally:
+            pool.shutdown()
+
+    def test_rejects_non_positive_depth(self):
+        with pytest.raises(ValueError):
+            FinalizerPool(max_pending=0)
+
+    def test_process_wide_pool_is_shared(self):
+        assert get_finalizer_pool() is get_finalizer_pool()
+
+    def test_completed_future(self):
+        assert completed_future("x").result(timeout=0) == "x"
+
+
+class TestBackgroundFinalize:
+    """Test EpiRecorderSession(finalize="background")."""
+
+    def test_exit_returns_before_pack(self, monkeypatch):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            output_path = Path(tmpdir) / "background.epi"
+            gate = threading.Event()
+
+            # Hold packing until we've checked that exit returned
+            original_pack = EPIContainer.pack
+
+            def slow_pack(*args, **kwargs):
+                gate.wait(5)
+                return original_pack(*args, **kwargs)
+
+            monkeypatch.setattr(EPIContainer, "pack", staticmethod(slow_pack))
+
+            with EpiRecorderSession(output_path, auto_sign=False, finalize="background") as epi:
+                epi.log_step("custom.event", {"n": 1})
+
+            assert not output_path.exists()
+            assert not epi.finalized.done()
+
+            gate.set()
+            assert epi.finalized.result(timeout=10) == output_path
+
+            with zipfile.ZipFile(output_path) as zf:
+                steps = [json.loads(l) for l in zf.read("steps.jsonl").decode().splitlines()]
+
+            kinds = [s["kind"] for s in steps]
+            assert "custom.event" in kinds
+            assert kinds[-1] == "session.end"
+            assert not epi.temp_dir.exists()
+
+            integrity_ok, _ = EPIContainer.verify_integrity(output_path)
+            assert integrity_ok
+
+    def test_error_is_recorded_and_context_released(self):
+        from epi_recorder.patcher import get_recording_context
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            output_path = Path(tmpdir) / "error.epi"
+
+            with pytest.raises(ValueError):
+                with EpiRecorderSession(output_path, auto_sign=False, finalize="background") as epi:
+                    raise ValueError("boom")
+
+            # Caller's context is released immediately
+            assert get_recording_context() is None
+
+            epi.finalized.result(timeout=10)
+            with zipfile.ZipFile(output_path) as zf:
+                kinds = [json.loads(l)["kind"] for l in zf.read("steps.jsonl").decode().splitlines()]
+            assert "session.error" in kinds
+
+    def test_finalize_failure_surfaces_in_result(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            # A directory where the .epi should go makes packing fail
+            output_path = Path(tmpdir) / "blocked.epi"
+            output_path.mkdir()
+
+            with EpiRecorderSession(output_path, auto_sign=False, finalize="background") as epi:
+                pass
+
+            with pytest.raises(Exception):
+                epi.finalized.result(timeout=10)
+
+    def test_sync_mode_sets_completed_handle(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            output_path = Path(tmpdir) / "sync.epi"
+
+            with EpiRecorderSession(output_path, auto_sign=False) as epi:
+                pass
+
+            assert epi.finalized.done()
+            assert epi.finalized.result() == output_path
+
+    def test_async_background(self):
+        async def main(output_path):
+            async with EpiRecorderSession(output_path, auto_sign=False, finalize="background") as epi:
+                epi.log_step("custom.event", {})
+            return epi
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            output_path = Path(tmpdir) / "async.epi"
+            epi = asyncio.run(main(output_path))
+            assert epi.finalized.result(timeout=10) == output_path
+            assert output_path.exists()
+
+    def test_rejects_unknown_mode(self):
+        with pytest.raises(ValueError):
+            EpiRecorderSession("x.epi", finalize="later")
@@ -0,0 +1,200 @@
+"""
+Tests for delta-encoded message histories (epi_core.history, epi_core.reader)
+"""
+
+import json
+import tempfile
+import threading
+import zipfile
+from pathlib import Path
+
+from epi_core.history import HistoryDecoder, HistoryEncoder, is_history_ref
+from epi_core.reader import iter_steps, load_steps
+from epi_recorder.api import EpiRecorderSession
+
+
+def conversation(turns, topic="weather"):
+    """Message lists an agent would send on each turn of one conversation."""
+    messages = [{"role": "system", "content": f"You answer questions about {topic}."}]
+    histories = []
+    for turn in range(turns):
+        messages = messages + [{"role": "user", "content": f"{topic} question {turn}"}]
+        histories.append(messages)
+        messages = messages + [{"role": "assistant", "content": f"{topic} answer {turn}"}]
+    return histories
+
+
+def round_trip(histories):
+    encoder, decoder = HistoryEncoder(), HistoryDecoder()
+    encoded = [encoder.encode(messages) for messages in histories]
+    # Through JSON, as in steps.jsonl
+    encoded = json.loads(json.dumps(encoded))
+    return encoded, [decoder.decode(value) for value in encoded]
+
+
+class TestHistoryEncoding:
+    """Test encoding and decoding message lists."""
+
+    def test_round_trip(self):
+        histories = conversation(5)
+        encoded, decoded = round_trip(histories)
+
+        assert decoded == histories
+        assert all(is_history_ref(value) for value in encoded)
+
+    def test_only_appended_messages_are_stored(self):
+        encoded, _ = round_trip(conversation(4))
+
+        first = encoded[0]["$history"]
+        assert first["base"] is None
+        assert len(first["append"]) == 2
+
+        # Each later turn adds the previous answer and the new question
+        for value, previous in zip(encoded[1:], encoded):
+            assert value["$history"]["base"] == previous["$history"]["hash"]
+            assert len(value["$history"]["append"]) == 2
+
+    def test_interleaved_conversations(self):
+        weather, stocks = conversation(4, "weather"), conversation(4, "stocks")
+        histories = [h for pair in zip(weather, stocks) for h in pair]
+
+        encoded, decoded = round_trip(histories)
+
+        assert decoded == histories
+        assert all(value["$history"]["base"] is not None for value in encoded[2:])
+
+    def test_more_conversations_than_remembered(self):
+        # 300 one-off conversations: more than either side keeps. Every 50th
+        # request branches off the first one, which stays recent that way.
+        shared = conversation(1, "shared")[0]
+        histories = [shared]
+        for i in range(300):
+            histories.append(conversation(1, f"topic {i}")[0])
+            if i % 50 == 49:
+                histories.append(shared + [{"role": "assistant", "content": f"branch {i}"}])
+
+        encoder, decoder = HistoryEncoder(), HistoryDecoder()
+        encoded = json.loads(json.dumps([encoder.encode(messages) for messages in histories]))
+        decoded = [decoder.decode(value) for value in encoded]
+
+        assert decoded == histories
+        branches = [value for value in encoded if value["$history"]["base"] is not None]
+        assert len(branches) == 6
+        assert len(decoder._histories[None]) == decoder.max_histories
+
+    def test_histories_are_kept_per_process(self):
+        # Two processes, each with its own encoder, merged into one stream
+        steps = []
+        for pid in (100, 200):
+            encoder = HistoryEncoder(max_histories=4)
+            for i, messages in enumerate(conversation(6, f"process {pid}")):
+                steps.append((i, pid, messages, encoder.encode(messages)))
+        steps.sort(key=lambda step: step[0])
+
+        decoder = HistoryDecoder(max_histories=4)
+        for _, pid, messages, value in json.loads(json.dumps(steps)):
+            step = {"kind": "llm.request", "content": {"messages": value}, "process": {"pid": pid}}
+            assert decoder.decode_step(step)["content"]["messages"] == messages
+        assert all(len(histories) <= 4 for histories in decoder._histories.values())
+
+    def test_edited_history_falls_back_to_common_prefix(self):
+        first = conversation(3)[-1]
+        edited = first[:2] + [{"role": "user", "content": "rewritten"}]
+
+        encoded, decoded = round_trip([first, edited])
+
+        assert decoded == [first, edited]
+        # Nothing earlier was sent with exactly first[:2], so no base applies
+        assert encoded[1]["$history"]["base"] is None
+
+    def test_unknown_base_is_left_encoded(self):
+        encoded, _ = round_trip(conversation(3))
+
+        decoder = HistoryDecoder()
+        assert decoder.decode(encoded[2]) == encoded[2]
+
+    def test_plain_lists_pass_through(self):
+        messages = [{"role": "user", "content": "hi"}]
+        assert HistoryDecoder().decode(messages) is messages
+
+
+class TestRecordedHistories:
+    """Test delta histories end to end through a recording session."""
+
+    def record(self, tmpdir, delta_history, turns=30):
+        output_path = Path(tmpdir) / f"chat-{delta_history}.epi"
+        with EpiRecorderSession(output_path, auto_sign=False, delta_history=delta_history) as epi:
+            for turn, messages in enumerate(conversation(turns)):
+                epi.log_step("llm.request", {"provider": "openai", "messages": messages})
+                epi.log_step("llm.response", {"choices": [{"message": {"content": f"answer {turn}"}}]})
+        return output_path
+
+    def test_reader_rebuilds_full_histories(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            output_path = self.record(tmpdir, delta_history=True)
+
+            with zipfile.ZipFile(output_path) as zf:
+                raw = [json.loads(l) for l in zf.read("steps.jsonl").decode().splitlines()]
+            assert all(is_history_ref(s["content"]["messages"]) for s in raw if s["kind"] == "llm.request")
+
+            requests = [s for s in load_steps(output_path) if s["kind"] == "llm.request"]
+            assert [s["content"]["messages"] for s in requests] == conversation(30)
+
+    def test_delta_encoding_shrinks_steps(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            sizes = {}
+            for delta_history in (False, True):
+                with zipfile.ZipFile(self.record(tmpdir, delta_history)) as zf:
+                    sizes[delta_history] = len(zf.read("steps.jsonl"))
+
+            assert sizes[True] * 3 < sizes[False]
+
+    def test_disabled_by_default(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            output_path = Path(tmpdir) / "plain.epi"
+            with EpiRecorderSession(output_path, auto_sign=False) as epi:
+                epi.log_step("llm.request", {"messages": conversation(1)[0]})
+
+            requests = [s for s in iter_steps(output_path) if s["kind"] == "llm.request"]
+            assert requests[0]["content"]["messages"] == conversation(1)[0]
+
+    def test_concurrent_conversations_decode(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            output_path = Path(tmpdir) / "threads.epi"
+            topics = [f"topic{i}" for i in range(4)]
+            with EpiRecorderSession(output_path, auto_sign=False, delta_history=True) as epi:
+                def agent(topic):
+                    for messages in conversation(20, topic):
+                        epi.log_step("llm.request", {"messages": messages})
+
+                threads = [threading.Thread(target=agent, args=(t,)) for t in topics]
+                for t in threads:
+                    t.start()
+                for t in threads:
+                    t.join()
+
+            requests = [s["content"]["messages"] for s in load_steps(output_path) if s["kind"] == "llm.request"]
+            assert len(requests) == 80
+            for topic in topics:
+                own = [m for m in requests if topic in m[0]["content"]]
+                assert own == conversation(20, topic)
+
+    def test_detector_and_chat_see_full_histories(self):
+        from epi_analyzer.detector import MistakeDetector
+        from epi_cli.chat import load_steps_from_epi
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            output_path = self.record(tmpdir, delta_history=True, turns=5)
+
+            detected = [s for s in MistakeDetector(str(output_path)).steps if s["type"] == "llm.request"]
+            assert detected[-1]["content"]["messages"] == conversation(5)[-1]
+
+            chat_steps = [s for s in load_steps_from_epi(output_path) if s["kind"] == "llm.request"]
+            assert chat_steps[-1]["content"]["messages"] == conversation(5)[-1]
+
+    def test_viewer_decodes_histories(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            output_path = self.record(tmpdir, delta_history=True, turns=2)
+            with zipfile.ZipFile(output_path) as zf:
+                viewer = zf.read("viewer.html").decode("utf-8")
+            assert "decodeHistories" in viewer
@@ -0,0 +1,200 @@
+"""
+Tests for epi_core.segments - per-process step journals and their merge
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import textwrap
+from pathlib import Path
+
+import pytest
+
+from epi_core.segments import (
+    PROCESSES_FILENAME,
+    SEGMENTS_DIRNAME,
+    create_segment,
+    merge_segments,
+)
+
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture
+def steps_dir():
+    """Fresh recording directory."""
+    with tempfile.TemporaryDirectory(prefix="epi_segments_") as tmpdir:
+        yield Path(tmpdir)
+
+
+def write_segment(steps_dir, pid, start_ns, steps):
+    """Write a segment with (timestamp, kind) steps and its process info."""
+    segments_dir = steps_dir / SEGMENTS_DIRNAME
+    segments_dir.mkdir(exist_ok=True)
+    key = f"{pid}-{start_ns}"
+    (segments_dir / f"{key}.json").write_text(json.dumps({"pid": pid, "ppid": 1}))
+    with open(segments_dir / f"{key}.jsonl", "w") as f:
+        for index, (timestamp, kind) in enumerate(steps):
+            f.write(json.dumps({
+                "index": index, "timestamp": timestamp, "kind": kind, "content": {}
+            }) + "\n")
+
+
+def read_steps(steps_dir):
+    return [json.loads(l) for l in (steps_dir / "steps.jsonl").read_text().splitlines()]
+
+
+class TestCreateSegment:
+    """Test segment creation."""
+
+    def test_segment_keyed_by_pid_and_start(self, steps_dir):
+        segment = create_segment(steps_dir)
+
+        assert segment.parent == steps_dir / SEGMENTS_DIRNAME
+        assert segment.exists()
+        pid, start_ns = segment.stem.split("-")
+        assert int(pid) == os.getpid()
+        assert int(start_ns) > 0
+
+        info = json.loads(segment.with_suffix(".json").read_text())
+        assert info["pid"] == os.getpid()
+        assert info["ppid"] == os.getppid()
+
+    def test_segments_do_not_collide(self, steps_dir):
+        assert create_segment(steps_dir) != create_segment(steps_dir)
+
+
+class TestMergeSegments:
+    """Test k-way timestamp merge."""
+
+    def test_no_segments_is_noop(self, steps_dir):
+        (steps_dir / "steps.jsonl").write_text('{"index": 0}\n')
+
+        assert merge_segments(steps_dir) == 0
+        assert (steps_dir / "steps.jsonl").read_text() == '{"index": 0}\n'
+
+    def test_merge_orders_by_timestamp(self, steps_dir):
+        write_segment(steps_dir, 100, 1, [
+            ("2025-01-01T00:00:00", "a0"),
+            ("2025-01-01T00:00:02", "a1"),
+        ])
+        write_segment(steps_dir, 200, 2, [
+            ("2025-01-01T00:00:01", "b0"),
+            ("2025-01-01T00:00:03", "b1"),
+        ])
+
+        assert merge_segments(steps_dir) == 4
+
+        steps = read_steps(steps_dir)
+        assert [s["kind"] for s in steps] == ["a0", "b0", "a1", "b1"]
+        assert [s["index"] for s in steps] == [0, 1, 2, 3]
+        assert steps[1]["process"] == {"pid": 200, "index": 0}
+        assert not (steps_dir / SEGMENTS_DIRNAME).exists()
+
+    def test_ties_keep_process_order(self, steps_dir):
+        same = "2025-01-01T00:00:00"
+        write_segment(steps_dir, 100, 1, [(same, "a0"), (same, "a1")])
+        write_segment(steps_dir, 200, 2, [(same, "b0")])
+
+        merge_segments(steps_dir)
+
+        assert [s["kind"] for s in read_steps(steps_dir)] == ["a0", "a1", "b0"]
+
+    def test_mixed_timestamp_formats(self, steps_dir):
+        write_segment(steps_dir, 100, 1, [("2025-01-01T00:00:02Z", "late")])
+        write_segment(steps_dir, 200, 2, [("2025-01-01T00:00:01.500000", "early")])
+
+        merge_segments(steps_dir)
+
+        assert [s["kind"] for s in read_steps(steps_dir)] == ["early", "late"]
+
+    def test_existing_journal_is_merged_without_attribution(self, steps_dir):
+        (steps_dir / "steps.jsonl").write_text(json.dumps({
+            "index": 0, "timestamp": "2025-01-01T00:00:05", "kind": "plain", "content": {}
+        }) + "\n")
+        write_segment(steps_dir, 100, 1, [("2025-01-01T00:00:00", "seg")])
+
+        merge_segments(steps_dir)
+
+        steps = read_steps(steps_dir)
+        assert [s["kind"] for s in steps] == ["seg", "plain"]
+        assert "process" not in steps[1]
+
+    def test_invalid_lines_are_skipped(self, steps_dir):
+        write_segment(steps_dir, 100, 1, [("2025-01-01T00:00:00", "ok")])
+        with open(steps_dir / SEGMENTS_DIRNAME / "100-1.jsonl", "a") as f:
+            f.write("not json\n")
+
+        assert merge_segments(steps_dir) == 1
+
+    def test_processes_file(self, steps_dir):
+        write_segment(steps_dir, 100, 1, [("2025-01-01T00:00:00", "a0")])
+        write_segment(steps_dir, 200, 2, [])
+
+        merge_segments(steps_dir)
+
+        processes = json.loads((steps_dir / PROCESSES_FILENAME).read_text())
+        assert [(p["pid"], p["steps"]) for p in processes] == [(100, 1)]
+
+
+class TestMultiprocessRecording:
+    """Test that recorded child processes get their own segments."""
+
+    def test_pool_workers_are_attributed(self, steps_dir):
+        workdir = steps_dir / "work"
+        workdir.mkdir()
+        (workdir / "sitecustomize.py").write_text(
+            "from epi_recorder.bootstrap import initialize_recording\n"
+        )
+        (workdir / "script.py").write_text(textwrap.dedent("""
+            import multiprocessing as mp
+            from epi_recorder.patcher import get_recording_context
+
+            def work(i):
+                get_recording_context().add_step("worker.step", {"worker": i})
+
+            if __name__ == "__main__":
+                get_recording_context().add_step("main.start", {})
+                methods = [m for m in ("fork", "spawn") if m in mp.get_all_start_methods()]
+                for method in methods:
+                    with mp.get_context(method).Pool(2) as pool:
+                        pool.map(work, range(2))
+                get_recording_context().add_step("main.end", {})
+        """))
+
+        recording = steps_dir / "recording"
+        recording.mkdir()
+        env = os.environ.copy()
+        env.update({
+            "EPI_RECORD": "1",
+            "EPI_STEPS_DIR": str(recording),
+            "EPI_REDACT": "0",
+            "PYTHONPATH": os.pathsep.join([str(workdir), str(PROJECT_ROOT)]),
+        })
+        result = subprocess.run(
+            [sys.executable, "script.py"], cwd=workdir, env=env,
+            capture_output=True, text=True, timeout=120
+        )
+        assert result.returncode == 0, result.stderr
+
+        merge_segments(recording)
+        steps = read_steps(recording)
+
+        assert [s["index"] for s in steps] == list(range(len(steps)))
+        assert steps[0]["kind"] == "main.start"
+        assert steps[-1]["kind"] == "main.end"
+
+        main_pid = steps[0]["process"]["pid"]
+        workers = [s for s in steps if s["kind"] == "worker.step"]
+        assert len(workers) >= 2
+        assert all(s["process"]["pid"] != main_pid for s in workers)
+        # Every process keeps its own local numbering, in order
+        local = {}
+        for step in steps:
+            pid = step["process"]["pid"]
+            local.setdefault(pid, []).append(step["process"]["index"])
+        for indices in local.values():
+            assert indices == list(range(len(indices)))
@@ -0,0 +1,199 @@
+"""
+Tests for the local evidence server (epi_core.server)
+"""
+
+import json
+import tempfile
+import threading
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from epi_core.server import MAX_PAGE_SIZE, EvidenceServer
+from epi_core.step_index import StepReader
+from epi_recorder.api import EpiRecorderSession
+
+
+KINDS = ["llm.request", "llm.response", "tool.call"]
+BLOB_TEXT = "x" * 100_000
+
+
+def record(tmpdir, count=300):
+    output_path = Path(tmpdir) / "served.epi"
+    with EpiRecorderSession(output_path, auto_sign=False) as epi:
+        for i in range(count):
+            epi.log_step(KINDS[i % 3], {"i": i, "text": f"Step {i}"})
+        epi.log_step("tool.result", {"output": BLOB_TEXT})
+    return output_path
+
+
+@pytest.fixture
+def served():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        output_path = record(tmpdir)
+        server = EvidenceServer(output_path)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            yield server, output_path
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+def get(server, path, headers=None):
+    request = urllib.request.Request(server.url.rstrip("/") + path, headers=headers or {})
+    try:
+        with urllib.request.urlopen(request) as response:
+            return response.status, dict(response.headers), response.read()
+    except urllib.error.HTTPError as e:
+        return e.code, dict(e.headers), e.read()
+
+
+def get_json(server, path):
+    status, _, body = get(server, path)
+    assert status == 200
+    return json.loads(body)
+
+
+class TestEndpoints:
+    """Test the JSON API."""
+
+    def test_manifest_and_summary(self, served):
+        server, output_path = served
+
+        manifest = get_json(server, "/api/manifest")
+        assert "steps.jsonl" in manifest["file_manifest"]
+
+        summary = get_json(server, "/api/summary")
+        with StepReader(output_path) as steps:
+            assert summary["steps"] == len(steps)
+        assert summary["kinds"]["tool.call"] == 100
+
+    def test_steps_are_paged(self, served):
+        server, output_path = served
+        with StepReader(output_path) as steps:
+            expected = list(steps.range(120, 130))
+            total = len(steps)
+
+        page = get_json(server, "/api/steps?offset=120&limit=10")
+        assert page["total"] == total
+        assert page["offset"] == 120
+        assert page["steps"] == expected
+
+        assert get_json(server, "/api/steps?limit=0")["steps"] == []
+        assert len(get_json(server, f"/api/steps?limit={MAX_PAGE_SIZE * 2}")["steps"]) == total
+
+    def test_steps_filtered_by_kind(self, served):
+        server, _ = served
+
+        page = get_json(server, "/api/steps?kind=tool.call&offset=5&limit=3")
+        assert page["total"] == 100
+        assert [s["content"]["i"] for s in page["steps"]] == [17, 20, 23]
+
+    def test_search_with_cursor(self, served):
+        server, _ = served
+
+        result = get_json(server, "/api/search?q=step%2025&limit=5")
+        assert [s["content"]["i"] for s in result["steps"]] == [25, 250, 251, 252, 253]
+        assert result["next"] == result["steps"][-1]["index"] + 1
+
+        rest = get_json(server, f"/api/search?q=STEP%2025&start={result['next']}&limit=50")
+        assert [s["content"]["i"] for s in rest["steps"]] == [254, 255, 256, 257, 258, 259]
+        assert rest["next"] is None
+
+        by_kind = get_json(server, "/api/search?q=step%2025&kind=tool.call")
+        assert [s["content"]["i"] for s in by_kind["steps"]] == [251, 254, 257]
+
+    def test_blobs(self, served):
+        server, _ = served
+
+        page = get_json(server, "/api/steps?kind=tool.result")
+        digest = page["steps"][0]["content"]["output"]["$blob"]
+
+        status, headers, body = get(server, f"/api/blobs/{digest}")
+        assert status == 200
+        assert body == BLOB_TEXT.encode("utf-8")
+        assert "immutable" in headers["Cache-Control"]
+        assert get(server, f"/api/blobs/{digest}", {"If-None-Match": headers["ETag"]})[0] == 304
+
+    def test_etags(self, served):
+        server, _ = served
+
+        status, headers, _ = get(server, "/api/steps?offset=10&limit=5")
+        assert status == 200
+        status, _, body = get(server, "/api/steps?offset=10&limit=5", {"If-None-Match": headers["ETag"]})
+        assert status == 304
+        assert body == b""
+
+        status, other, _ = get(server, "/api/steps?offset=15&limit=5")
+        assert other["ETag"] != headers["ETag"]
+
+    def test_errors(self, served):
+        server, _ = served
+
+        assert get(server, "/api/steps?offset=-1")[0] == 400
+        assert get(server, "/api/steps?limit=many")[0] == 400
+        assert get(server, "/api/search")[0] == 400
+        assert get(server, "/api/blobs/" + "0" * 64)[0] == 404
+        assert get(server, "/api/nothing")[0] == 404
+        assert get(server, "/static/../server.py")[0] == 404
+
+
+    def test_foreign_host_is_rejected(self, served):
+        server, _ = served
+        port = server.server_address[1]
+
+        for host in (f"evil.example:{port}", "localhost", f"127.0.0.1:{port + 1}", ""):
+            status, _, body = get(server, "/api/steps", {"Host": host})
+            assert status == 403
+            assert b'"steps"' not in body
+
+        assert get(server, "/api/manifest", {"Host": f"localhost:{port}"})[0] == 200
+        assert get(server, "/", {"Host": f"127.0.0.1:{port}"})[0] == 200
+
+
+class TestViewer:
+    """Test the served viewer."""
+
+    def test_index_points_at_the_api(self, served):
+        server, _ = served
+
+        status, headers, body = get(server, "/")
+        assert status == 200
+        assert headers["Content-Type"].startswith("text/html")
+        html = body.decode("utf-8")
+        assert '"api": "/api"' in html
+        assert 'id="epi-steps"' not in html
+
+        status, _, _ = get(server, "/static/app.js")
+        assert status == 200
+
+
+class TestViewServe:
+    """Test epi view --serve."""
+
+    def test_serve_until_interrupted(self, monkeypatch):
+        from epi_cli.main import app
+
+        served = {}
+
+        def fake_serve_forever(self):
+            served["url"] = self.url
+            served["steps"] = len(self.archive.steps)
+            raise KeyboardInterrupt
+
+        monkeypatch.setattr(EvidenceServer, "serve_forever", fake_serve_forever)
+        monkeypatch.setattr("webbrowser.open", lambda url: True)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            output_path = record(tmpdir, count=9)
+            result = CliRunner().invoke(app, ["view", "--serve", str(output_path)])
+
+        assert result.exit_code == 0
+        assert served["url"] in result.output
+        assert served["steps"] > 9
+        assert "Stopped" in result.output
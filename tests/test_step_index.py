@@ -0,0 +1,239 @@
+"""
+Tests for the step offset index and StepReader (epi_core.step_index)
+"""
+
+import json
+import struct
+import tempfile
+import zipfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from epi_core.container import EPIContainer
+from epi_core.reader import load_steps
+from epi_core.schemas import ManifestModel
+from epi_core.step_index import CHUNK_SIZE, STEP_INDEX_NAME, STEPS_NAME, StepReader
+from epi_recorder.api import EpiRecorderSession
+
+
+KINDS = ["llm.request", "llm.response", "tool.call"]
+
+
+def record(tmpdir, count=300, **session_kwargs):
+    output_path = Path(tmpdir) / "long.epi"
+    with EpiRecorderSession(output_path, auto_sign=False, **session_kwargs) as epi:
+        for i in range(count):
+            epi.log_step(KINDS[i % 3], {"i": i, "text": f"step {i}"})
+    return output_path
+
+
+class TestPackedIndex:
+    """Test what pack writes."""
+
+    def test_steps_stay_a_standard_deflated_member(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            output_path = record(tmpdir, count=3000)
+
+            with zipfile.ZipFile(output_path) as zf:
+                info = zf.getinfo(STEPS_NAME)
+                assert info.compress_type == zipfile.ZIP_DEFLATED
+                assert info.compress_size < info.file_size / 3
+                lines = zf.read(STEPS_NAME).decode().splitlines()
+                manifest = json.loads(zf.read("manifest.json"))
+
+            assert [json.loads(l)["index"] for l in lines] == list(range(len(lines)))
+            assert STEP_INDEX_NAME in manifest["file_manifest"]
+            assert EPIContainer.verify_integrity(output_path)[0]
+
+    def test_local_header_matches_central_directory(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            output_path = record(tmpdir, count=300)
+
+            with zipfile.ZipFile(output_path) as zf:
+                info = zf.getinfo(STEPS_NAME)
+            with open(output_path, "rb") as f:
+                f.seek(info.header_offset)
+                header = struct.unpack("<4s5H3L2H", f.read(30))
+            assert header[3] == zipfile.ZIP_DEFLATED
+            assert header[6] == info.CRC
+            assert header[7:9] == (info.compress_size, info.file_size)
+
+    def test_zip64_member(self, monkeypatch):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            # Small enough limit that steps.jsonl gets ZIP64 sizes
+            monkeypatch.setattr(zipfile, "ZIP64_LIMIT", 1000)
+            output_path = record(tmpdir, count=300)
+            monkeypatch.undo()
+
+            with zipfile.ZipFile(output_path) as zf:
+                lines = zf.read(STEPS_NAME).decode().splitlines()
+            with StepReader(output_path) as steps:
+                assert steps.get(200) == json.loads(lines[200])
+            assert EPIContainer.verify_integrity(output_path)[0]
+
+    def test_reads_inflate_single_chunks(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            output_path = record(tmpdir, count=3000)
+
+            with StepReader(output_path) as steps:
+                assert steps._data is None
+                assert len(steps._chunk_offsets) > 2
+                steps.get(2500)
+                assert len(steps._chunks) == 1
+                assert all(len(chunk) < CHUNK_SIZE + 1024 for chunk in steps._chunks.values())
+
+    def test_stale_index_in_source_is_rebuilt(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            source_dir = Path(tmpdir) / "src"
+            (source_dir / "index").mkdir(parents=True)
+            (source_dir / STEP_INDEX_NAME).write_bytes(b"stale")
+            (source_dir / STEPS_NAME).write_text(json.dumps({"index": 0, "kind": "a", "content": {}}) + "\n")
+
+            output_path = Path(tmpdir) / "out.epi"
+            EPIContainer.pack(source_dir, ManifestModel(), output_path)
+
+            with StepReader(output_path) as steps:
+                assert len(steps) == 1
+                assert steps.get(0)["kind"] == "a"
+
+    def test_index_skips_blank_and_malformed_lines(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            steps_file = Path(tmpdir) / STEPS_NAME
+            steps_file.write_text(
+                json.dumps({"index": 0, "kind": "a"}) + "\n\n{torn\n" + json.dumps({"index": 1, "kind": "b"}) + "\n"
+            )
+
+            with StepReader(steps_file) as steps:
+                assert len(steps) == 2
+                assert steps.get(1)["kind"] == "b"
+
+
+    def test_indices_out_of_order(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            source_dir = Path(tmpdir) / "src"
+            source_dir.mkdir()
+            order = [4, 0, 2, 7, 2, 1]
+            (source_dir / STEPS_NAME).write_text("".join(
+                json.dumps({"index": index, "kind": f"k{position}", "content": {}}) + "\n"
+                for position, index in enumerate(order)
+            ))
+            output_path = Path(tmpdir) / "out.epi"
+            EPIContainer.pack(source_dir, ManifestModel(), output_path)
+
+            for source in (output_path, source_dir / STEPS_NAME):
+                with StepReader(source) as steps:
+                    assert steps.get(7)["kind"] == "k3"
+                    assert steps.get(1)["kind"] == "k5"
+                    assert steps.get(2)["kind"] == "k2"  # First of the duplicates
+                    with pytest.raises(IndexError):
+                        steps.get(3)
+                    assert [s["index"] for s in steps.range(1, 5)] == [1, 2, 2, 4]
+                    assert [s["index"] for s in steps] == [0, 1, 2, 2, 4, 7]
+                    assert list(steps.search("k", start=3)) == [4, 7]
+
+
+class TestStepReader:
+    """Test random access."""
+
+    def test_get_range_and_filter_match_a_full_read(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            output_path = record(tmpdir)
+            all_steps = load_steps(output_path)
+
+            with StepReader(output_path) as steps:
+                assert len(steps) == len(all_steps)
+                assert steps.get(150) == all_steps[150]
+                assert steps.get(len(steps) - 1)["kind"] == "session.end"
+                assert list(steps.range(100, 110)) == all_steps[100:110]
+                assert list(steps) == all_steps
+                assert list(steps.filter(kind="tool.call")) == [s for s in all_steps if s["kind"] == "tool.call"]
+                assert len(list(steps.filter(kind=["llm.request", "llm.response"]))) == 200
+                assert steps.kind_of(1) == "llm.request"
+
+    def test_indices_and_search_read_no_more_than_needed(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            output_path = record(tmpdir)
+
+            with StepReader(output_path) as steps:
+                assert list(steps.indices(kind="tool.call"))[:3] == [3, 6, 9]
+                assert steps._chunks == {}
+
+                assert list(steps.search("STEP 29")) == [30] + list(range(291, 301))
+                assert list(steps.search("step 29", kind="llm.request", start=292, stop=299)) == [292, 295, 298]
+                assert list(steps.search('"i":7,')) == [8]
+                assert list(steps.search("nothing like this")) == []
+
+    def test_missing_step_raises_index_error(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with StepReader(record(tmpdir, count=3)) as steps:
+                with pytest.raises(IndexError):
+                    steps.get(10_000)
+
+    def test_filter_by_time(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            steps_file = Path(tmpdir) / STEPS_NAME
+            start = datetime(2025, 1, 1)
+            steps_file.write_text("".join(
+                json.dumps({"index": i, "kind": "k", "timestamp": (start + timedelta(minutes=i)).isoformat()}) + "\n"
+                for i in range(10)
+            ))
+
+            with StepReader(steps_file) as steps:
+                window = list(steps.filter(since=start + timedelta(minutes=3), until=start + timedelta(minutes=6)))
+                assert [s["index"] for s in window] == [3, 4, 5]
+
+    def test_archives_without_index(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            output_path = record(tmpdir, count=30)
+            all_steps = load_steps(output_path)
+
+            # As written by older versions: plain deflated steps.jsonl, no index
+            legacy_path = Path(tmpdir) / "legacy.epi"
+            with zipfile.ZipFile(output_path) as src, zipfile.ZipFile(legacy_path, "w", zipfile.ZIP_DEFLATED) as dest:
+                for info in src.infolist():
+                    if info.filename != STEP_INDEX_NAME:
+                        dest.writestr(info.filename, src.read(info.filename))
+
+            with StepReader(legacy_path) as steps:
+                assert steps.get(20) == all_steps[20]
+                assert len(steps) == len(all_steps)
+
+    def test_histories_are_rebuilt_for_random_access(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            output_path = Path(tmpdir) / "chat.epi"
+            messages = []
+            with EpiRecorderSession(output_path, auto_sign=False, delta_history=True) as epi:
+                for turn in range(20):
+                    messages = messages + [{"role": "user", "content": f"q{turn}"}]
+                    epi.log_step("llm.request", {"messages": messages})
+                    epi.log_step("tool.call", {"name": "search"})
+                    messages = messages + [{"role": "assistant", "content": f"a{turn}"}]
+
+            expected = load_steps(output_path)
+            with StepReader(output_path) as steps:
+                requests = [s["index"] for s in expected if s["kind"] == "llm.request"]
+                # Out of order, so bases are found through the index
+                for index in reversed(requests):
+                    assert steps.get(index) == expected[index]
+
+
+class TestDebugStepOptions:
+    """Test epi debug --step / --kind."""
+
+    def test_step_and_kind(self):
+        from epi_cli.main import app
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            output_path = record(tmpdir, count=9)
+            runner = CliRunner()
+
+            result = runner.invoke(app, ["debug", "--step", "5", str(output_path)])
+            assert result.exit_code == 0
+            assert '"step 4"' in result.output
+
+            result = runner.invoke(app, ["debug", "--kind", "tool.call", str(output_path)])
+            assert result.exit_code == 0
+            assert "3 step(s) of kind tool.call" in result.output
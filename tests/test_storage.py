@@ -0,0 +1,148 @@
+"""
+Tests for epi_core.storage - SQLite step storage
+"""
+
+import sqlite3
+import tempfile
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+from epi_core.schemas import StepModel
+from epi_core.storage import EpiStorage
+
+
+def _step(i: int) -> StepModel:
+    return StepModel(index=i, timestamp=datetime.utcnow(), kind="test.step", content={"i": i})
+
+
+@pytest.fixture
+def temp_dir():
+    """Fresh temporary directory for a storage database."""
+    with tempfile.TemporaryDirectory(prefix="epi_storage_") as tmpdir:
+        yield Path(tmpdir)
+
+
+class TestEpiStorage:
+    """Test batched SQLite storage."""
+
+    def test_rejects_unknown_durability(self, temp_dir):
+        with pytest.raises(ValueError):
+            EpiStorage("s", temp_dir, durability="paranoid")
+
+    def test_no_database_until_first_write(self, temp_dir):
+        storage = EpiStorage("s", temp_dir)
+        assert not storage.db_path.exists()
+        storage.close()
+        assert not storage.db_path.exists()
+
+    def test_uses_wal_and_durability_level(self, temp_dir):
+        storage = EpiStorage("s", temp_dir, durability="full")
+        try:
+            storage.add_step(_step(0))
+            storage.flush()
+            assert storage.conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+            # FULL == 2
+            assert storage.conn.execute("PRAGMA synchronous").fetchone()[0] == 2
+        finally:
+            storage.close()
+
+    def test_reads_see_queued_steps(self, temp_dir):
+        storage = EpiStorage("s", temp_dir, flush_interval=60)
+        try:
+            for i in range(5):
+                storage.add_step(_step(i))
+            storage.set_metadata("k", "v")
+
+            assert [s.index for s in storage.get_steps()] == list(range(5))
+            assert storage.get_metadata("k") == "v"
+        finally:
+            storage.close()
+
+    def test_metadata_set_during_commits_is_kept(self, temp_dir):
+        storage = EpiStorage("s", temp_dir, flush_interval=0.001)
+        try:
+            storage.add_step(_step(0))
+            stop = threading.Event()
+
+            def commit():
+                while not stop.is_set():
+                    storage.flush()
+
+            def set_keys(worker):
+                for i in range(500):
+                    storage.set_metadata(f"{worker}.{i}", str(i))
+
+            committer = threading.Thread(target=commit)
+            committer.start()
+            setters = [threading.Thread(target=set_keys, args=(w,)) for w in range(4)]
+            for t in setters:
+                t.start()
+            for t in setters:
+                t.join()
+            stop.set()
+            committer.join()
+
+            storage.flush()
+            count = storage.conn.execute("SELECT COUNT(*) FROM metadata").fetchone()[0]
+            assert count == 4 * 500
+        finally:
+            storage.close()
+
+    def test_timer_drains_ring(self, temp_dir):
+        storage = EpiStorage("s", temp_dir, flush_interval=0.05)
+        try:
+            storage.add_step(_step(0))
+
+            deadline = time.monotonic() + 5
+            count = 0
+            while time.monotonic() < deadline:
+                with sqlite3.connect(storage.db_path) as reader:
+                    count = reader.execute("SELECT COUNT(*) FROM steps").fetchone()[0]
+                if count:
+                    break
+                time.sleep(0.02)
+
+            assert count == 1
+        finally:
+            storage.close()
+
+    def test_full_ring_commits_synchronously(self, temp_dir):
+        storage = EpiStorage("s", temp_dir, batch_size=4, max_pending=4, flush_interval=60)
+        try:
+            for i in range(4):
+                storage.add_step(_step(i))
+            assert len(storage._pending) == 0
+        finally:
+            storage.close()
+
+    def test_finalize_exports_and_removes_database(self, temp_dir):
+        storage = EpiStorage("s", temp_dir)
+        for i in range(3):
+            storage.add_step(_step(i))
+
+        final_path = storage.finalize()
+
+        assert final_path == temp_dir / "steps.jsonl"
+        assert len(final_path.read_text().splitlines()) == 3
+        assert list(temp_dir.glob("s_temp.db*")) == []
+        with pytest.raises(RuntimeError):
+            storage.add_step(_step(3))
+
+    def test_export_copies_stored_json_verbatim(self, temp_dir):
+        storage = EpiStorage("s", temp_dir)
+        try:
+            for i in (2, 0, 1):
+                storage.add_step(_step(i))
+
+            out = temp_dir / "out.jsonl"
+            assert storage.export_to_jsonl(out) == 3
+
+            stored = [r[0] for r in storage.conn.execute(
+                "SELECT content FROM steps ORDER BY step_index")]
+            assert out.read_text().splitlines() == stored
+        finally:
+            storage.close()
@@ -0,0 +1,171 @@
+"""
+Tests for precomputed step summaries (epi_core.summary)
+"""
+
+import json
+import tempfile
+import zipfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from epi_core.container import EPIContainer
+from epi_core.reader import load_steps
+from epi_core.schemas import ManifestModel
+from epi_core.summary import (
+    MAX_ERROR_DETAILS,
+    SUMMARY_FILENAME,
+    StepSummary,
+    load_summary,
+    read_summary,
+    summarize_steps,
+)
+from epi_recorder.api import EpiRecorderSession
+
+
+def record_session(tmpdir, name="run.epi"):
+    output_path = Path(tmpdir) / name
+    with EpiRecorderSession(output_path, auto_sign=False) as epi:
+        epi.log_step("llm.request", {"messages": [{"role": "user", "content": "hi"}]})
+        epi.log_step("llm.response", {"usage": {"prompt_tokens": 10, "completion_tokens": 5, "total_tokens": 15}})
+        epi.log_step("tool.call", {"name": "search"})
+        epi.log_step("tool.error", {"name": "search", "error": "timeout"})
+        epi.log_step("llm.response", {"usage": {"input_tokens": 7, "output_tokens": 3}})
+    return output_path
+
+
+class TestStepSummary:
+    """Test the running aggregates."""
+
+    def test_aggregates(self):
+        start = datetime(2025, 1, 1, 12, 0, 0)
+        summary = StepSummary()
+        summary.add(0, "llm.request", {"messages": []}, start)
+        summary.add(1, "llm.response", {"usage": {"prompt_tokens": 10, "completion_tokens": 5, "total_tokens": 15}},
+                    start + timedelta(seconds=2))
+        summary.add(2, "llm.error", {"error": "rate limited"}, (start + timedelta(seconds=3)).isoformat())
+        summary.add(3, "tool.call", {"name": "search"}, start + timedelta(seconds=1))
+
+        result = summary.to_dict()
+
+        assert result["steps"] == 4
+        assert result["kinds"] == {"llm.request": 1, "llm.response": 1, "llm.error": 1, "tool.call": 1}
+        assert result["errors"] == 1
+        assert result["error_details"] == [{"index": 2, "kind": "llm.error", "message": "rate limited"}]
+        assert result["llm_calls"] == 1
+        assert result["tools"] == {"search": 1}
+        assert result["tokens"] == {"prompt": 10, "completion": 5, "total": 15}
+        assert result["duration_seconds"] == 3.0
+        assert result["first_timestamp"] == start.isoformat()
+
+    def test_error_details_are_capped(self):
+        summary = StepSummary()
+        for i in range(MAX_ERROR_DETAILS + 5):
+            summary.add(i, "session.error", {"error_message": "boom"}, None)
+
+        result = summary.to_dict()
+        assert result["errors"] == MAX_ERROR_DETAILS + 5
+        assert len(result["error_details"]) == MAX_ERROR_DETAILS
+
+    def test_empty(self):
+        result = StepSummary().to_dict()
+        assert result["steps"] == 0
+        assert result["duration_seconds"] is None
+
+
+class TestRecordedSummary:
+    """Test summary.json end to end."""
+
+    def test_session_writes_signed_summary(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            output_path = record_session(tmpdir)
+
+            with zipfile.ZipFile(output_path) as zf:
+                manifest = json.loads(zf.read("manifest.json"))
+            assert SUMMARY_FILENAME in manifest["file_manifest"]
+            assert EPIContainer.verify_integrity(output_path)[0]
+
+            summary = read_summary(output_path)
+            assert summary["kinds"]["llm.response"] == 2
+            assert summary["tools"] == {"search": 2}
+            assert summary["tokens"] == {"prompt": 17, "completion": 8, "total": 25}
+            assert summary["errors"] == 1
+            assert summary["error_details"][0]["message"] == "timeout"
+
+    def test_incremental_summary_matches_a_full_scan(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            output_path = record_session(tmpdir)
+            assert read_summary(output_path) == summarize_steps(load_steps(output_path))
+
+    def test_pack_summarizes_recordings_without_one(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            source_dir = Path(tmpdir) / "src"
+            source_dir.mkdir()
+            steps = [
+                {"index": 0, "kind": "llm.request", "content": {}, "timestamp": "2025-01-01T00:00:00"},
+                {"index": 1, "kind": "llm.error", "content": {"error": "x"}, "timestamp": "2025-01-01T00:00:05"},
+            ]
+            (source_dir / "steps.jsonl").write_text("\n".join(json.dumps(s) for s in steps) + "\n")
+
+            output_path = Path(tmpdir) / "packed.epi"
+            manifest = ManifestModel()
+            EPIContainer.pack(source_dir, manifest, output_path)
+
+            assert not (source_dir / SUMMARY_FILENAME).exists()
+            assert SUMMARY_FILENAME in manifest.file_manifest
+            assert EPIContainer.verify_integrity(output_path)[0]
+
+            summary = read_summary(output_path)
+            assert summary["steps"] == 2
+            assert summary["errors"] == 1
+            assert summary["duration_seconds"] == 5.0
+
+    def test_load_summary_falls_back_to_scanning(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            output_path = record_session(tmpdir)
+            expected = read_summary(output_path)
+
+            # Same recording without summary.json (as made by older versions)
+            legacy_path = Path(tmpdir) / "legacy.epi"
+            with zipfile.ZipFile(output_path) as src, zipfile.ZipFile(legacy_path, "w") as dest:
+                for info in src.infolist():
+                    if info.filename != SUMMARY_FILENAME:
+                        dest.writestr(info, src.read(info.filename))
+
+            assert read_summary(legacy_path) is None
+            assert load_summary(legacy_path) == expected
+
+
+class TestSummaryReaders:
+    """Test that readers take their aggregates from summary.json."""
+
+    def test_analytics_uses_summary(self):
+        from epi_recorder.analytics import AgentAnalytics
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            record_session(tmpdir)
+            analytics = AgentAnalytics(tmpdir)
+
+            artifact = analytics.artifacts[0]
+            assert artifact["steps"] == read_summary(Path(tmpdir) / "run.epi")["steps"]
+            assert artifact["errors"] == 1
+            assert artifact["success"] is False
+            assert analytics.error_patterns() == {"tool.error": 1}
+            assert analytics.tool_usage_distribution() == {"search": 2}
+
+    def test_ls_shows_step_counts(self):
+        from epi_cli.ls import _get_recording_info
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            output_path = record_session(tmpdir)
+            info = _get_recording_info(output_path)
+
+            steps = read_summary(output_path)["steps"]
+            assert info["steps_summary"] == f"{steps} (1 err)"
+
+    def test_chat_reads_only_the_steps_it_shows(self):
+        from epi_cli.chat import load_steps_from_epi
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            output_path = record_session(tmpdir)
+            assert len(load_steps_from_epi(output_path, limit=2)) == 2
+            assert len(load_steps_from_epi(output_path)) == read_summary(output_path)["steps"]
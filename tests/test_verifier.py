@@ -0,0 +1,232 @@
+"""
+Tests for epi_core.verifier - single and batch verification
+"""
+
+import functools
+import json
+import tempfile
+import zipfile
+from pathlib import Path
+
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+from typer.testing import CliRunner
+
+from epi_cli.main import app
+from epi_core.container import EPIContainer
+from epi_core.schemas import ManifestModel
+from epi_core.trust import sign_manifest
+from epi_core.verifier import (
+    PublicKeyCache,
+    VerificationCache,
+    VerificationSummary,
+    find_epi_files,
+    verify_file,
+    verify_files,
+)
+
+
+runner = CliRunner()
+
+
+def manifest_hash_of(epi_file):
+    with zipfile.ZipFile(epi_file) as zf:
+        return VerificationCache.manifest_hash(zf.read("manifest.json"))
+
+
+@pytest.fixture
+def workspace():
+    """Directory with keys/ and a tree of signed, unsigned and tampered .epi files."""
+    with tempfile.TemporaryDirectory(prefix="epi_verifier_") as tmpdir:
+        root = Path(tmpdir)
+
+        keys_dir = root / "keys"
+        keys_dir.mkdir()
+        private_key = Ed25519PrivateKey.generate()
+        (keys_dir / "batch.pub").write_bytes(private_key.public_key().public_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PublicFormat.SubjectPublicKeyInfo
+        ))
+        signer = functools.partial(sign_manifest, private_key=private_key, key_name="batch")
+
+        source = root / "source"
+        source.mkdir()
+        (source / "steps.jsonl").write_text('{"index": 0, "kind": "test", "content": {}}\n')
+
+        evidence = root / "evidence"
+        (evidence / "day1").mkdir(parents=True)
+        for i in range(3):
+            EPIContainer.pack(source, ManifestModel(), evidence / "day1" / f"signed_{i}.epi", signer=signer)
+        EPIContainer.pack(source, ManifestModel(), evidence / "unsigned.epi")
+
+        # Tampered copy of a signed file
+        with zipfile.ZipFile(evidence / "day1" / "signed_0.epi") as zf_in:
+            with zipfile.ZipFile(evidence / "tampered.epi", "w") as zf_out:
+                for item in zf_in.namelist():
+                    data = b"tampered" if item == "steps.jsonl" else zf_in.read(item)
+                    zf_out.writestr(item, data)
+
+        (evidence / "broken.epi").write_text("not a zip")
+
+        yield root, keys_dir, evidence
+
+
+class TestPublicKeyCache:
+    """Test public key caching."""
+
+    def test_loads_once_and_caches_missing(self, workspace):
+        _, keys_dir, _ = workspace
+        cache = PublicKeyCache(keys_dir)
+
+        key = cache.get("batch")
+        assert len(key) == 32
+
+        (keys_dir / "batch.pub").unlink()
+        assert cache.get("batch") == key
+        assert cache.get("unknown") is None
+
+
+class TestVerifyFile:
+    """Test single-file verification."""
+
+    def test_signed_file(self, workspace):
+        _, keys_dir, evidence = workspace
+        report = verify_file(evidence / "day1" / "signed_1.epi", PublicKeyCache(keys_dir))
+
+        assert report["ok"]
+        assert report["trust_level"] == "HIGH"
+        assert report["signer"] == "batch"
+
+    def test_tampered_file(self, workspace):
+        _, keys_dir, evidence = workspace
+        report = verify_file(evidence / "tampered.epi", PublicKeyCache(keys_dir))
+
+        assert not report["ok"]
+        assert not report["integrity_ok"]
+
+    def test_broken_file_is_reported_not_raised(self, workspace):
+        _, keys_dir, evidence = workspace
+        report = verify_file(evidence / "broken.epi", PublicKeyCache(keys_dir))
+
+        assert not report["ok"]
+        assert "error" in report
+
+
+class TestVerifyFiles:
+    """Test batch verification."""
+
+    @pytest.mark.parametrize("jobs", [1, 2])
+    def test_batch_matches_single(self, workspace, jobs):
+        _, keys_dir, evidence = workspace
+        paths = find_epi_files(evidence)
+        assert len(paths) == 6
+
+        reports = list(verify_files(paths, jobs=jobs, keys_dir=keys_dir))
+        assert sorted(r["file"] for r in reports) == sorted(str(p) for p in paths)
+
+        summary = VerificationSummary()
+        for report in reports:
+            summary.add(report)
+        totals = summary.to_dict()
+
+        assert totals["total"] == 6
+        assert totals["passed"] == 4  # 3 signed + 1 unsigned
+        assert totals["errors"] == 1
+        assert totals["integrity_failed"] == 1
+        assert totals["unsigned"] == 1
+        assert not summary.all_ok
+
+
+class TestVerifyDirectoryCommand:
+    """Test `epi verify DIR/`."""
+
+    def test_json_streams_ndjson_with_summary(self, workspace):
+        _, _, evidence = workspace
+        result = runner.invoke(app, ["verify", str(evidence / "day1"), "--jobs", "2", "--json"])
+
+        lines = [json.loads(line) for line in result.stdout.splitlines() if line.strip()]
+        assert len(lines) == 4
+        assert lines[-1]["summary"]["total"] == 3
+        assert {Path(l["file"]).name for l in lines[:-1]} == {"signed_0.epi", "signed_1.epi", "signed_2.epi"}
+
+    def test_exit_code_reflects_failures(self, workspace):
+        _, _, evidence = workspace
+        result = runner.invoke(app, ["verify", str(evidence), "--jobs", "1"])
+
+        assert result.exit_code == 1
+        assert "Verification Summary" in result.stdout
+
+
+class TestVerificationCache:
+    """Test the persistent verification cache."""
+
+    def test_hit_until_file_changes(self, workspace):
+        root, _, evidence = workspace
+        epi_file = evidence / "unsigned.epi"
+        cache = VerificationCache(root / "cache.db")
+
+        assert cache.get(epi_file) is None
+        cache.put(epi_file, {"status": "[OK]"}, manifest_hash_of(epi_file))
+        cache.close()
+
+        cache = VerificationCache(root / "cache.db")
+        assert cache.get(epi_file) == {"status": "[OK]"}
+
+        with open(epi_file, "ab") as f:
+            f.write(b"\0")
+        assert cache.get(epi_file) is None
+        cache.close()
+
+    def test_miss_when_manifest_differs(self, workspace):
+        root, _, evidence = workspace
+        epi_file = evidence / "unsigned.epi"
+        cache = VerificationCache(root / "cache.db")
+
+        # Same size and mtime, but the result belongs to another manifest
+        cache.put(epi_file, {"status": "[OK]"}, manifest_hash_of(evidence / "tampered.epi"))
+        assert cache.get(epi_file) is None
+
+        cache.put(epi_file, {"status": "[OK]"}, manifest_hash_of(epi_file))
+        assert cache.get(epi_file) == {"status": "[OK]"}
+        cache.close()
+
+    def test_prune_drops_missing_files(self, workspace):
+        root, _, evidence = workspace
+        cache = VerificationCache(root / "cache.db")
+        cache.put(evidence / "unsigned.epi", {}, manifest_hash_of(evidence / "unsigned.epi"))
+        cache.put(evidence / "tampered.epi", {}, manifest_hash_of(evidence / "tampered.epi"))
+
+        cache.prune([evidence / "unsigned.epi"])
+
+        assert cache.get(evidence / "unsigned.epi") == {}
+        assert cache.get(evidence / "tampered.epi") is None
+        cache.close()
+
+
+class TestLsCache:
+    """Test that `epi ls` answers unchanged recordings from the cache."""
+
+    def test_second_listing_skips_verification(self, workspace, monkeypatch):
+        root, _, evidence = workspace
+        recordings = root / "epi-recordings"
+        recordings.mkdir()
+        (evidence / "unsigned.epi").rename(recordings / "unsigned.epi")
+        monkeypatch.chdir(root)
+
+        calls = []
+        original = EPIContainer.verify_integrity
+
+        def counting_verify(*args, **kwargs):
+            calls.append(args[0])
+            return original(*args, **kwargs)
+
+        monkeypatch.setattr(EPIContainer, "verify_integrity", counting_verify)
+
+        assert runner.invoke(app, ["ls"]).exit_code == 0
+        assert runner.invoke(app, ["ls"]).exit_code == 0
+        assert len(calls) == 1
+        assert (recordings / ".epi-verify-cache.db").exists()
+
+        assert runner.invoke(app, ["ls", "--reverify"]).exit_code == 0
+        assert len(calls) == 2
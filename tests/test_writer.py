@@ -0,0 +1,305 @@
+"""
+Tests for epi_core.writer - steps.jsonl writers
+"""
+
+import json
+import tempfile
+import threading
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from epi_core.writer import (
+    BufferedStepWriter,
+    FlushPolicy,
+    SequencedJournal,
+    StepSequencer,
+    StepWriter,
+    FSYNC_ON_FLUSH,
+    FSYNC_PER_STEP,
+)
+from epi_recorder.patcher import RecordingContext
+
+
+@pytest.fixture
+def steps_path():
+    """Path to a fresh steps.jsonl in a temp directory."""
+    with tempfile.TemporaryDirectory(prefix="epi_writer_") as tmpdir:
+        yield Path(tmpdir) / "steps.jsonl"
+
+
+class TestFlushPolicy:
+    """Test FlushPolicy validation."""
+
+    def test_defaults(self):
+        policy = FlushPolicy()
+        assert policy.max_steps > 0
+        assert policy.max_bytes > 0
+        assert policy.max_latency > 0
+        assert policy.fsync == "never"
+
+    def test_rejects_unknown_fsync(self):
+        with pytest.raises(ValueError):
+            FlushPolicy(fsync="sometimes")
+
+    def test_rejects_non_positive_limits(self):
+        with pytest.raises(ValueError):
+            FlushPolicy(max_steps=0)
+
+
+class TestStepWriter:
+    """Test write-through writer."""
+
+    def test_write_is_immediately_visible(self, steps_path):
+        writer = StepWriter(steps_path)
+        writer.write('{"index": 0}')
+
+        assert steps_path.read_text() == '{"index": 0}\n'
+
+
+class TestBufferedStepWriter:
+    """Test group-commit writer."""
+
+    def test_steps_stay_queued_until_flush(self, steps_path):
+        writer = BufferedStepWriter(steps_path, FlushPolicy(max_latency=60))
+        try:
+            writer.write('{"index": 0}')
+            writer.write('{"index": 1}')
+            assert writer.pending == 2
+
+            writer.flush()
+
+            assert writer.pending == 0
+            assert steps_path.read_text().splitlines() == ['{"index": 0}', '{"index": 1}']
+        finally:
+            writer.close()
+
+    def test_step_count_triggers_flush(self, steps_path):
+        writer = BufferedStepWriter(steps_path, FlushPolicy(max_steps=3, max_latency=60))
+        try:
+            for i in range(3):
+                writer.write(json.dumps({"index": i}))
+
+            deadline = time.monotonic() + 5
+            while writer.pending and time.monotonic() < deadline:
+                time.sleep(0.01)
+
+            assert len(steps_path.read_text().splitlines()) == 3
+        finally:
+            writer.close()
+
+    def test_latency_triggers_flush(self, steps_path):
+        writer = BufferedStepWriter(steps_path, FlushPolicy(max_latency=0.05))
+        try:
+            writer.write('{"index": 0}')
+
+            deadline = time.monotonic() + 5
+            while not steps_path.read_text() and time.monotonic() < deadline:
+                time.sleep(0.01)
+
+            assert steps_path.read_text() == '{"index": 0}\n'
+        finally:
+            writer.close()
+
+    def test_close_flushes_and_rejects_writes(self, steps_path):
+        writer = BufferedStepWriter(steps_path, FlushPolicy(max_latency=60, fsync=FSYNC_ON_FLUSH))
+        writer.write('{"index": 0}')
+        writer.close()
+        writer.close()  # idempotent
+
+        assert steps_path.read_text() == '{"index": 0}\n'
+        with pytest.raises(RuntimeError):
+            writer.write('{"index": 1}')
+
+    def test_per_step_fsync_writes_synchronously(self, steps_path):
+        writer = BufferedStepWriter(steps_path, FlushPolicy(fsync=FSYNC_PER_STEP))
+        try:
+            writer.write('{"index": 0}')
+            assert writer.pending == 0
+            assert steps_path.read_text() == '{"index": 0}\n'
+        finally:
+            writer.close()
+
+
+class TestBufferedRecording:
+    """Test buffered mode through the recorder."""
+
+    def test_recording_context_flush(self):
+        temp_dir = Path(tempfile.mkdtemp())
+        ctx = RecordingContext(
+            temp_dir,
+            enable_redaction=False,
+            buffered=True,
+            flush_policy=FlushPolicy(max_latency=60)
+        )
+        try:
+            ctx.add_step("step1", {"n": 1})
+            ctx.flush()
+
+            lines = ctx.steps_file.read_text().splitlines()
+            assert len(lines) == 1
+            assert json.loads(lines[0])["kind"] == "step1"
+        finally:
+            ctx.close()
+
+    def test_session_exit_flushes_buffered_steps(self):
+        from epi_recorder.api import EpiRecorderSession
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            output_path = Path(tmpdir) / "buffered.epi"
+
+            with EpiRecorderSession(
+                output_path,
+                auto_sign=False,
+                buffered=True,
+                flush_policy=FlushPolicy(max_latency=60)
+            ) as epi:
+                for i in range(50):
+                    epi.log_step("custom.event", {"i": i})
+
+            with zipfile.ZipFile(output_path) as zf:
+                steps = [json.loads(l) for l in zf.read("steps.jsonl").decode().splitlines()]
+
+            assert len([s for s in steps if s["kind"] == "custom.event"]) == 50
+            assert steps[-1]["kind"] == "session.end"
+            assert [s["index"] for s in steps] == list(range(len(steps)))
+
+
+class TestStepSequencer:
+    """Test lock-free index allocation."""
+
+    def test_indices_are_consecutive(self):
+        sequencer = StepSequencer()
+        assert [sequencer.next() for _ in range(3)] == [0, 1, 2]
+        assert sequencer.issued == 3
+
+    def test_start(self):
+        sequencer = StepSequencer(start=10)
+        assert sequencer.issued == 10
+        assert sequencer.next() == 10
+        assert sequencer.issued == 11
+
+        with pytest.raises(TypeError):
+            StepSequencer(start=1.5)
+
+    def test_concurrent_indices_are_unique(self):
+        sequencer = StepSequencer()
+
+        def take(_):
+            return [sequencer.next() for _ in range(1000)]
+
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            taken = [i for chunk in pool.map(take, range(16)) for i in chunk]
+
+        assert sorted(taken) == list(range(16000))
+        assert sequencer.issued == 16000
+
+
+class TestSequencedJournal:
+    """Test merging out-of-order submissions into index order."""
+
+    def read_indices(self, path):
+        return [json.loads(line)["index"] for line in path.read_text().splitlines()]
+
+    def test_out_of_order_writes_are_reordered(self, steps_path):
+        journal = SequencedJournal(BufferedStepWriter(steps_path))
+        for index in (2, 0, 3, 1):
+            journal.write(index, json.dumps({"index": index}))
+        journal.close()
+
+        assert self.read_indices(steps_path) == [0, 1, 2, 3]
+
+    def test_later_index_waits_for_in_flight_one(self, steps_path):
+        journal = SequencedJournal(StepWriter(steps_path))
+
+        def late_writer():
+            time.sleep(0.1)
+            journal.write(0, '{"index": 0}')
+
+        thread = threading.Thread(target=late_writer)
+        thread.start()
+        # Write-through: returns only once index 1 is on disk, after index 0
+        journal.write(1, '{"index": 1}')
+        thread.join()
+
+        assert self.read_indices(steps_path) == [0, 1]
+
+    def test_skipped_index_does_not_block(self, steps_path):
+        journal = SequencedJournal(StepWriter(steps_path), gap_timeout=30)
+        journal.skip(0)
+        journal.write(1, '{"index": 1}')
+
+        assert self.read_indices(steps_path) == [1]
+
+    def test_gap_timeout_writes_later_steps(self, steps_path):
+        journal = SequencedJournal(StepWriter(steps_path), gap_timeout=0.1)
+        journal.write(1, '{"index": 1}')
+        journal.write(0, '{"index": 0}')
+
+        # The stalled index is written late rather than never
+        assert self.read_indices(steps_path) == [1, 0]
+
+
+class TestConcurrentRecording:
+    """Test the ordering guarantee with many recording threads."""
+
+    @pytest.mark.parametrize("buffered", [False, True])
+    def test_parallel_add_step_is_ordered(self, buffered):
+        threads, per_thread = 16, 200
+        with tempfile.TemporaryDirectory() as tmpdir:
+            ctx = RecordingContext(Path(tmpdir), enable_redaction=False, buffered=buffered)
+
+            def worker(worker_id):
+                for i in range(per_thread):
+                    ctx.add_step("tool.call", {"worker": worker_id, "seq": i})
+
+            with ThreadPoolExecutor(max_workers=threads) as pool:
+                list(pool.map(worker, range(threads)))
+            ctx.close()
+
+            steps = [json.loads(l) for l in ctx.steps_file.read_text().splitlines()]
+
+        assert [s["index"] for s in steps] == list(range(threads * per_thread))
+        assert ctx.step_index == threads * per_thread
+
+        # Each thread's steps keep program order
+        last = {}
+        for step in steps:
+            worker_id, seq = step["content"]["worker"], step["content"]["seq"]
+            assert seq == last.get(worker_id, -1) + 1
+            last[worker_id] = seq
+
+    def test_failed_serialization_releases_index(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            ctx = RecordingContext(Path(tmpdir), enable_redaction=False)
+            with pytest.raises(Exception):
+                ctx.add_step("bad", {"value": object()})
+            ctx.add_step("good", {})
+            ctx.close()
+
+            steps = [json.loads(l) for l in ctx.steps_file.read_text().splitlines()]
+
+        assert [(s["index"], s["kind"]) for s in steps] == [(1, "good")]
+
+
+class TestAsyncRecorderJournal:
+    """Test that the async recorder shares the steps.jsonl journal."""
+
+    def test_record_async_writes_steps_jsonl(self):
+        import asyncio
+        from epi_recorder.async_api import record_async
+
+        async def run(tmpdir):
+            async with record_async("async_session", tmpdir) as rec:
+                for i in range(10):
+                    await rec.record_step("custom.event", {"i": i})
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            asyncio.run(run(tmpdir))
+
+            lines = (Path(tmpdir) / "steps.jsonl").read_text().splitlines()
+            assert [json.loads(l)["content"]["i"] for l in lines] == list(range(10))
+            assert list(Path(tmpdir).glob("*.db")) == []